@@ -1,14 +1,37 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Request, Response, g, request, jsonify, stream_with_context, url_for
 import os
+import hashlib
+import logging
+import sqlite3
+import threading
 import time
+from tempfile import SpooledTemporaryFile
+from concurrent.futures import ThreadPoolExecutor
 from flask_cors import CORS
 from dotenv import load_dotenv
 
 # Load environment variables from .env file FIRST
 load_dotenv()
 
-from utils.resume_extractor import extract_resume_text, clean_extracted_text, extract_basic_info
-from utils.gemini_service import GeminiService
+from utils.resume_extractor import (
+    analyze_resume, analyze_resume_with_settings, configure_extraction_limits, configure_fuzzy_matching,
+    configure_parallel_extraction, configure_skills_database, get_analysis_settings, get_extractor_version,
+    submit_resume_analysis
+)
+from utils.extraction_cache import ExtractionCache
+from utils.batch_extraction import iter_batch_analyses, iter_batch_items
+from utils.extraction_sandbox import ExtractionSandbox, ExtractionSandboxError
+from utils.ai_pipeline import AI_OPERATIONS, build_insight_stages, iter_stage_graph
+from utils.job_queue import CallbackNotAllowed, JobQueue, JobQueueFull
+from utils.health_probe import HealthProber
+from utils.resume_store import ResumeStore
+from utils.json_provider import FastJSONProvider
+from utils.compression import ResponseCompressor
+from utils.metrics import (
+    HTTP_IN_FLIGHT, HTTP_REQUEST_DURATION, HTTP_REQUESTS, REGISTRY, CallbackMetric, configure_metrics,
+    metrics_enabled, record_stage_timings, stage_timer
+)
+from utils.structured_logging import configure_logging, dropped_records
 from config import get_config, check_config
 
 app = Flask(__name__)
@@ -16,159 +39,485 @@ CORS(app)  # Enable CORS for all routes
 
 # Load configuration
 config = get_config()
+configure_logging(level=config.LOG_LEVEL, fmt=config.LOG_FORMAT, sample_every=config.LOG_SAMPLE_EVERY,
+                  queue_size=config.LOG_QUEUE_SIZE)
+logger = logging.getLogger(__name__)
 app.config['MAX_CONTENT_LENGTH'] = config.MAX_CONTENT_LENGTH
 
-UPLOAD_FOLDER = config.UPLOAD_FOLDER
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
+class SpooledUploadRequest(Request):
+    """
+    Keep uploads in memory up to UPLOAD_SPOOL_MAX_MEMORY so they can be
+    parsed straight from the buffer; larger ones overflow to a temp file.
+    """
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledTemporaryFile(max_size=config.UPLOAD_SPOOL_MAX_MEMORY, mode='rb+')
+
+    @property
+    def max_content_length(self):
+        # Batch uploads carry many resumes, so they get their own size limit
+        if self.endpoint == 'extract_batch':
+            return config.BATCH_MAX_CONTENT_LENGTH
+        return super().max_content_length
+
+app.request_class = SpooledUploadRequest
+
+if config.FAST_JSON_ENABLED:
+    app.json = FastJSONProvider(app)
+
+# Buffered responses of at least COMPRESS_MIN_SIZE bytes are sent gzip or
+# brotli encoded; streamed responses never are
+response_compressor = ResponseCompressor(
+    min_size=config.COMPRESS_MIN_SIZE,
+    gzip_level=config.COMPRESS_GZIP_LEVEL,
+    brotli_quality=config.COMPRESS_BROTLI_QUALITY
+) if config.COMPRESS_MIN_SIZE else None
+
+@app.after_request
+def compress_response(response):
+    if response_compressor is not None:
+        response_compressor.apply(response, request.accept_encodings)
+    return response
+
+configure_metrics(enabled=config.METRICS_ENABLED)
+
+def metrics_endpoint_label():
+    # The route pattern, not the raw path, keeps label values bounded
+    return request.url_rule.rule if request.url_rule is not None else 'unmatched'
+
+@app.before_request
+def start_request_metrics():
+    if metrics_enabled():
+        g.metrics_endpoint = metrics_endpoint_label()
+        g.metrics_started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc(endpoint=g.metrics_endpoint)
+
+@app.after_request
+def record_request_metrics(response):
+    if 'metrics_started' in g:
+        HTTP_REQUESTS.inc(endpoint=g.metrics_endpoint, method=request.method, status=str(response.status_code))
+        HTTP_REQUEST_DURATION.observe(time.perf_counter() - g.metrics_started, endpoint=g.metrics_endpoint)
+    return response
+
+@app.teardown_request
+def finish_request_metrics(error=None):
+    # Runs after a streamed response has been sent, so open streams count as in flight
+    if 'metrics_started' in g:
+        HTTP_IN_FLIGHT.dec(endpoint=g.metrics_endpoint)
+
+configure_parallel_extraction(
+    enabled=config.PDF_PARALLEL_EXTRACTION,
+    min_pages=config.PDF_PARALLEL_MIN_PAGES,
+    pages_per_task=config.PDF_PARALLEL_PAGES_PER_TASK,
+    workers=config.PDF_PARALLEL_WORKERS
+)
+
+configure_extraction_limits(
+    max_pages=config.EXTRACTION_MAX_PAGES,
+    max_chars=config.EXTRACTION_MAX_CHARS,
+    max_seconds=config.EXTRACTION_MAX_SECONDS
+)
+
+configure_skills_database(
+    path=config.SKILLS_DATABASE_PATH,
+    index_dir=config.SKILLS_INDEX_DIR,
+    reload_interval=config.SKILLS_RELOAD_INTERVAL
+)
+
+configure_fuzzy_matching(
+    enabled=config.SKILLS_FUZZY_MATCHING,
+    threshold=config.SKILLS_FUZZY_THRESHOLD
+)
+
+extraction_cache = ExtractionCache(
+    max_entries=config.EXTRACTION_CACHE_SIZE,
+    persist_dir=config.EXTRACTION_CACHE_DIR
+)
+
+REGISTRY.register(CallbackMetric(
+    'careernav_extraction_cache_hits_total', 'Extraction cache hits', 'counter',
+    lambda: extraction_cache.stats()['hits']))
+REGISTRY.register(CallbackMetric(
+    'careernav_extraction_cache_misses_total', 'Extraction cache misses', 'counter',
+    lambda: extraction_cache.stats()['misses']))
+REGISTRY.register(CallbackMetric(
+    'careernav_extraction_cache_entries', 'Analyses held in the extraction cache', 'gauge',
+    lambda: extraction_cache.stats()['entries']))
+resume_store = ResumeStore(
+    config.RESUME_STORE_PATH,
+    ttl=config.RESUME_STORE_TTL,
+    max_entries=config.RESUME_STORE_MAX_ENTRIES
+)
+
+REGISTRY.register(CallbackMetric(
+    'careernav_resume_store_entries', 'Unexpired resumes in the resume store', 'gauge',
+    resume_store.count))
+REGISTRY.register(CallbackMetric(
+    'careernav_log_records_dropped_total', 'Log records dropped because the log queue was full', 'counter',
+    dropped_records))
+
+# Untrusted documents can be parsed in resource-limited worker processes
+extraction_sandbox = None
+if config.EXTRACTION_SANDBOX:
+    extraction_sandbox = ExtractionSandbox(
+        workers=config.EXTRACTION_SANDBOX_WORKERS,
+        max_tasks_per_worker=config.EXTRACTION_SANDBOX_MAX_TASKS,
+        memory_limit_mb=config.EXTRACTION_SANDBOX_MEMORY_MB,
+        cpu_seconds=config.EXTRACTION_SANDBOX_CPU_SECONDS,
+        timeout=config.EXTRACTION_SANDBOX_TIMEOUT
+    )
+
+# Shared by all requests, so concurrent /process calls cannot open an
+# unbounded number of Gemini connections. A stage abandoned at
+# AI_PROCESS_TIMEOUT keeps its thread until its Gemini call returns, which
+# AI_CALL_TIMEOUT bounds; size AI_MAX_CONCURRENCY for the calls that can be
+# in flight, abandoned ones included
+ai_executor = ThreadPoolExecutor(max_workers=max(1, config.AI_MAX_CONCURRENCY), thread_name_prefix='gemini')
+
+def submit_analysis(data, filename):
+    """
+    Start analyzing a resume in the background (sandboxed if enabled)
+    and return a Future for the analysis
+    """
+    if extraction_sandbox is not None:
+        return extraction_sandbox.submit(analyze_resume_with_settings, data, filename, get_analysis_settings())
+    return submit_resume_analysis(data, filename)
+
+def analyze_upload(file, filename=None):
+    """
+    Run the extraction pipeline on an uploaded file. Results for uploads
+    with identical bytes are served from the extraction cache. Raises
+    ExtractionSandboxError when sandboxed extraction hits a limit.
+    """
+    filename = filename or file.filename or ''
+    with stage_timer('upload_read'):
+        data = file.stream.read()
+    key = ExtractionCache.make_key(data, os.path.splitext(filename)[1], get_extractor_version())
+
+    analysis = extraction_cache.get(key)
+    if analysis is None:
+        if extraction_sandbox is not None:
+            analysis = extraction_sandbox.run(analyze_resume_with_settings, data, filename, get_analysis_settings())
+        else:
+            analysis = analyze_resume(data, filename=filename)
+        record_stage_timings(analysis.get('timings'))
+        if analysis['raw_text']:
+            extraction_cache.put(key, analysis)
+    return analysis
+
+def sandbox_error_response(error):
+    """
+    Structured response for an extraction stopped by the sandbox: 503 when
+    no worker was free, 422 when the document hit a limit or broke a worker
+    """
+    status = 503 if error.reason == 'busy' else 422
+    return {'error': str(error), 'reason': error.reason}, status
+
+def store_resume(analysis):
+    """
+    Keep an extracted resume in the resume store and return its resume_id,
+    or None when nothing was extracted or the store is unavailable
+    """
+    if not analysis['raw_text']:
+        return None
+    # Identical extractions share one stored copy, whichever route produced them
+    content = app.json.dumps([analysis['clean_text'], analysis['basic_info']], sort_keys=True)
+    content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    try:
+        return resume_store.put(content_hash, analysis['clean_text'], analysis['basic_info'])
+    except sqlite3.Error as e:
+        logger.error("Could not store resume: %s", e)
+        return None
+
+def resolve_resume(operation, data):
+    """
+    Fill in the fields of an /ai/<operation> body that its resume_id
+    provides. Returns (data, error_response).
+    """
+    resume_id = data.get('resume_id')
+    if not resume_id:
+        return data, None
+    resume = resume_store.get(str(resume_id))
+    if resume is None:
+        return None, (jsonify({'error': 'Resume not found or expired'}), 404)
+    return AI_OPERATIONS[operation].with_resume(data, resume), None
 
 # Check configuration on startup
-print("Checking configuration...")
+logger.info("Checking configuration...")
 config_valid = check_config()
 
 # Check Gemini API Key
 gemini_key_present = bool(os.getenv('GEMINI_API_KEY'))
-print(f"GEMINI_API_KEY present in environment: {gemini_key_present}")
+logger.info("GEMINI_API_KEY present in environment: %s", gemini_key_present)
 if not gemini_key_present:
-    print("WARNING: GEMINI_API_KEY not found. AI features will be disabled.")
-    print("Please set GEMINI_API_KEY environment variable to enable AI recommendations.")
-
-# Initialize Gemini service
-try:
-    if config_valid and gemini_key_present:
-        gemini_service = GeminiService()
-        print("Gemini AI service initialized successfully")
-    else:
-        print("Configuration issues detected. AI features may not work properly.")
-        gemini_service = None
-except Exception as e:
-    print(f"Warning: Gemini AI service failed to initialize: {str(e)}")
-    print("AI-powered features will be disabled")
-    gemini_service = None
+    logger.warning("GEMINI_API_KEY not found. AI features will be disabled. "
+                   "Please set GEMINI_API_KEY environment variable to enable AI recommendations.")
+
+# The Gemini service is created on first use: importing the SDK and
+# building the model client would otherwise dominate every worker's cold start
+gemini_service = None
+gemini_service_initialized = False
+gemini_service_lock = threading.Lock()
+
+if not config_valid:
+    logger.warning("Configuration issues detected. AI features may not work properly.")
+
+def get_gemini_service():
+    """
+    Return the shared GeminiService, creating it on the first call.
+    Returns None when AI features are disabled or initialization failed.
+    """
+    global gemini_service, gemini_service_initialized
+    if gemini_service_initialized:
+        return gemini_service
+
+    with gemini_service_lock:
+        if gemini_service_initialized:
+            return gemini_service
+        try:
+            if config_valid and gemini_key_present:
+                from utils.gemini_service import GeminiService
+                gemini_service = GeminiService(coalesce=config.AI_COALESCE_REQUESTS,
+                                               request_timeout=config.AI_CALL_TIMEOUT)
+                logger.info("Gemini AI service initialized successfully")
+        except Exception as e:
+            logger.warning("Gemini AI service failed to initialize, AI-powered features will be disabled: %s", e)
+            gemini_service = None
+        gemini_service_initialized = True
+        return gemini_service
 
 @app.route('/', methods=['GET'])
 def st():
     return "Hii"
 
-@app.route('/process', methods=['POST'])
-def process_resume():
-    file = request.files.get('resume')
-    industries = request.form.get('industries')
-    goals = request.form.get('goals')
-    location = request.form.get('location')
+def extracted_info_block(analysis):
+    """
+    The extracted_info section of a /process response
+    """
+    clean_text = analysis['clean_text']
+    basic_info = analysis['basic_info']
+    return {
+        "text_length": len(clean_text),
+        "email": basic_info.get('email'),
+        "detected_skills": basic_info.get('skills', []),
+        "skills_by_category": basic_info.get('skills_summary', {}),
+        "total_skills_found": len(basic_info.get('skills', [])),
+        "has_experience_keywords": len(basic_info.get('experience_keywords', [])) > 0,
+        "has_education_keywords": len(basic_info.get('education_keywords', [])) > 0,
+        "experience_entries": basic_info.get('experience_entries', []),
+        "project_entries": basic_info.get('project_entries', []),
+        "experience_keywords": basic_info.get('experience_keywords', []),
+        "truncated": analysis.get('truncated', False),
+        "truncated_reason": analysis.get('truncated_reason')
+    }
+
+def sse_event(event, data):
+    """
+    Format one Server-Sent Event with a JSON payload
+    """
+    return f"event: {event}\ndata: {app.json.dumps(data)}\n\n"
 
-    if not file:
-        return jsonify({'error': 'No resume uploaded'}), 400
+def wants_event_stream():
+    """
+    True when the client prefers text/event-stream over JSON
+    """
+    return request.accept_mimetypes.best_match(['application/json', 'text/event-stream']) == 'text/event-stream'
 
-    # Save file temporarily
-    file_path = os.path.join(UPLOAD_FOLDER, file.filename)
-    file.save(file_path)
+def process_preferences(form):
+    """
+    The preferences fields of a /process form, as sent
+    """
+    return {
+        "industries": form.get('industries'),
+        "goals": form.get('goals'),
+        "location": form.get('location')
+    }
 
-    try:
-        # Extract text from resume
-        extracted_text = extract_resume_text(file_path)
-        
-        if not extracted_text:
-            return jsonify({'error': 'Could not extract text from resume'}), 400
-        
-        # Clean the extracted text
-        clean_text = clean_extracted_text(extracted_text)
-        
-        # Extract basic information
-        basic_info = extract_basic_info(clean_text, extracted_text)
-        
-        print("Industries:", industries)
-        print("Goals:", goals)
-        print("Location:", location)
-        print("Extracted resume length:", len(clean_text))
-        print("Skills found:", len(basic_info.get('skills', [])))
-        print("Skills by category:", basic_info.get('skills_summary', {}))
-
-        # Prepare preferences for AI analysis
-        preferences = {
-            "industries": industries or "Not specified",
-            "goals": goals or "Not specified", 
-            "location": location or "Not specified"
-        }
+def ai_preferences(preferences):
+    """
+    Preferences as passed to Gemini, with missing fields spelled out
+    """
+    return {key: value or "Not specified" for key, value in preferences.items()}
 
-        # Generate AI-powered recommendations if service is available
-        ai_recommendations = {}
-        if gemini_service:
-            try:
-                # Generate career recommendations
-                career_recs = gemini_service.generate_career_recommendations(
-                    skills_by_category=basic_info.get('skills_summary', {}),
-                    preferences=preferences,
-                    experience_level="intermediate"  # Could be determined from resume analysis
-                )
-                ai_recommendations['career_recommendations'] = career_recs
-
-                # Generate skill improvement suggestions
-                skill_suggestions = gemini_service.suggest_skill_improvements(
-                    current_skills=basic_info.get('skills', []),
-                   target_roles=[role.get('title', '') for role in career_recs.get('recommended_roles', [])[:3]] if career_recs else ['Software Developer'],
-                    preferences=preferences
-                )
-                ai_recommendations['skill_improvements'] = skill_suggestions
-
-                # Analyze resume for gaps
-                resume_analysis = gemini_service.analyze_resume_gaps(
-                    skills_by_category=basic_info.get('skills_summary', {}),
-                    preferences=preferences,
-                    extracted_text=clean_text
-                )
-                ai_recommendations['resume_analysis'] = resume_analysis
-
-                # Generate learning path for top recommended role
-                top_role = career_recs.get('recommended_roles', [{}])[0].get('title', 'Software Developer') if career_recs else 'Software Developer'
-                learning_path = gemini_service.generate_learning_path(
-                    current_skills=basic_info.get('skills', []),
-                    target_role=top_role,
-                    learning_preference="balanced"
-                )
-                ai_recommendations['learning_path'] = learning_path
-
-                print("AI recommendations generated successfully")
-            except Exception as e:
-                print(f"Error generating AI recommendations: {str(e)}")
-                ai_recommendations['error'] = str(e)
-
-        # Enhanced response with extracted information
-        response = {
-            "summary": "Resume processed successfully with AI analysis",
-            "extracted_info": {
-                "text_length": len(clean_text),
-                "email": basic_info.get('email'),
-                "detected_skills": basic_info.get('skills', []),
-                "skills_by_category": basic_info.get('skills_summary', {}),
-                "total_skills_found": len(basic_info.get('skills', [])),
-                "has_experience_keywords": len(basic_info.get('experience_keywords', [])) > 0,
-                "has_education_keywords": len(basic_info.get('education_keywords', [])) > 0,
-                "experience_entries": basic_info.get('experience_entries', []),
-                "project_entries": basic_info.get('project_entries', []),
-                "experience_keywords": basic_info.get('experience_keywords', [])
-            },
-            "preferences": {
-                "industries": industries,
-                "goals": goals,
-                "location": location
-            },
-            "ai_insights": ai_recommendations,
-    
-        }
-        
+def extract_process_upload(file):
+    """
+    Validate and extract the resume of a /process request. Shared by the
+    Flask and ASGI endpoints and /jobs/process; the error response is a
+    (body, status) pair either framework can return.
+    Returns (analysis, extraction_ms, error_response).
+    """
+    if not file:
+        return None, None, ({'error': 'No resume uploaded'}, 400)
+
+    try:
+        extraction_started = time.perf_counter()
+        analysis = analyze_upload(file)
+        extraction_ms = round((time.perf_counter() - extraction_started) * 1000, 1)
+    except ExtractionSandboxError as e:
+        logger.warning("Sandboxed extraction stopped (%s): %s", e.reason, e)
+        return None, None, sandbox_error_response(e)
     except Exception as e:
-        print(f"Error processing resume: {str(e)}")
-        return jsonify({'error': f'Error processing resume: {str(e)}'}), 500
-    
-    finally:
-        # Clean up - remove the uploaded file
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception as e:
-                print(f"Warning: Could not remove file {file_path}: {str(e)}")
+        logger.error("Error processing resume: %s", e)
+        return None, None, ({'error': f'Error processing resume: {str(e)}'}, 500)
 
-    return jsonify(response)
+    if not analysis['raw_text']:
+        return None, None, ({'error': 'Could not extract text from resume'}, 400)
+
+    logger.debug("Resume extracted", extra={
+        'text_length': len(analysis['clean_text']),
+        'skills_found': len(analysis['basic_info'].get('skills', [])),
+        'skills_by_category': analysis['basic_info'].get('skills_summary', {})
+    })
+    return analysis, extraction_ms, None
+
+def record_stage(stage, timings, errors, ai_recommendations=None):
+    """
+    Record one finished /process AI stage in timings and errors (and its
+    result in ai_recommendations, if given) and return its 'ai_insight'
+    stream event
+    """
+    timings['ai_stages'][stage.name] = stage.timing()
+    event = {"section": stage.name, "status": stage.status, "timing": stage.timing()}
+    if stage.status == 'ok':
+        event['data'] = stage.result
+        if ai_recommendations is not None:
+            ai_recommendations[stage.name] = stage.result
+    else:
+        event['error'] = stage.error
+        errors.append(f"{stage.name}: {stage.error}")
+    return event
+
+def finish_ai_stages(timings, errors, ai_started):
+    timings['ai_ms'] = round((time.perf_counter() - ai_started) * 1000, 1)
+    if errors:
+        logger.error("Error generating AI recommendations: %s", '; '.join(errors))
+    else:
+        logger.info("AI recommendations generated successfully")
+
+def process_response(extracted_info, resume_id, preferences, ai_recommendations, timings):
+    """
+    The /process response body, also the result of a /jobs/process job
+    """
+    return {
+        "summary": "Resume processed successfully with AI analysis",
+        "resume_id": resume_id,
+        "extracted_info": extracted_info,
+        "preferences": preferences,
+        "ai_insights": ai_recommendations,
+        "timings": timings
+    }
+
+def stream_opening_event(analysis, resume_id, preferences, timings):
+    """
+    The first /process/stream event, sent once extraction finishes
+    """
+    return sse_event('extracted_info', {
+        "resume_id": resume_id,
+        "extracted_info": extracted_info_block(analysis),
+        "preferences": preferences,
+        "timings": timings
+    })
+
+def stream_summary_event(ai_available, errors, timings):
+    """
+    The last /process/stream event
+    """
+    if not ai_available:
+        return sse_event('summary', {
+            "summary": "Resume processed successfully; AI service not available",
+            "ai_available": False,
+            "timings": timings
+        })
+    return sse_event('summary', {
+        "summary": "Resume processed successfully with AI analysis",
+        "ai_available": True,
+        "errors": errors,
+        "timings": timings
+    })
+
+def generate_ai_insights(gemini_service, basic_info, clean_text, preferences, should_stop=None):
+    """
+    Run the /process Gemini calls and return (ai_insights, timings).
+    Career recommendations and the resume gap analysis start at once;
+    skill improvements and the learning path wait for the career roles.
+    should_stop() is checked after each call and abandons the rest.
+    """
+    ai_recommendations = {}
+    timings = {'ai_stages': {}}
+    errors = []
+    ai_started = time.perf_counter()
+    stages = build_insight_stages(gemini_service, basic_info, clean_text, preferences)
+    for stage in iter_stage_graph(stages, ai_executor, timeout=config.AI_PROCESS_TIMEOUT):
+        record_stage(stage, timings, errors, ai_recommendations)
+        if should_stop is not None and should_stop():
+            break
+    finish_ai_stages(timings, errors, ai_started)
+
+    if errors:
+        ai_recommendations['error'] = '; '.join(errors)
+    return ai_recommendations, timings
+
+@app.route('/process', methods=['POST'])
+def process_resume():
+    """
+    Extract a resume and generate AI insights for it. Clients that send
+    Accept: text/event-stream get the streaming response of /process/stream.
+    """
+    if wants_event_stream():
+        return process_resume_stream()
+
+    preferences = process_preferences(request.form)
+    analysis, extraction_ms, error_response = extract_process_upload(request.files.get('resume'))
+    if error_response is not None:
+        return error_response
+
+    # Generate AI-powered recommendations if service is available
+    ai_recommendations = {}
+    timings = {'extraction_ms': extraction_ms}
+    gemini_service = get_gemini_service()
+    if gemini_service:
+        ai_recommendations, ai_timings = generate_ai_insights(
+            gemini_service, analysis['basic_info'], analysis['clean_text'], ai_preferences(preferences))
+        timings.update(ai_timings)
+
+    return jsonify(process_response(extracted_info_block(analysis), store_resume(analysis), preferences,
+                                    ai_recommendations, timings))
+
+@app.route('/process/stream', methods=['POST'])
+def process_resume_stream():
+    """
+    Streaming variant of /process using Server-Sent Events. Sends an
+    'extracted_info' event as soon as extraction finishes, an 'ai_insight'
+    event for each AI section as its Gemini call completes, and a final
+    'summary' event. Upload and extraction errors are returned as regular
+    JSON errors before the stream starts.
+    """
+    preferences = process_preferences(request.form)
+    analysis, extraction_ms, error_response = extract_process_upload(request.files.get('resume'))
+    if error_response is not None:
+        return error_response
+
+    gemini_service = get_gemini_service()
+    resume_id = store_resume(analysis)
+
+    def generate():
+        timings = {'extraction_ms': extraction_ms}
+        yield stream_opening_event(analysis, resume_id, preferences, timings)
+        if not gemini_service:
+            yield stream_summary_event(False, [], timings)
+            return
+
+        timings['ai_stages'] = {}
+        errors = []
+        ai_started = time.perf_counter()
+        stages = build_insight_stages(gemini_service, analysis['basic_info'], analysis['clean_text'],
+                                      ai_preferences(preferences))
+        for stage in iter_stage_graph(stages, ai_executor, timeout=config.AI_PROCESS_TIMEOUT):
+            yield sse_event('ai_insight', record_stage(stage, timings, errors))
+        finish_ai_stages(timings, errors, ai_started)
+        yield stream_summary_event(True, errors, timings)
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
 
 @app.route('/extract-skills', methods=['POST'])
 def extract_skills():
@@ -180,45 +529,36 @@ def extract_skills():
     if not file:
         return jsonify({'error': 'No resume file provided'}), 400
 
-    # Create upload directory if it doesn't exist
-    if not os.path.exists(UPLOAD_FOLDER):
-        os.makedirs(UPLOAD_FOLDER)
-        
-    # Save the file temporarily
-    filename = f"resume-{int(time.time() * 1000)}.pdf"
-    file_path = os.path.join(UPLOAD_FOLDER, filename)
-    file.save(file_path)
+    # Uploads without a recognised extension are treated as PDFs
+    filename = file.filename or ''
+    if os.path.splitext(filename)[1].lower() not in ['.pdf', '.docx', '.doc']:
+        filename = 'resume.pdf'
     
     try:
-        # Extract text from the resume
-        extracted_text = extract_resume_text(file_path)
-        clean_text = clean_extracted_text(extracted_text)
-        
-        # Extract basic information
-        basic_info = extract_basic_info(clean_text, extracted_text)
+        # Extract text, clean it and detect basic information
+        analysis = analyze_upload(file, filename=filename)
+        basic_info = analysis['basic_info']
         
         # Create a response with just the extracted skills
         response = {
+            'resume_id': store_resume(analysis),
             'skills': basic_info.get('skills', []),
             'skills_by_category': basic_info.get('skills_summary', {}),
             'total_skills_found': len(basic_info.get('skills', [])),
             'extracted_info': {
                 'email': basic_info.get('email', ''),
                 'detected_skills': basic_info.get('skills', []),
+                'truncated': analysis.get('truncated', False),
+                'truncated_reason': analysis.get('truncated_reason')
             }
         }
         
+    except ExtractionSandboxError as e:
+        logger.warning("Sandboxed extraction stopped (%s): %s", e.reason, e)
+        return sandbox_error_response(e)
     except Exception as e:
-        print(f"Error extracting skills: {str(e)}")
+        logger.error("Error extracting skills: %s", e)
         return jsonify({'error': f'Error extracting skills: {str(e)}'}), 500
-    
-    finally:
-        # Clean up - remove the uploaded file
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception as e:
-                print(f"Warning: Could not remove file {file_path}: {str(e)}")
 
     return jsonify(response)
 
@@ -239,29 +579,25 @@ def extract_resume():
     if file_extension not in allowed_extensions:
         return jsonify({'error': f'Unsupported file format. Allowed: {", ".join(allowed_extensions)}'}), 400
     
-    # Save file temporarily
-    file_path = os.path.join(UPLOAD_FOLDER, file.filename)
-    file.save(file_path)
-    
     try:
-        # Extract text from resume
-        extracted_text = extract_resume_text(file_path)
+        # Extract text, clean it and detect basic information
+        analysis = analyze_upload(file)
         
-        if not extracted_text:
+        if not analysis['raw_text']:
             return jsonify({'error': 'Could not extract text from resume. The file might be corrupted or contain only images.'}), 400
         
-        # Clean the extracted text
-        clean_text = clean_extracted_text(extracted_text)
-
-        # Extract basic information
-        basic_info = extract_basic_info(clean_text, extracted_text)
+        clean_text = analysis['clean_text']
+        basic_info = analysis['basic_info']
         
         response = {
             "success": True,
+            "resume_id": store_resume(analysis),
             "file_info": {
                 "filename": file.filename,
                 "file_type": file_extension,
-                "text_length": len(clean_text)
+                "text_length": len(clean_text),
+                "truncated": analysis.get('truncated', False),
+                "truncated_reason": analysis.get('truncated_reason')
             },
             "extracted_content": {
                 "full_text": clean_text,
@@ -284,190 +620,352 @@ def extract_resume():
         
         return jsonify(response)
         
+    except ExtractionSandboxError as e:
+        logger.warning("Sandboxed extraction stopped (%s): %s", e.reason, e)
+        return sandbox_error_response(e)
     except Exception as e:
-        print(f"Error extracting resume: {str(e)}")
+        logger.error("Error extracting resume: %s", e)
         return jsonify({'error': f'Error extracting resume: {str(e)}'}), 500
-    
-    finally:
-        # Clean up - remove the uploaded file
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-            except Exception as e:
-                print(f"Warning: Could not remove file {file_path}: {str(e)}")
 
-@app.route('/ai/career-recommendations', methods=['POST'])
-def get_career_recommendations():
+def batch_result_line(item, analysis, cached, error):
     """
-    Endpoint for getting AI-powered career recommendations
+    One NDJSON line describing a single resume in a batch
     """
-    if not gemini_service:
-        return jsonify({'error': 'AI service not available'}), 503
-    
-    data = request.get_json()
-    
-    if not data:
-        return jsonify({'error': 'No data provided'}), 400
-    
-    skills_by_category = data.get('skills_by_category', {})
-    preferences = data.get('preferences', {})
-    experience_level = data.get('experience_level', 'intermediate')
-    
-    try:
-        print(f"Received request - Skills: {skills_by_category}, Preferences: {preferences}")
-        
-        recommendations = gemini_service.generate_career_recommendations(
-            skills_by_category=skills_by_category,
-            preferences=preferences,
-            experience_level=experience_level
+    result = {"index": item.index, "filename": item.filename}
+    if error or not analysis['raw_text']:
+        result.update(success=False, error=error or 'Could not extract text from resume')
+    else:
+        basic_info = analysis['basic_info']
+        result.update(
+            success=True,
+            resume_id=store_resume(analysis),
+            cached=cached,
+            text_length=len(analysis['clean_text']),
+            truncated=analysis.get('truncated', False),
+            truncated_reason=analysis.get('truncated_reason'),
+            email=basic_info.get('email'),
+            skills=basic_info.get('skills', []),
+            skills_by_category=basic_info.get('skills_summary', {}),
+            total_skills_found=len(basic_info.get('skills', [])),
+            experience_keywords=basic_info.get('experience_keywords', []),
+            education_keywords=basic_info.get('education_keywords', [])
         )
-        
-        print(f"Generated recommendations successfully")
-        
-        return jsonify({
-            'success': True,
-            'recommendations': recommendations
-        })
-        
-    except Exception as e:
-        print(f"ERROR in career recommendations: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return jsonify({'error': f'Error generating recommendations: {str(e)}'}), 500
+    return app.json.dumps(result) + "\n"
 
-@app.route('/ai/skill-analysis', methods=['POST'])
-def analyze_skills():
+@app.route('/extract-batch', methods=['POST'])
+def extract_batch():
     """
-    Endpoint for AI-powered skill gap analysis and improvement suggestions
+    Extract many resumes in one request. Accepts any number of files under
+    'resumes', each a PDF/DOCX or a zip archive of them, and streams back
+    one NDJSON line per resume as soon as it is processed. Failures are
+    reported on the resume's own line and do not stop the batch; only
+    the batch-wide BATCH_MAX_FILES and BATCH_MAX_TOTAL_BYTES limits skip
+    the resumes after the one that reached them.
     """
+    files = request.files.getlist('resumes')
+
+    if not files:
+        return jsonify({'error': 'No resumes uploaded'}), 400
+    if len(files) > config.BATCH_MAX_FILES:
+        return jsonify({'error': f"Batch contains more than {config.BATCH_MAX_FILES} files"}), 413
+
+    # Resumes are read (and archives expanded) only as the pool has room for
+    # them; batch-wide limits are reported on the line of the resume that hit them
+    items = iter_batch_items(
+        ((file.filename, file.stream) for file in files),
+        max_files=config.BATCH_MAX_FILES,
+        max_file_bytes=config.MAX_CONTENT_LENGTH,
+        max_archive_bytes=config.BATCH_ZIP_MAX_UNCOMPRESSED,
+        max_ratio=config.BATCH_ZIP_MAX_RATIO,
+        max_total_bytes=config.BATCH_MAX_TOTAL_BYTES
+    )
+
+    logger.info("Batch extraction started: %d uploads", len(files))
+
+    def generate():
+        for result in iter_batch_analyses(items, cache=extraction_cache, max_in_flight=config.BATCH_MAX_IN_FLIGHT,
+                                          submit=submit_analysis):
+            item, analysis, cached, error = result
+            if analysis is not None and not cached:
+                record_stage_timings(analysis.get('timings'))
+            yield batch_result_line(*result)
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """
+    Stage latencies, request counts, in-flight requests, Gemini fallbacks
+    and cache hits in the Prometheus text format
+    """
+    if not metrics_enabled():
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/cache/stats', methods=['GET'])
+def extraction_cache_stats():
+    """
+    Hit/miss counters for the extraction result cache
+    """
+    return jsonify(extraction_cache.stats())
+
+def run_ai_operation(operation):
+    """
+    /ai/<operation>: fill in the body from its resume_id, validate it and
+    call the operation's GeminiService method (see AI_OPERATIONS)
+    """
+    gemini_service = get_gemini_service()
     if not gemini_service:
         return jsonify({'error': 'AI service not available'}), 503
-    
+
     data = request.get_json()
-    
+
     if not data:
         return jsonify({'error': 'No data provided'}), 400
-    
-    current_skills = data.get('current_skills', [])
-    target_roles = data.get('target_roles', [])
-    preferences = data.get('preferences', {})
-    
+
+    data, error_response = resolve_resume(operation, data)
+    if error_response is not None:
+        return error_response
+
+    ai_operation = AI_OPERATIONS[operation]
+    missing_error = ai_operation.validate(data)
+    if missing_error:
+        return jsonify({'error': missing_error}), 400
+
     try:
-        skill_analysis = gemini_service.suggest_skill_improvements(
-            current_skills=current_skills,
-            target_roles=target_roles,
-            preferences=preferences
-        )
-        
-        return jsonify({
-            'success': True,
-            'analysis': skill_analysis
-        })
-        
+        return jsonify(ai_operation.call(gemini_service, data))
     except Exception as e:
-        return jsonify({'error': f'Error analyzing skills: {str(e)}'}), 500
+        logger.exception("%s: %s", ai_operation.error_message, e)
+        return jsonify({'error': f'{ai_operation.error_message}: {str(e)}'}), 500
+
+for operation in AI_OPERATIONS:
+    app.add_url_rule(f'/ai/{operation}', f'ai_{operation}', run_ai_operation, methods=['POST'],
+                     defaults={'operation': operation})
+
+def probe_gemini():
+    gemini_service = get_gemini_service()
+    if not gemini_service:
+        raise RuntimeError('AI service not initialized')
+    gemini_service.ping(timeout=config.HEALTH_PROBE_TIMEOUT)
+
+# Gemini availability is checked in the background and cached, so health
+# checks never wait on (or spend quota with) a live generation
+gemini_prober = None
+if config_valid and gemini_key_present and config.HEALTH_PROBE_INTERVAL > 0:
+    gemini_prober = HealthProber(probe_gemini, interval=config.HEALTH_PROBE_INTERVAL,
+                                 window=config.HEALTH_PROBE_WINDOW)
 
-@app.route('/ai/resume-analysis', methods=['POST'])
-def analyze_resume_ai():
+def ai_status():
     """
-    Endpoint for AI-powered resume analysis
+    Cached AI service status for /ai/status and /health/ready
     """
-    if not gemini_service:
-        return jsonify({'error': 'AI service not available'}), 503
-    
-    data = request.get_json()
-    
-    if not data:
-        return jsonify({'error': 'No data provided'}), 400
-    
-    skills_by_category = data.get('skills_by_category', {})
-    preferences = data.get('preferences', {})
-    resume_text = data.get('resume_text', '')
-    
-    if not resume_text:
-        return jsonify({'error': 'Resume text is required'}), 400
-    
-    try:
-        analysis = gemini_service.analyze_resume_gaps(
-            skills_by_category=skills_by_category,
-            preferences=preferences,
-            extracted_text=resume_text
+    status = {'api_configured': gemini_key_present}
+    if gemini_prober is None:
+        status.update(available=False, message='AI service not initialized')
+        return status
+
+    probe = gemini_prober.snapshot()
+    if probe['checked_at'] is None:
+        status.update(available=False, message='AI service check pending')
+    elif probe['ok']:
+        status.update(available=True, message='AI service is working')
+    else:
+        status.update(available=False, message=f"AI service error: {probe['last_error']}")
+    status['probe'] = probe
+    return status
+
+@app.route('/ai/status', methods=['GET'])
+def ai_service_status():
+    """
+    Check if AI service is available and working, from the background probe
+    """
+    return jsonify(ai_status())
+
+@app.route('/health/live', methods=['GET'])
+def health_live():
+    """
+    Liveness: the process is up and serving requests
+    """
+    return jsonify({'status': 'ok'})
+
+@app.route('/health/ready', methods=['GET'])
+def health_ready():
+    """
+    Readiness: configuration is valid and, with HEALTH_REQUIRE_AI, the
+    last AI probe passed. Resume extraction does not depend on the AI
+    service, so by default an AI outage does not take the instance out.
+    """
+    ai = ai_status()
+    ready = config_valid and (ai['available'] or not config.HEALTH_REQUIRE_AI)
+    return jsonify({'ready': ready, 'config_valid': config_valid, 'ai': ai}), 200 if ready else 503
+
+# Asynchronous jobs: the work of /process and /ai/* run by the job queue's
+# worker threads, so the request returns a job id instead of waiting on Gemini
+
+def run_process_job(payload, job):
+    """
+    Job handler for /jobs/process; the result has the same shape as a
+    /process response
+    """
+    ai_recommendations = {}
+    timings = {'extraction_ms': payload['extraction_ms']}
+    gemini_service = get_gemini_service()
+    if gemini_service:
+        ai_recommendations, ai_timings = generate_ai_insights(
+            gemini_service, payload['basic_info'], payload['clean_text'], payload['ai_preferences'],
+            should_stop=job.cancel_requested
         )
-        
-        return jsonify({
-            'success': True,
-            'analysis': analysis
-        })
-        
-    except Exception as e:
-        return jsonify({'error': f'Error analyzing resume: {str(e)}'}), 500
+        timings.update(ai_timings)
 
-@app.route('/ai/learning-path', methods=['POST'])
-def generate_learning_path():
+    return process_response(payload['extracted_info'], payload.get('resume_id'), payload['preferences'],
+                            ai_recommendations, timings)
+
+def run_ai_job(payload, job):
     """
-    Endpoint for generating personalized learning paths
+    Job handler for /jobs/ai/<operation>
     """
+    gemini_service = get_gemini_service()
     if not gemini_service:
+        raise RuntimeError('AI service not available')
+    return AI_OPERATIONS[payload['operation']].call(gemini_service, payload['data'])
+
+job_queue = JobQueue(
+    config.JOBS_DB_PATH,
+    handlers={'process': run_process_job, 'ai': run_ai_job},
+    workers=config.JOBS_WORKERS,
+    result_ttl=config.JOBS_RESULT_TTL,
+    max_queued=config.JOBS_MAX_QUEUED,
+    lease_seconds=config.JOBS_LEASE_SECONDS,
+    callback_timeout=config.JOBS_CALLBACK_TIMEOUT,
+    callback_hosts=config.JOBS_CALLBACK_ALLOWED_HOSTS,
+    callback_secret=config.JOBS_CALLBACK_SECRET
+)
+
+def enqueue_job(kind, payload, callback_url):
+    """
+    Queue a job and return the 202 response pointing at its status URL
+    """
+    try:
+        job_id = job_queue.enqueue(kind, payload, callback_url=callback_url or None)
+    except CallbackNotAllowed as e:
+        return jsonify({'error': str(e)}), 400
+    except JobQueueFull as e:
+        return jsonify({'error': f'Job queue is full: {str(e)}'}), 503
+
+    return jsonify({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': url_for('get_job', job_id=job_id)
+    }), 202
+
+@app.route('/jobs/process', methods=['POST'])
+def create_process_job():
+    """
+    Asynchronous /process. The resume is extracted right away (so upload
+    errors are reported immediately) and the AI analysis is queued as a job;
+    poll GET /jobs/<job_id> or pass a callback_url form field.
+    """
+    preferences = process_preferences(request.form)
+    analysis, extraction_ms, error_response = extract_process_upload(request.files.get('resume'))
+    if error_response is not None:
+        return error_response
+
+    return enqueue_job('process', {
+        'resume_id': store_resume(analysis),
+        'extraction_ms': extraction_ms,
+        'extracted_info': extracted_info_block(analysis),
+        'basic_info': analysis['basic_info'],
+        'clean_text': analysis['clean_text'],
+        'preferences': preferences,
+        'ai_preferences': ai_preferences(preferences)
+    }, request.form.get('callback_url'))
+
+@app.route('/jobs/ai/<operation>', methods=['POST'])
+def create_ai_job(operation):
+    """
+    Asynchronous variant of /ai/<operation>, taking the same JSON body plus
+    an optional callback_url. The job result is the synchronous response body.
+    """
+    if operation not in AI_OPERATIONS:
+        return jsonify({'error': f"Unknown AI operation. Allowed: {', '.join(AI_OPERATIONS)}"}), 404
+
+    if not get_gemini_service():
         return jsonify({'error': 'AI service not available'}), 503
-    
+
     data = request.get_json()
-    
+
     if not data:
         return jsonify({'error': 'No data provided'}), 400
-    
-    current_skills = data.get('current_skills', [])
-    target_role = data.get('target_role', '')
-    learning_preference = data.get('learning_preference', 'balanced')
-    
-    if not target_role:
-        return jsonify({'error': 'Target role is required'}), 400
-    
-    try:
-        learning_path = gemini_service.generate_learning_path(
-            current_skills=current_skills,
-            target_role=target_role,
-            learning_preference=learning_preference
-        )
-        
-        return jsonify({
-            'success': True,
-            'learning_path': learning_path
-        })
-        
-    except Exception as e:
-        return jsonify({'error': f'Error generating learning path: {str(e)}'}), 500
 
-@app.route('/ai/status', methods=['GET'])
-def ai_service_status():
+    data, error_response = resolve_resume(operation, data)
+    if error_response is not None:
+        return error_response
+
+    missing_error = AI_OPERATIONS[operation].validate(data)
+    if missing_error:
+        return jsonify({'error': missing_error}), 400
+
+    callback_url = data.pop('callback_url', None)
+    return enqueue_job('ai', {'operation': operation, 'data': data}, callback_url)
+
+@app.route('/jobs/stats', methods=['GET'])
+def job_queue_stats():
     """
-    Check if AI service is available and working
+    Job counts by status
     """
-    if not gemini_service:
-        return jsonify({
-            'available': False,
-            'message': 'AI service not initialized'
-        })
-    
-    try:
-        # Test with a simple request
-        test_response = gemini_service.generate_career_recommendations(
-            skills_by_category={'technical': ['python']},
-            preferences={'industries': 'technology'},
-            experience_level='intermediate'
-        )
-        
-        return jsonify({
-            'available': True,
-            'message': 'AI service is working',
-            'api_configured': bool(os.getenv('GEMINI_API_KEY'))
-        })
-        
-    except Exception as e:
-        return jsonify({
-            'available': False,
-            'message': f'AI service error: {str(e)}',
-            'api_configured': bool(os.getenv('GEMINI_API_KEY'))
-        })
+    return jsonify(job_queue.stats())
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """
+    Status of a job, with its result once it has succeeded. Finished jobs
+    are kept for JOBS_RESULT_TTL seconds.
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    return jsonify(job)
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+def cancel_job(job_id):
+    """
+    Cancel a job. Queued jobs are cancelled immediately; running jobs stop
+    after their current Gemini call and their result is discarded.
+    """
+    job = job_queue.cancel(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found or expired'}), 404
+    return jsonify(job)
+
+_background_lock = threading.Lock()
+_background_started = False
+
+def start_background_workers():
+    """
+    Start the job workers, the Gemini health prober and the resume store
+    purge. Called by the server entry points rather than at
+    import, so processes that only import this module (extraction pool and
+    sandbox children, tests, benchmarks) do not run them. Idempotent.
+    """
+    global _background_started
+    with _background_lock:
+        if _background_started:
+            return
+        _background_started = True
+    job_queue.start()
+    resume_store.start()
+    if gemini_prober is not None:
+        gemini_prober.start()
+
+@app.before_request
+def ensure_background_workers():
+    # Fallback for WSGI servers that import app:app without a startup hook
+    if not _background_started:
+        start_background_workers()
 
 if __name__ == '__main__':
+    from werkzeug.serving import is_running_from_reloader
+    # The reloader's watcher process never serves requests
+    if is_running_from_reloader():
+        start_background_workers()
     app.run(port=5000,debug=True)
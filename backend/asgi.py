@@ -0,0 +1,207 @@
+"""
+ASGI application for the resume/AI service.
+
+The endpoints that wait on Gemini (/process, /process/stream and /ai/*) are
+async Quart handlers that await the Gemini client, so one process can keep
+hundreds of LLM requests in flight without a thread per request. Every
+other route (extraction, batch, jobs, health checks, cache stats, CORS
+preflight) is served by the Flask app in app.py through a threaded WSGI
+bridge. Paths and response shapes are the same as under Flask.
+
+Run with serve.py, or directly: uvicorn asgi:application
+"""
+
+import asyncio
+import logging
+import time
+
+from a2wsgi import WSGIMiddleware
+from quart import Quart, Response, g, jsonify, request
+from quart.wrappers.response import DataBody
+
+import app as flask_service
+from utils.ai_pipeline import AI_OPERATIONS, build_insight_stages, iter_stage_graph_async
+from utils.json_provider import FastJSONProvider
+from utils.metrics import HTTP_IN_FLIGHT, HTTP_REQUEST_DURATION, HTTP_REQUESTS, metrics_enabled
+
+config = flask_service.config
+logger = logging.getLogger(__name__)
+
+quart_app = Quart(__name__, static_folder=None)
+quart_app.config['MAX_CONTENT_LENGTH'] = config.MAX_CONTENT_LENGTH
+# AI_PROCESS_TIMEOUT bounds the Gemini work; Quart's own 60s response
+# timeout would cut off slow /process streams first
+quart_app.config['RESPONSE_TIMEOUT'] = None
+if config.FAST_JSON_ENABLED:
+    quart_app.json = FastJSONProvider(quart_app)
+
+@quart_app.before_request
+async def start_request_metrics():
+    if metrics_enabled():
+        g.metrics_endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        g.metrics_started = time.perf_counter()
+        HTTP_IN_FLIGHT.inc(endpoint=g.metrics_endpoint)
+
+@quart_app.after_request
+async def finish_response(response):
+    # Preflight requests go to the Flask app, where flask-cors answers them
+    response.headers.setdefault('Access-Control-Allow-Origin', '*')
+    # Same compression as the Flask app; streamed bodies (SSE) are skipped
+    compressor = flask_service.response_compressor
+    if compressor is not None and isinstance(response.response, DataBody) and compressor.is_candidate(response):
+        compressor.encode(response, await response.get_data(), request.accept_encodings)
+    if 'metrics_started' in g:
+        HTTP_REQUESTS.inc(endpoint=g.metrics_endpoint, method=request.method, status=str(response.status_code))
+        HTTP_REQUEST_DURATION.observe(time.perf_counter() - g.metrics_started, endpoint=g.metrics_endpoint)
+    return response
+
+@quart_app.teardown_request
+async def finish_request_metrics(error=None):
+    if 'metrics_started' in g:
+        HTTP_IN_FLIGHT.dec(endpoint=g.metrics_endpoint)
+
+@quart_app.before_serving
+async def start_workers():
+    """
+    Start the job workers, health prober and resume store purge once the
+    server is up, in each worker process
+    """
+    flask_service.start_background_workers()
+
+@quart_app.after_serving
+async def shutdown_workers():
+    """
+    Let queued jobs stay in the job database and stop background workers
+    before the server process exits
+    """
+    await asyncio.to_thread(flask_service.job_queue.stop, config.ASGI_GRACEFUL_TIMEOUT)
+    flask_service.resume_store.stop()
+    flask_service.ai_executor.shutdown(wait=False, cancel_futures=True)
+    if flask_service.gemini_prober is not None:
+        flask_service.gemini_prober.stop()
+    if flask_service.extraction_sandbox is not None:
+        flask_service.extraction_sandbox.shutdown()
+
+async def extract_process_upload():
+    """
+    Read the /process form and extract its upload off the event loop, with
+    the same validation as the Flask endpoint.
+    Returns (analysis, extraction_ms, preferences, error_response).
+    """
+    files = await request.files
+    preferences = flask_service.process_preferences(await request.form)
+    analysis, extraction_ms, error_response = await asyncio.to_thread(
+        flask_service.extract_process_upload, files.get('resume'))
+    return analysis, extraction_ms, preferences, error_response
+
+def insight_stages(gemini_service, analysis, preferences):
+    return build_insight_stages(gemini_service, analysis['basic_info'], analysis['clean_text'],
+                                flask_service.ai_preferences(preferences), asynchronous=True)
+
+@quart_app.route('/process', methods=['POST'])
+async def process_resume():
+    """
+    Async /process; Accept: text/event-stream selects the streaming response
+    """
+    if request.accept_mimetypes.best_match(['application/json', 'text/event-stream']) == 'text/event-stream':
+        return await process_resume_stream()
+
+    analysis, extraction_ms, preferences, error_response = await extract_process_upload()
+    if error_response is not None:
+        return error_response
+
+    ai_recommendations = {}
+    timings = {'extraction_ms': extraction_ms}
+    resume_id = await asyncio.to_thread(flask_service.store_resume, analysis)
+    gemini_service = await asyncio.to_thread(flask_service.get_gemini_service)
+    if gemini_service:
+        timings['ai_stages'] = {}
+        errors = []
+        ai_started = time.perf_counter()
+        async for stage in iter_stage_graph_async(insight_stages(gemini_service, analysis, preferences),
+                                                  timeout=config.AI_PROCESS_TIMEOUT):
+            flask_service.record_stage(stage, timings, errors, ai_recommendations)
+        flask_service.finish_ai_stages(timings, errors, ai_started)
+        if errors:
+            ai_recommendations['error'] = '; '.join(errors)
+
+    return jsonify(flask_service.process_response(flask_service.extracted_info_block(analysis), resume_id,
+                                                  preferences, ai_recommendations, timings))
+
+@quart_app.route('/process/stream', methods=['POST'])
+async def process_resume_stream():
+    """
+    Async /process/stream: the same Server-Sent Events as the Flask endpoint
+    """
+    analysis, extraction_ms, preferences, error_response = await extract_process_upload()
+    if error_response is not None:
+        return error_response
+    resume_id = await asyncio.to_thread(flask_service.store_resume, analysis)
+    gemini_service = await asyncio.to_thread(flask_service.get_gemini_service)
+
+    async def generate():
+        timings = {'extraction_ms': extraction_ms}
+        yield flask_service.stream_opening_event(analysis, resume_id, preferences, timings)
+        if not gemini_service:
+            yield flask_service.stream_summary_event(False, [], timings)
+            return
+
+        timings['ai_stages'] = {}
+        errors = []
+        ai_started = time.perf_counter()
+        async for stage in iter_stage_graph_async(insight_stages(gemini_service, analysis, preferences),
+                                                  timeout=config.AI_PROCESS_TIMEOUT):
+            yield flask_service.sse_event('ai_insight', flask_service.record_stage(stage, timings, errors))
+        flask_service.finish_ai_stages(timings, errors, ai_started)
+        yield flask_service.stream_summary_event(True, errors, timings)
+
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+async def run_ai_operation(operation):
+    """
+    Async /ai/<operation>: same validation and response body as the Flask endpoints
+    """
+    gemini_service = await asyncio.to_thread(flask_service.get_gemini_service)
+    if not gemini_service:
+        return jsonify({'error': 'AI service not available'}), 503
+
+    data = await request.get_json()
+
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+
+    ai_operation = AI_OPERATIONS[operation]
+    if data.get('resume_id'):
+        resume = await asyncio.to_thread(flask_service.resume_store.get, str(data['resume_id']))
+        if resume is None:
+            return jsonify({'error': 'Resume not found or expired'}), 404
+        data = ai_operation.with_resume(data, resume)
+
+    missing_error = ai_operation.validate(data)
+    if missing_error:
+        return jsonify({'error': missing_error}), 400
+
+    try:
+        return jsonify(await ai_operation.call_async(gemini_service, data))
+    except Exception as e:
+        logger.exception("%s: %s", ai_operation.error_message, e)
+        return jsonify({'error': f'{ai_operation.error_message}: {str(e)}'}), 500
+
+for operation in AI_OPERATIONS:
+    quart_app.add_url_rule(f'/ai/{operation}', f'ai_{operation}', run_ai_operation, methods=['POST'],
+                           defaults={'operation': operation})
+
+# Paths and methods served natively; everything else goes to the Flask app
+ASYNC_ROUTES = {}
+for rule in quart_app.url_map.iter_rules():
+    ASYNC_ROUTES.setdefault(rule.rule, set()).update(rule.methods - {'OPTIONS'})
+
+wsgi_app = WSGIMiddleware(flask_service.app, workers=config.ASGI_WSGI_THREADS)
+
+async def application(scope, receive, send):
+    if scope['type'] == 'http' and scope['method'] not in ASYNC_ROUTES.get(scope['path'], ()):
+        await wsgi_app(scope, receive, send)
+    else:
+        # Also lifespan events, which run the after_serving shutdown hook
+        await quart_app(scope, receive, send)
@@ -0,0 +1,114 @@
+"""
+Benchmark of DOCX text extraction: the python-docx object model versus
+the streaming word/document.xml parser.
+
+Generates table-heavy resumes, including tables with horizontally and
+vertically merged cells, and reports time and peak allocation per
+document for both implementations. Both must find the same set of
+paragraph and cell texts; only the order and duplicate merged cells differ.
+
+Usage (from the backend directory):
+    python benchmarks/bench_docx_extractor.py --rows 50 200 800
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from docx import Document
+
+from corpus import COMPANIES, OBJECTS, SKILLS, TITLES, VERBS, resume_sections, write_table_docx
+from utils.resume_extractor import extract_text_from_docx
+
+
+def legacy_extract_text_from_docx(data):
+    """The python-docx implementation this benchmark compares against."""
+    doc = Document(io.BytesIO(data))
+    text = []
+    for paragraph in doc.paragraphs:
+        if paragraph.text.strip():
+            text.append(paragraph.text)
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                if cell.text.strip():
+                    text.append(cell.text)
+    return "\n".join(text)
+
+
+def merged_table_docx(rows, rng):
+    """A resume whose experience table merges the company column down each
+    employer's rows and merges the highlight cell across two columns."""
+    document = Document()
+    document.add_paragraph(rng.choice(TITLES))
+    document.add_heading('Experience', level=2)
+    table = document.add_table(rows=rows, cols=4)
+    for start in range(0, rows, 4):
+        block = table.rows[start:start + 4]
+        company = block[0].cells[0].merge(block[-1].cells[0])
+        company.text = rng.choice(COMPANIES)
+        for row in block:
+            row.cells[1].text = rng.choice(TITLES)
+            highlight = row.cells[2].merge(row.cells[3])
+            highlight.text = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {', '.join(rng.sample(SKILLS, 2))}"
+    document.add_heading('Skills', level=2)
+    document.add_paragraph(', '.join(rng.sample(SKILLS, 10)))
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def table_docx(rng):
+    buffer = io.BytesIO()
+    write_table_docx(buffer, resume_sections(rng), rng)
+    return buffer.getvalue()
+
+
+def measure(extract, data, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        text = extract(data)
+    elapsed_ms = (time.perf_counter() - start) / repeat * 1000
+
+    tracemalloc.start()
+    extract(data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return text, elapsed_ms, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[50, 200, 800], help='rows in the merged-cell table')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    documents = [('table-heavy', table_docx(rng))]
+    documents += [(f"merged x{rows} rows", merged_table_docx(rows, rng)) for rows in args.rows]
+
+    print(f"{'document':<20} {'before ms':>10} {'after ms':>10} {'before KiB':>11} {'after KiB':>10} "
+          f"{'before chars':>13} {'after chars':>12}")
+    mismatches = 0
+    for label, data in documents:
+        old_text, old_ms, old_kib = measure(legacy_extract_text_from_docx, data, args.repeat)
+        new_text, new_ms, new_kib = measure(extract_text_from_docx, data, args.repeat)
+        print(f"{label:<20} {old_ms:>10.2f} {new_ms:>10.2f} {old_kib:>11.0f} {new_kib:>10.0f} "
+              f"{len(old_text):>13} {len(new_text):>12}")
+        if set(old_text.split('\n')) != set(new_text.split('\n')):
+            mismatches += 1
+
+    print(f"Content mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
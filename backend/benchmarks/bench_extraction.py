@@ -0,0 +1,168 @@
+"""
+Stage-by-stage benchmark of resume extraction over a generated corpus.
+
+Builds a synthetic corpus (single-column, two-column, long and text-sparse
+PDFs plus table-heavy DOCX files) from a seed, times each pipeline stage
+per document and writes p50/p95 timings and peak RSS to a JSON file.
+Pass --compare with an earlier results file to print the change per stage.
+
+Usage (from the backend directory):
+    python benchmarks/bench_extraction.py --output results.json
+    python benchmarks/bench_extraction.py --output new.json --compare results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import KINDS, generate_corpus
+from utils.resume_extractor import (
+    clean_extracted_text,
+    extract_skills_from_text,
+    extract_text_from_docx,
+    extract_text_from_pdf,
+    get_section_entries,
+    get_skill_matcher,
+    segment_resume_sections,
+)
+
+STAGES = ['extract_text_from_pdf', 'extract_text_from_docx', 'clean_extracted_text',
+          'extract_skills_from_text', 'sections']
+
+
+def peak_rss_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def percentile(values, pct):
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method='inclusive')[pct - 1]
+
+
+def timed(timings, stage, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    timings.setdefault(stage, []).append((time.perf_counter() - start) * 1000)
+    return result
+
+
+def sections(raw_text):
+    segments = segment_resume_sections(raw_text)
+    return get_section_entries(segments, 'experience'), get_section_entries(segments, 'projects')
+
+
+def run_document(path, timings):
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    if path.endswith('.pdf'):
+        raw_text = timed(timings, 'extract_text_from_pdf', extract_text_from_pdf, data)
+    else:
+        raw_text = timed(timings, 'extract_text_from_docx', extract_text_from_docx, data)
+    raw_text = raw_text or ''
+
+    clean_text = timed(timings, 'clean_extracted_text', clean_extracted_text, raw_text)
+    timed(timings, 'extract_skills_from_text', extract_skills_from_text, clean_text)
+    timed(timings, 'sections', sections, raw_text)
+
+
+def summarize(samples):
+    return {
+        'runs': len(samples),
+        'p50_ms': round(percentile(samples, 50), 3),
+        'p95_ms': round(percentile(samples, 95), 3),
+        'mean_ms': round(statistics.fmean(samples), 3)
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline):
+    print(f"\nChange in p50 against {baseline.get('revision') or 'baseline'}:")
+    for kind, stages in results['kinds'].items():
+        for stage, summary in stages.items():
+            old = baseline.get('kinds', {}).get(kind, {}).get(stage)
+            if not old or not old['p50_ms']:
+                continue
+            change = (summary['p50_ms'] - old['p50_ms']) / old['p50_ms'] * 100
+            print(f"  {kind:<18} {stage:<26} {old['p50_ms']:>9.3f} -> {summary['p50_ms']:>9.3f} ms ({change:+.1f}%)")
+    print(f"  peak RSS {baseline.get('peak_rss_kb')} -> {results['peak_rss_kb']} KiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--per-kind', type=int, default=5, help='documents generated per corpus kind')
+    parser.add_argument('--repeat', type=int, default=3, help='passes over the corpus')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--corpus-dir', help='keep the generated corpus here instead of a temp dir')
+    parser.add_argument('--output', default='extraction_benchmark.json', help='results JSON file')
+    parser.add_argument('--compare', help='earlier results JSON to compare against')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus = generate_corpus(args.corpus_dir or tmp_dir, per_kind=args.per_kind, seed=args.seed)
+        rss_before = peak_rss_kb()
+        get_skill_matcher()
+
+        by_kind = {kind: {} for kind in KINDS}
+        overall = {}
+        for _ in range(args.repeat):
+            for kind, path in corpus:
+                timings = {}
+                run_document(path, timings)
+                for stage, samples in timings.items():
+                    by_kind[kind].setdefault(stage, []).extend(samples)
+                    overall.setdefault(stage, []).extend(samples)
+
+    results = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'seed': args.seed,
+        'documents': len(corpus),
+        'repeat': args.repeat,
+        'peak_rss_kb': peak_rss_kb(),
+        'peak_rss_before_kb': rss_before,
+        'stages': {stage: summarize(overall[stage]) for stage in STAGES if stage in overall},
+        'kinds': {
+            kind: {stage: summarize(samples) for stage, samples in stages.items()}
+            for kind, stages in by_kind.items()
+        }
+    }
+
+    print(f"{len(corpus)} documents x {args.repeat} passes, peak RSS {results['peak_rss_kb']} KiB")
+    print(f"  {'stage':<26} {'p50 ms':>9} {'p95 ms':>9}")
+    for stage, summary in results['stages'].items():
+        print(f"  {stage:<26} {summary['p50_ms']:>9.3f} {summary['p95_ms']:>9.3f}")
+
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""
+Benchmark of exact versus fuzzy skill matching.
+
+Generates resumes in which every planted skill is spelled as a variant of
+one of its aliases (split with a space, punctuation dropped or added, or
+one mistyped letter) and reports throughput, recall of the planted skills
+and skills found that were not planted, for exact and fuzzy mode.
+
+Precision is checked on clean text: correctly spelled resumes mixed with
+ordinary words that sit one edit away from short aliases ("pearl",
+"iconic", "reacts"). Exact matching is right by construction there, so
+every skill only fuzzy mode finds is a false positive; the most frequent
+ones are listed.
+
+Usage (from the backend directory):
+    python benchmarks/bench_fuzzy_matcher.py --count 2000 --threshold 0.88
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from bench_skill_matcher import FILLER_WORDS
+from corpus import flatten, resume_sections
+from utils.resume_extractor import FUZZY_MIN_ALIAS_LENGTH, get_comprehensive_skills_database, get_skill_matcher
+
+
+# Ordinary resume words close to skill aliases; none of them names a skill
+LOOKALIKE_WORDS = [
+    'unit tests', 'iconic', 'pearl', 'reacts', 'nodes', 'mochas', 'communicator', 'communicated',
+    'expressed', 'springs', 'swiftly', 'rusty', 'flasks', 'servers', 'managers', 'oracles',
+    'scaled', 'graphs', 'kernels', 'dockers', 'shipped', 'ember', 'jasmines', 'sparked',
+    'pandemic', 'reporters', 'presenter', 'analyzer', 'testers', 'schedules', 'migrations'
+]
+
+
+def spelling_variant(alias, rng):
+    """Write an alias the way a resume might: split, re-punctuated or with a typo"""
+    letters = [index for index, char in enumerate(alias) if char.isalpha()][1:]
+    choice = rng.randrange(4)
+    if choice == 0 and len(alias) > 4:
+        split = rng.randrange(2, len(alias) - 1)
+        return alias[:split] + ' ' + alias[split:]
+    if choice == 1 and any(not char.isalnum() for char in alias):
+        return ''.join(char if char.isalnum() else ' ' for char in alias)
+    if choice == 2 and letters:
+        index = rng.choice(letters)
+        return alias[:index] + alias[index + 1:]
+    if letters:
+        index = rng.choice(letters)
+        return alias[:index] + alias[index].upper() + alias[index + 1:]
+    return alias
+
+
+def generate_corpus(count, seed):
+    rng = random.Random(seed)
+    candidates = [
+        (skill_info['name'], alias.strip())
+        for skills in get_comprehensive_skills_database().values()
+        for skill_info in skills
+        for alias in skill_info['aliases']
+        if len(alias.strip().replace(' ', '')) >= FUZZY_MIN_ALIAS_LENGTH + 2
+    ]
+    corpus = []
+    for _ in range(count):
+        planted = set()
+        words = []
+        for _ in range(rng.randint(300, 900)):
+            if rng.random() < 0.02:
+                skill_name, alias = rng.choice(candidates)
+                planted.add(skill_name)
+                words.append(spelling_variant(alias, rng))
+            else:
+                words.append(rng.choice(FILLER_WORDS))
+        corpus.append((' '.join(words), planted))
+    return corpus
+
+
+def generate_clean_corpus(count, seed):
+    """Correctly spelled resumes with lookalike words mixed into their lines"""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        lines = flatten(resume_sections(rng, jobs=rng.randint(2, 6), projects=rng.randint(1, 4)))
+        lines += [' '.join(rng.choice(LOOKALIKE_WORDS + FILLER_WORDS) for _ in range(12)) for _ in range(20)]
+        corpus.append('\n'.join(lines))
+    return corpus
+
+
+def run_clean(corpus, threshold):
+    matcher = get_skill_matcher()
+    false_positives = Counter()
+    for text in corpus:
+        text_lower = text.lower()
+        extra = matcher.find_skill_names(text_lower, threshold) - matcher.find_skill_names(text_lower, None)
+        for match in matcher.find_fuzzy_matches(text_lower, threshold):
+            if match['skill'] in extra:
+                false_positives[f"{match['text']!r} -> {match['skill']}"] += 1
+    print(f"clean    fuzzy-only skills {sum(false_positives.values()) / len(corpus):.3f}/resume")
+    for description, count in false_positives.most_common(10):
+        print(f"  {count:>6}  {description}")
+
+
+def run(label, corpus, threshold):
+    matcher = get_skill_matcher()
+    start = time.perf_counter()
+    results = [matcher.find_skill_names(text.lower(), threshold) for text, _ in corpus]
+    elapsed = time.perf_counter() - start
+
+    planted_total = sum(len(planted) for _, planted in corpus)
+    recalled = sum(len(found & planted) for found, (_, planted) in zip(results, corpus))
+    unplanted = sum(len(found - planted) for found, (_, planted) in zip(results, corpus))
+    print(f"{label:<8} {len(corpus) / elapsed:>10.1f} resumes/s  recall {recalled / planted_total:>6.1%}  "
+          f"unplanted skills {unplanted / len(corpus):.2f}/resume")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=2000, help='number of synthetic resumes')
+    parser.add_argument('--threshold', type=float, default=0.88, help='fuzzy similarity threshold')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.count, args.seed)
+    print(f"Corpus: {len(corpus)} resumes, {sum(len(planted) for _, planted in corpus) / len(corpus):.1f} "
+          f"misspelled skills on average")
+
+    run('exact', corpus, None)
+    run('fuzzy', corpus, args.threshold)
+
+    clean_corpus = generate_clean_corpus(max(1, args.count // 4), args.seed)
+    print(f"\nClean corpus: {len(clean_corpus)} correctly spelled resumes with lookalike words")
+    run_clean(clean_corpus, args.threshold)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
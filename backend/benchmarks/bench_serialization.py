@@ -0,0 +1,169 @@
+"""
+Serialization and wire-size benchmark for the largest JSON responses:
+/extract-resume (the full cleaned text plus basic info) and /process
+(extracted info plus the four AI documents).
+
+Bodies are built from synthetic resumes run through the real text
+pipeline; the AI documents are the service's fallback documents with
+their lists enlarged to typical Gemini response sizes. For each body it
+reports encode time with Flask's default provider (stdlib json) and with
+FastJSONProvider (orjson when installed), then bytes on the wire and
+compression time for identity, gzip and brotli.
+
+Usage (from the backend directory):
+    python benchmarks/bench_serialization.py --jobs 3 12 --repeat 200
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from corpus import flatten, resume_sections
+from utils import compression, json_provider
+from utils.compression import ResponseCompressor
+from utils.gemini_service import GeminiService
+from utils.json_provider import FastJSONProvider
+from utils.resume_extractor import clean_extracted_text, extract_basic_info
+
+
+def enlarge(value, factor):
+    """Repeat every list in a document factor times, varying the copies"""
+    if isinstance(value, dict):
+        return {key: enlarge(item, factor) for key, item in value.items()}
+    if isinstance(value, list):
+        return [enlarge(item, factor) if index == 0 else vary(enlarge(item, factor), index)
+                for index in range(factor) for item in value]
+    return value
+
+
+def vary(value, index):
+    if isinstance(value, str):
+        return f"{value} ({index + 1})"
+    if isinstance(value, dict):
+        return {key: vary(item, index) for key, item in value.items()}
+    return value
+
+
+def analyze(rng, jobs):
+    raw_text = '\n'.join(flatten(resume_sections(rng, jobs=jobs, projects=max(2, jobs // 2))))
+    clean_text = clean_extracted_text(raw_text)
+    return clean_text, extract_basic_info(clean_text, raw_text)
+
+
+def extract_resume_body(clean_text, basic_info):
+    """Shaped like the /extract-resume response"""
+    return {
+        "success": True,
+        "resume_id": "0" * 32,
+        "file_info": {"filename": "resume.pdf", "file_type": ".pdf", "text_length": len(clean_text),
+                      "truncated": False, "truncated_reason": None},
+        "extracted_content": {
+            "full_text": clean_text,
+            "basic_info": {
+                "email": basic_info.get('email'),
+                "skills": basic_info.get('skills', []),
+                "skills_by_category": basic_info.get('skills_summary', {}),
+                "experience_keywords": basic_info.get('experience_keywords', []),
+                "education_keywords": basic_info.get('education_keywords', [])
+            }
+        },
+        "analysis": {
+            "has_contact_info": bool(basic_info.get('email')),
+            "skills_detected": len(basic_info.get('skills', [])),
+            "appears_complete": len(clean_text) > 200,
+            "top_skill_categories": list(basic_info.get('skills_summary', {}).keys())[:3],
+            "has_technical_background": len(basic_info.get('skills', [])) > 5
+        }
+    }
+
+
+def process_body(clean_text, basic_info, factor):
+    """Shaped like the /process response"""
+    service = GeminiService.__new__(GeminiService)
+    return {
+        "summary": "Resume processed successfully with AI analysis",
+        "resume_id": "0" * 32,
+        "extracted_info": {
+            "email": basic_info.get('email'),
+            "skills": basic_info.get('skills', []),
+            "skills_by_category": basic_info.get('skills_summary', {}),
+            "total_skills_found": len(basic_info.get('skills', [])),
+            "experience_keywords": basic_info.get('experience_keywords', []),
+            "education_keywords": basic_info.get('education_keywords', []),
+            "text_length": len(clean_text),
+            "truncated": False,
+            "truncated_reason": None
+        },
+        "preferences": {"industries": "Technology", "goals": "Senior role", "location": "Remote"},
+        "ai_insights": {
+            "career_recommendations": enlarge(service._get_fallback_recommendations(), factor),
+            "skill_improvements": enlarge(service._get_fallback_skills(), factor),
+            "resume_analysis": enlarge(service._get_fallback_analysis(), factor),
+            "learning_path": enlarge(service._get_fallback_learning_path(), factor)
+        },
+        "timings": {"extraction_ms": 41.2, "ai_ms": 3120.5}
+    }
+
+
+def best_of(func, repeat):
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            result = func()
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best * 1e6, result
+
+
+def report(name, body, stdlib, fast, compressor, repeat):
+    stdlib_us, encoded = best_of(lambda: stdlib.dumps(body, separators=(',', ':')).encode('utf-8'), repeat)
+    fast_us, _ = best_of(lambda: fast.dumps(body).encode('utf-8'), repeat)
+    print(f"\n{name}: {len(encoded):,} bytes of JSON")
+    print(f"  encode  stdlib json {stdlib_us:8.1f} us   {'orjson' if json_provider.orjson else 'stdlib (orjson missing)'}"
+          f" {fast_us:8.1f} us   ({stdlib_us / fast_us:.1f}x)")
+    print(f"  {'encoding':<10}{'bytes':>10}{'ratio':>8}{'time (us)':>12}")
+    print(f"  {'identity':<10}{len(encoded):>10,}{1:>8.2f}{0:>12.1f}")
+    for encoding in compressor.encodings:
+        compress_us, compressed = best_of(lambda: compressor.compress(encoded, encoding), max(1, repeat // 4))
+        print(f"  {encoding:<10}{len(compressed):>10,}{len(encoded) / len(compressed):>8.2f}{compress_us:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, nargs='+', default=[3, 12],
+                        help='jobs per synthetic resume; more jobs make a longer resume')
+    parser.add_argument('--ai-factor', type=int, default=4,
+                        help='how many times the lists in the fallback AI documents are repeated')
+    parser.add_argument('--gzip-level', type=int, default=6)
+    parser.add_argument('--brotli-quality', type=int, default=4)
+    parser.add_argument('--repeat', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    stdlib = DefaultJSONProvider(app)
+    fast = FastJSONProvider(app)
+    compressor = ResponseCompressor(gzip_level=args.gzip_level, brotli_quality=args.brotli_quality)
+    if compression.brotli is None:
+        print("brotli is not installed; only gzip is measured")
+
+    rng = random.Random(args.seed)
+    for jobs in args.jobs:
+        clean_text, basic_info = analyze(rng, jobs)
+        report(f"/extract-resume ({jobs} jobs)", extract_resume_body(clean_text, basic_info),
+               stdlib, fast, compressor, args.repeat)
+        report(f"/process ({jobs} jobs, AI lists x{args.ai_factor})", process_body(clean_text, basic_info, args.ai_factor),
+               stdlib, fast, compressor, args.repeat)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+Micro-benchmark for resume skill matching.
+
+Generates a synthetic resume corpus and reports resumes per second for the
+original per-alias regex loop versus the precompiled single-pass matcher.
+
+Usage (from the backend directory):
+    python benchmarks/bench_skill_matcher.py --count 10000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.resume_extractor import (
+    extract_skills_from_text,
+    get_comprehensive_skills_database,
+    get_skill_matcher,
+    get_skills_summary,
+)
+
+FILLER_WORDS = [
+    'developed', 'managed', 'team', 'delivered', 'scalable', 'services', 'using',
+    'designed', 'implemented', 'features', 'customers', 'improved', 'performance',
+    'by', 'percent', 'with', 'and', 'the', 'for', 'in', 'of', 'a', 'to', 'on',
+    'university', 'bachelor', 'degree', 'experience', 'project', 'built', 'led',
+    'dashboard', 'pipeline', 'platform', 'reporting', 'internal', 'tools',
+]
+
+
+def legacy_extract_skills_from_text(text):
+    """The per-alias implementation this benchmark compares against."""
+    if not text:
+        return []
+
+    skills_db = get_comprehensive_skills_database()
+    found_skills = set()
+    text_lower = text.lower()
+
+    for category, skills in skills_db.items():
+        for skill_info in skills:
+            skill_name = skill_info['name']
+            for alias in skill_info['aliases']:
+                pattern = r'\b' + re.escape(alias.lower()) + r'\b'
+                if re.search(pattern, text_lower):
+                    found_skills.add(skill_name)
+                    break
+
+    return sorted(list(found_skills))
+
+
+def legacy_get_skills_summary(skills_list):
+    if not skills_list:
+        return {}
+
+    skills_db = get_comprehensive_skills_database()
+    categorized = {}
+
+    for skill in skills_list:
+        for category, skills in skills_db.items():
+            for skill_info in skills:
+                if skill_info['name'] == skill:
+                    if category not in categorized:
+                        categorized[category] = []
+                    categorized[category].append(skill)
+                    break
+
+    return categorized
+
+
+def generate_corpus(count, seed=42, words_per_resume=(300, 900)):
+    rng = random.Random(seed)
+    aliases = [
+        alias.strip()
+        for skills in get_comprehensive_skills_database().values()
+        for skill_info in skills
+        for alias in skill_info['aliases']
+    ]
+    corpus = []
+    for _ in range(count):
+        words = []
+        for _ in range(rng.randint(*words_per_resume)):
+            if rng.random() < 0.08:
+                alias = rng.choice(aliases)
+                words.append(alias.upper() if rng.random() < 0.2 else alias)
+            else:
+                words.append(rng.choice(FILLER_WORDS))
+            if rng.random() < 0.05:
+                words.append(rng.choice([',', '.', '-', '(', ')', '\n']))
+        corpus.append(' '.join(words))
+    return corpus
+
+
+def run(label, extract, summarize, corpus):
+    start = time.perf_counter()
+    results = []
+    for text in corpus:
+        skills = extract(text)
+        results.append((skills, summarize(skills)))
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {len(corpus) / elapsed:>10.1f} resumes/s  ({elapsed:.2f}s total)")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=10000, help='number of synthetic resumes')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.count, args.seed)
+    print(f"Corpus: {len(corpus)} resumes, {sum(len(t) for t in corpus) / len(corpus):.0f} chars on average")
+
+    build_start = time.perf_counter()
+    get_skill_matcher()
+    print(f"Matcher build: {(time.perf_counter() - build_start) * 1000:.1f} ms (once per process)")
+
+    before = run('before', legacy_extract_skills_from_text, legacy_get_skills_summary, corpus)
+    after = run('after', extract_skills_from_text, get_skills_summary, corpus)
+
+    mismatches = sum(1 for old, new in zip(before, after) if old != new)
+    print(f"Result mismatches: {mismatches}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""
+Per-stage benchmark of the text analysis that runs after extraction:
+clean_extracted_text followed by extract_basic_info (email, skills,
+experience/education keywords and section entries).
+
+"before" replays the previous implementation of each stage; "after" runs
+the current one. Peak allocation is measured with tracemalloc over the
+whole pipeline.
+
+Usage (from the backend directory):
+    python benchmarks/bench_text_pipeline.py --sizes 10000 100000 300000
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.resume_extractor import (
+    EDUCATION_KEYWORDS,
+    EXPERIENCE_KEYWORDS,
+    clean_extracted_text,
+    extract_basic_info,
+    extract_skills_from_text,
+    find_first_email,
+    get_section_entries,
+    get_skill_matcher,
+    get_skills_summary,
+    segment_resume_sections,
+)
+
+SECTION_LINES = {
+    'EXPERIENCE': [
+        'Senior Software Engineer, Acme Corp (2019 - Present)',
+        '• Developed microservices in Python and Go deployed on AWS with Docker & Kubernetes',
+        '• Led a team of 5 engineers; managed CI/CD pipelines in Jenkins',
+    ],
+    'PROJECTS': [
+        'CareerNav – resume parser built with Flask, React and MongoDB',
+        '★ Real-time chat app using Node.js, Socket.io and Redis',
+    ],
+    'EDUCATION': ['B.Tech in Computer Science, State University (2015 – 2019)'],
+    'SKILLS': ['Python, JavaScript, TypeScript, SQL, PostgreSQL, TensorFlow, Pandas, Git'],
+    'CERTIFICATIONS': ['AWS Certified Solutions Architect – Associate'],
+}
+
+
+def legacy_clean_extracted_text(text):
+    if not text:
+        return ""
+    text = re.sub(r'\s+', ' ', text)
+    text = re.sub(r'[^\w\s@.,()-]', '', text)
+    text = text.replace('\n', ' ').replace('\r', ' ')
+    return text.strip()
+
+
+def legacy_email(text):
+    emails = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text)
+    return emails[0] if emails else None
+
+
+def legacy_keywords(text):
+    text_lower = text.lower()
+    return (
+        [keyword for keyword in EXPERIENCE_KEYWORDS if keyword in text_lower],
+        [keyword for keyword in EDUCATION_KEYWORDS if keyword in text_lower],
+    )
+
+
+def legacy_section_entries(raw_text, section_headers, stop_headers):
+    lines = raw_text.splitlines()
+    capture = False
+    entries = []
+    buffer = []
+    lower_stop_headers = [header.lower() for header in stop_headers]
+    lower_section_headers = [header.lower() for header in section_headers]
+
+    for line in lines:
+        stripped = line.strip()
+        lower_line = stripped.lower()
+        if any(header in lower_line for header in lower_section_headers):
+            if capture and buffer:
+                entries.append(' '.join(buffer))
+                buffer = []
+            capture = True
+            continue
+        if capture:
+            if any(lower_line.startswith(stop) for stop in lower_stop_headers):
+                break
+            if not stripped:
+                if buffer:
+                    entries.append(' '.join(buffer))
+                    buffer = []
+            else:
+                buffer.append(stripped)
+    if capture and buffer:
+        entries.append(' '.join(buffer))
+    return entries[:12]
+
+
+def legacy_sections(raw_text):
+    stop_headers = ['education', 'certifications', 'skills', 'projects', 'project experience',
+                    'about', 'summary', 'objective', 'achievements', 'publications']
+    return (
+        legacy_section_entries(raw_text, ['experience', 'work experience', 'professional experience',
+                                          'employment history'], stop_headers),
+        legacy_section_entries(raw_text, ['projects', 'project experience', 'personal projects',
+                                          'notable projects', 'selected projects'], stop_headers),
+    )
+
+
+def current_sections(raw_text):
+    segments = segment_resume_sections(raw_text)
+    return get_section_entries(segments, 'experience'), get_section_entries(segments, 'projects')
+
+
+# Stages take (raw, clean, lower). The legacy detectors lowercase the text
+# themselves, so "before" has no separate lowercase stage.
+BEFORE = [
+    ('clean', lambda raw, clean, lower: legacy_clean_extracted_text(raw)),
+    ('lowercase', lambda raw, clean, lower: None),
+    ('email', lambda raw, clean, lower: legacy_email(clean)),
+    ('skills', lambda raw, clean, lower: get_skills_summary(extract_skills_from_text(clean))),
+    ('keywords', lambda raw, clean, lower: legacy_keywords(clean)),
+    ('sections', lambda raw, clean, lower: legacy_sections(raw)),
+]
+
+AFTER = [
+    ('clean', lambda raw, clean, lower: clean_extracted_text(raw)),
+    ('lowercase', lambda raw, clean, lower: clean.lower()),
+    ('email', lambda raw, clean, lower: find_first_email(clean)),
+    ('skills', lambda raw, clean, lower: get_skills_summary(sorted(get_skill_matcher().find_skill_names(lower)))),
+    ('keywords', lambda raw, clean, lower: (
+        [keyword for keyword in EXPERIENCE_KEYWORDS if keyword in lower],
+        [keyword for keyword in EDUCATION_KEYWORDS if keyword in lower],
+    )),
+    ('sections', lambda raw, clean, lower: current_sections(raw)),
+]
+
+
+def generate_resume(target_chars, rng):
+    lines = ['Jane Doe', 'jane.doe@example.com | +1 (555) 010-0000', '']
+    size = 0
+    while size < target_chars:
+        for header, body in SECTION_LINES.items():
+            block = [header] + [rng.choice(body) for _ in range(rng.randint(2, 6))] + ['']
+            lines.extend(block)
+            size += sum(len(line) + 1 for line in block)
+    return '\n'.join(lines)
+
+
+def time_stages(stages, raw, clean, repeat):
+    lower = clean.lower()
+    timings = {}
+    for name, stage in stages:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            stage(raw, clean, lower)
+        timings[name] = (time.perf_counter() - start) / repeat * 1000
+    return timings
+
+
+def peak_allocation(pipeline, raw):
+    tracemalloc.start()
+    pipeline(raw)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def legacy_pipeline(raw):
+    clean = legacy_clean_extracted_text(raw)
+    legacy_email(clean)
+    get_skills_summary(extract_skills_from_text(clean))
+    legacy_keywords(clean)
+    legacy_sections(raw)
+
+
+def current_pipeline(raw):
+    extract_basic_info(clean_extracted_text(raw), raw)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 300000],
+                        help='resume sizes in characters')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    get_skill_matcher()
+
+    for size in args.sizes:
+        raw = generate_resume(size, rng)
+        clean = clean_extracted_text(raw)
+        if clean != legacy_clean_extracted_text(raw) or find_first_email(clean) != legacy_email(clean):
+            print("Result mismatch between before and after")
+            return 1
+
+        before = time_stages(BEFORE, raw, clean, args.repeat)
+        after = time_stages(AFTER, raw, clean, args.repeat)
+
+        print(f"\n{len(raw)} chars")
+        print(f"  {'stage':<10} {'before ms':>10} {'after ms':>10}")
+        for name in before:
+            print(f"  {name:<10} {before[name]:>10.3f} {after[name]:>10.3f}")
+        print(f"  {'total':<10} {sum(before.values()):>10.3f} {sum(after.values()):>10.3f}")
+        print(f"  peak allocation: {peak_allocation(legacy_pipeline, raw):.0f} KiB before, "
+              f"{peak_allocation(current_pipeline, raw):.0f} KiB after")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""
+Import-time budget check for the Flask service.
+
+Imports the service module in a fresh interpreter under `python -X importtime`,
+reports its cumulative import cost and the slowest modules it pulled in,
+and exits non-zero if the cost is over budget or if any of the heavy
+dependencies that are meant to load lazily was imported eagerly.
+
+Usage (from the backend directory):
+    python benchmarks/check_import_time.py --budget-ms 600
+    python benchmarks/check_import_time.py --module app --runs 5 --top 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded on first use by utils.resume_extractor and app.get_gemini_service
+LAZY_MODULES = ['google.generativeai', 'pdfplumber', 'PyPDF2', 'docx']
+
+
+def measure_imports(module):
+    """
+    Import module in a new interpreter and return {name: (self_us, cumulative_us)}
+    for every module it imported, parsed from the -X importtime report.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+        cwd=BACKEND_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the column header
+        timings[fields[2].strip()] = (int(fields[0]), int(fields[1]))
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--module', default='app', help='module to import (default: app)')
+    parser.add_argument('--budget-ms', type=float, default=600, help='maximum cumulative import time')
+    parser.add_argument('--runs', type=int, default=3, help='imports to run; the fastest is reported')
+    parser.add_argument('--top', type=int, default=15, help='slowest modules to list')
+    args = parser.parse_args()
+
+    runs = [measure_imports(args.module) for _ in range(max(1, args.runs))]
+    for timings in runs:
+        if args.module not in timings:
+            print(f"No import time reported for {args.module}")
+            return 1
+    # The fastest run is the least disturbed by other load on the machine
+    timings = min(runs, key=lambda run: run[args.module][1])
+    total_ms = timings[args.module][1] / 1000
+
+    print(f"{'self ms':>9} {'cumulative ms':>14}  module")
+    slowest = sorted(timings.items(), key=lambda item: item[1][1], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{self_us / 1000:>9.1f} {cumulative_us / 1000:>14.1f}  {name}")
+
+    failed = False
+    eager = [name for name in LAZY_MODULES if name in timings]
+    if eager:
+        print(f"\nImported eagerly, expected on first use: {', '.join(eager)}")
+        failed = True
+
+    status = 'over budget' if total_ms > args.budget_ms else 'within budget'
+    print(f"\nimport {args.module}: {total_ms:.1f} ms ({status}, budget {args.budget_ms:.0f} ms, "
+          f"best of {len(runs)})")
+    if total_ms > args.budget_ms:
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""
+Synthetic resume corpus for the extraction benchmarks.
+
+Everything is generated locally from a seed: PDFs are written by a small
+built-in writer (no extra dependencies) and DOCX files with python-docx,
+which the backend already requires.
+"""
+
+import os
+import random
+
+from docx import Document
+
+NAMES = ['Jane Doe', 'Arjun Patel', 'Maria Garcia', 'Wei Chen', 'Sam Okafor', 'Lena Novak']
+COMPANIES = ['Acme Corp', 'Globex', 'Initech', 'Umbrella Labs', 'Hooli', 'Stark Industries']
+TITLES = ['Software Engineer', 'Data Scientist', 'Backend Developer', 'DevOps Engineer',
+          'Full Stack Developer', 'Machine Learning Engineer']
+SKILLS = ['Python', 'JavaScript', 'TypeScript', 'React', 'Node.js', 'Django', 'Flask', 'SQL',
+          'PostgreSQL', 'MongoDB', 'Docker', 'Kubernetes', 'AWS', 'GCP', 'TensorFlow', 'PyTorch',
+          'Pandas', 'Git', 'Jenkins', 'Redis', 'GraphQL', 'Java', 'Spring Boot', 'C++', 'Go']
+VERBS = ['Developed', 'Designed', 'Led', 'Built', 'Migrated', 'Optimized', 'Automated', 'Maintained']
+OBJECTS = ['a payments service', 'the data pipeline', 'an internal dashboard', 'CI/CD workflows',
+           'a recommendation engine', 'REST APIs', 'the search backend', 'monitoring and alerting']
+
+PAGE_WIDTH = 612
+PAGE_HEIGHT = 792
+LINE_HEIGHT = 14
+MAX_LINE_CHARS = 90
+
+KINDS = ['single_column_pdf', 'two_column_pdf', 'long_pdf', 'sparse_pdf', 'table_docx']
+
+
+def resume_sections(rng, jobs=3, projects=2):
+    """Return an ordered list of (header, lines) for one synthetic resume"""
+    name = rng.choice(NAMES)
+    sections = [(None, [name, f"{name.lower().replace(' ', '.')}@example.com | +1 555 010 {rng.randint(1000, 9999)}"])]
+
+    sections.append(('SUMMARY', [f"{rng.choice(TITLES)} with {rng.randint(2, 12)} years of experience "
+                                 f"building production systems in {', '.join(rng.sample(SKILLS, 3))}."]))
+
+    experience = []
+    for _ in range(jobs):
+        experience.append(f"{rng.choice(TITLES)}, {rng.choice(COMPANIES)} ({rng.randint(2010, 2020)} - Present)")
+        for _ in range(rng.randint(2, 4)):
+            experience.append(f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)} using "
+                              f"{' and '.join(rng.sample(SKILLS, 2))}")
+        experience.append('')
+    sections.append(('EXPERIENCE', experience))
+
+    project_lines = []
+    for index in range(projects):
+        project_lines.append(f"Project {index + 1}: {rng.choice(OBJECTS).capitalize()} with {', '.join(rng.sample(SKILLS, 3))}")
+        project_lines.append('')
+    sections.append(('PROJECTS', project_lines))
+
+    sections.append(('EDUCATION', [f"B.Tech in Computer Science, State University ({rng.randint(2006, 2016)})"]))
+    sections.append(('SKILLS', [', '.join(rng.sample(SKILLS, 10))]))
+    return sections
+
+
+def flatten(sections):
+    lines = []
+    for header, body in sections:
+        if header:
+            lines.append(header)
+        lines.extend(body)
+        lines.append('')
+    return lines
+
+
+def wrap(line, width=MAX_LINE_CHARS):
+    words = line.split(' ')
+    wrapped, current = [], ''
+    for word in words:
+        if current and len(current) + 1 + len(word) > width:
+            wrapped.append(current)
+            current = word
+        else:
+            current = f"{current} {word}" if current else word
+    wrapped.append(current)
+    return wrapped
+
+
+def _escape_pdf_text(text):
+    return text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)')
+
+
+def write_pdf(path, pages):
+    """
+    Write a minimal PDF. pages is a list of pages, each a list of
+    (x, y, text) placements drawn in 10pt Helvetica.
+    """
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    page_ids = []
+    for placements in pages:
+        commands = ['BT', '/F1 10 Tf']
+        for x, y, text in placements:
+            commands.append(f"1 0 0 1 {x} {y} Tm ({_escape_pdf_text(text)}) Tj")
+        commands.append('ET')
+        stream = '\n'.join(commands).encode('latin-1', 'replace')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>".encode()
+        )
+        page_ids.append(len(objects))
+
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    kids = ' '.join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+
+    with open(path, 'wb') as f:
+        f.write(out)
+
+
+def layout_single_column(lines):
+    pages, placements, y = [], [], PAGE_HEIGHT - 60
+    for line in lines:
+        for part in wrap(line):
+            if y < 60:
+                pages.append(placements)
+                placements, y = [], PAGE_HEIGHT - 60
+            if part:
+                placements.append((50, y, part))
+            y -= LINE_HEIGHT
+    pages.append(placements)
+    return pages
+
+
+def layout_two_column(sections):
+    """Header block across the top, then sections alternating between two columns"""
+    header_lines = sections[0][1]
+    pages = []
+    placements = [(50, PAGE_HEIGHT - 50 - index * LINE_HEIGHT, line) for index, line in enumerate(header_lines)]
+    top = PAGE_HEIGHT - 60 - len(header_lines) * LINE_HEIGHT - 10
+    column_y = [top, top]
+
+    for index, (header, body) in enumerate(sections[1:]):
+        column = index % 2
+        x = 50 if column == 0 else 320
+        for line in [header] + body:
+            for part in wrap(line, 45):
+                if column_y[column] < 60:
+                    pages.append(placements)
+                    placements, column_y = [], [PAGE_HEIGHT - 60, PAGE_HEIGHT - 60]
+                if part:
+                    placements.append((x, column_y[column], part))
+                column_y[column] -= LINE_HEIGHT
+        column_y[column] -= LINE_HEIGHT
+    pages.append(placements)
+    return pages
+
+
+def layout_sparse(rng, page_count=6):
+    """Mostly empty pages, as left behind by scanned resumes with a text stamp"""
+    pages = []
+    for index in range(page_count):
+        if index % 3 == 1:
+            pages.append([])
+        else:
+            pages.append([(50, PAGE_HEIGHT - 60, f"{rng.choice(NAMES)} - page {index + 1}")])
+    return pages
+
+
+def write_table_docx(path, sections, rng):
+    document = Document()
+    for line in sections[0][1]:
+        document.add_paragraph(line)
+
+    for header, body in sections[1:]:
+        document.add_heading(header.title(), level=2)
+        if header == 'EXPERIENCE':
+            table = document.add_table(rows=1, cols=3)
+            table.rows[0].cells[0].text = 'Role'
+            table.rows[0].cells[1].text = 'Company'
+            table.rows[0].cells[2].text = 'Highlights'
+            for _ in range(8):
+                cells = table.add_row().cells
+                cells[0].text = rng.choice(TITLES)
+                cells[1].text = rng.choice(COMPANIES)
+                cells[2].text = f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {', '.join(rng.sample(SKILLS, 2))}"
+        elif header == 'SKILLS':
+            table = document.add_table(rows=5, cols=5)
+            for row, skill_row in zip(table.rows, [rng.sample(SKILLS, 5) for _ in range(5)]):
+                for cell, skill in zip(row.cells, skill_row):
+                    cell.text = skill
+        else:
+            for line in body:
+                if line:
+                    document.add_paragraph(line)
+    document.save(path)
+
+
+def generate_corpus(out_dir, per_kind=5, seed=42):
+    """
+    Write per_kind documents of every kind into out_dir and return a list
+    of (kind, path) pairs. The same seed always yields the same corpus.
+    """
+    rng = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    corpus = []
+
+    for index in range(per_kind):
+        path = os.path.join(out_dir, f"single_column_{index}.pdf")
+        write_pdf(path, layout_single_column(flatten(resume_sections(rng))))
+        corpus.append(('single_column_pdf', path))
+
+        path = os.path.join(out_dir, f"two_column_{index}.pdf")
+        write_pdf(path, layout_two_column(resume_sections(rng)))
+        corpus.append(('two_column_pdf', path))
+
+        path = os.path.join(out_dir, f"long_{index}.pdf")
+        write_pdf(path, layout_single_column(flatten(resume_sections(rng, jobs=40, projects=30))))
+        corpus.append(('long_pdf', path))
+
+        path = os.path.join(out_dir, f"sparse_{index}.pdf")
+        write_pdf(path, layout_sparse(rng))
+        corpus.append(('sparse_pdf', path))
+
+        path = os.path.join(out_dir, f"table_{index}.docx")
+        write_table_docx(path, resume_sections(rng), rng)
+        corpus.append(('table_docx', path))
+
+    return corpus
@@ -1,9 +1,136 @@
 import os
+import tempfile
 
 class Config:
-    # Upload folder
-    UPLOAD_FOLDER = os.path.join(os.path.dirname(__file__), "uploads")
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB
+    # Uploads up to this size are parsed from memory; larger ones spill to a temp file
+    UPLOAD_SPOOL_MAX_MEMORY = int(os.getenv('UPLOAD_SPOOL_MAX_MEMORY', str(4 * 1024 * 1024)))
+
+    # Parallel per-page PDF extraction for long documents (opt-in)
+    PDF_PARALLEL_EXTRACTION = os.getenv('PDF_PARALLEL_EXTRACTION', 'false').lower() == 'true'
+    PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '8'))
+    PDF_PARALLEL_PAGES_PER_TASK = int(os.getenv('PDF_PARALLEL_PAGES_PER_TASK', '4'))
+    PDF_PARALLEL_WORKERS = int(os.getenv('PDF_PARALLEL_WORKERS', '0')) or None  # None = CPU count
+
+    # Per-extraction budgets; 0 disables a limit
+    EXTRACTION_MAX_PAGES = int(os.getenv('EXTRACTION_MAX_PAGES', '50')) or None
+    EXTRACTION_MAX_CHARS = int(os.getenv('EXTRACTION_MAX_CHARS', '100000')) or None
+    EXTRACTION_MAX_SECONDS = float(os.getenv('EXTRACTION_MAX_SECONDS', '30')) or None
+
+    # Extraction result cache keyed by upload content; set a directory to persist it
+    EXTRACTION_CACHE_SIZE = int(os.getenv('EXTRACTION_CACHE_SIZE', '256'))
+    EXTRACTION_CACHE_DIR = os.getenv('EXTRACTION_CACHE_DIR') or None
+
+    # Skills taxonomy file (defaults to utils/skills_database.json), where its
+    # compiled index is cached (defaults to next to the file) and how often
+    # the file is checked for changes; 0 disables hot reload
+    SKILLS_DATABASE_PATH = os.getenv('SKILLS_DATABASE_PATH') or None
+    SKILLS_INDEX_DIR = os.getenv('SKILLS_INDEX_DIR') or None
+    SKILLS_RELOAD_INTERVAL = float(os.getenv('SKILLS_RELOAD_INTERVAL', '2')) or None
+    # Opt-in fuzzy alias matching ("Postgre SQL", "Tensor Flow", typos) and its minimum similarity
+    SKILLS_FUZZY_MATCHING = os.getenv('SKILLS_FUZZY_MATCHING', 'false').lower() == 'true'
+    SKILLS_FUZZY_THRESHOLD = float(os.getenv('SKILLS_FUZZY_THRESHOLD', '0.88'))
+
+    # Run extraction in sandboxed, recycled subprocesses with memory (MB of
+    # address space), CPU-time and wall-clock limits (opt-in; 0 disables a limit)
+    EXTRACTION_SANDBOX = os.getenv('EXTRACTION_SANDBOX', 'false').lower() == 'true'
+    EXTRACTION_SANDBOX_WORKERS = int(os.getenv('EXTRACTION_SANDBOX_WORKERS', '2'))
+    EXTRACTION_SANDBOX_MAX_TASKS = int(os.getenv('EXTRACTION_SANDBOX_MAX_TASKS', '50'))
+    EXTRACTION_SANDBOX_MEMORY_MB = int(os.getenv('EXTRACTION_SANDBOX_MEMORY_MB', '1024')) or None
+    EXTRACTION_SANDBOX_CPU_SECONDS = float(os.getenv('EXTRACTION_SANDBOX_CPU_SECONDS', '30')) or None
+    EXTRACTION_SANDBOX_TIMEOUT = float(os.getenv('EXTRACTION_SANDBOX_TIMEOUT', '60')) or None
+
+    # /extract-batch: request size, resume count, zip expansion limits and
+    # the resume bytes read for the whole batch (0 = no limit)
+    BATCH_MAX_CONTENT_LENGTH = int(os.getenv('BATCH_MAX_CONTENT_LENGTH', str(128 * 1024 * 1024)))
+    BATCH_MAX_FILES = int(os.getenv('BATCH_MAX_FILES', '500'))
+    BATCH_ZIP_MAX_UNCOMPRESSED = int(os.getenv('BATCH_ZIP_MAX_UNCOMPRESSED', str(512 * 1024 * 1024)))
+    BATCH_MAX_TOTAL_BYTES = int(os.getenv('BATCH_MAX_TOTAL_BYTES', str(1024 * 1024 * 1024))) or None
+    BATCH_ZIP_MAX_RATIO = float(os.getenv('BATCH_ZIP_MAX_RATIO', '100'))
+    BATCH_MAX_IN_FLIGHT = int(os.getenv('BATCH_MAX_IN_FLIGHT', '16'))
+
+    # Gemini calls behind /process run concurrently on a shared pool of this
+    # many threads; the whole AI step is abandoned after AI_PROCESS_TIMEOUT
+    # seconds (0 waits indefinitely). A call still running then keeps its
+    # thread until it returns, so every Gemini call, retries included, is
+    # cut off after AI_CALL_TIMEOUT seconds (0 keeps the client's 600s default)
+    AI_MAX_CONCURRENCY = int(os.getenv('AI_MAX_CONCURRENCY', '8'))
+    AI_PROCESS_TIMEOUT = float(os.getenv('AI_PROCESS_TIMEOUT', '120')) or None
+    AI_CALL_TIMEOUT = float(os.getenv('AI_CALL_TIMEOUT', '60')) or None
+    # Identical concurrent Gemini calls (same normalized arguments) share
+    # one request
+    AI_COALESCE_REQUESTS = os.getenv('AI_COALESCE_REQUESTS', 'true').lower() == 'true'
+
+    # Local directory for the SQLite databases below. They use WAL mode,
+    # which needs shared memory and working file locks: keep them on a local
+    # disk, never on NFS/SMB or another network file system. The default is
+    # cleared on reboot; point DATA_DIR at a persistent local directory to
+    # keep queued jobs across restarts of the machine
+    DATA_DIR = os.getenv('DATA_DIR') or os.path.join(tempfile.gettempdir(), "careernav")
+
+    # Asynchronous job API (/jobs/*): SQLite queue file, worker threads per
+    # process, how long finished results are kept, queue capacity (0 = no
+    # limit), how long a running job is leased before another worker may
+    # retry it, and the completion callback timeout
+    JOBS_DB_PATH = os.getenv('JOBS_DB_PATH') or os.path.join(DATA_DIR, "jobs.sqlite3")
+    JOBS_WORKERS = int(os.getenv('JOBS_WORKERS', '4'))
+    JOBS_RESULT_TTL = float(os.getenv('JOBS_RESULT_TTL', '3600'))
+    JOBS_MAX_QUEUED = int(os.getenv('JOBS_MAX_QUEUED', '1000')) or None
+    JOBS_LEASE_SECONDS = float(os.getenv('JOBS_LEASE_SECONDS', '600'))
+    JOBS_CALLBACK_TIMEOUT = float(os.getenv('JOBS_CALLBACK_TIMEOUT', '10'))
+    # Hosts callback_url may point at, comma-separated; '.example.com' also
+    # allows its subdomains. Empty rejects every callback_url. Hosts that
+    # resolve to private or loopback addresses are refused either way. With
+    # a secret, callbacks are signed with HMAC-SHA256
+    JOBS_CALLBACK_ALLOWED_HOSTS = [host.strip() for host in os.getenv('JOBS_CALLBACK_ALLOWED_HOSTS', '').split(',')
+                                   if host.strip()]
+    JOBS_CALLBACK_SECRET = os.getenv('JOBS_CALLBACK_SECRET') or None
+
+    # Extracted resumes kept server-side under a resume_id for the /ai/*
+    # endpoints: database path (local disk only, see DATA_DIR), lifetime in
+    # seconds and maximum entries (0 = no limit)
+    RESUME_STORE_PATH = os.getenv('RESUME_STORE_PATH') or os.path.join(DATA_DIR, "resumes.sqlite3")
+    RESUME_STORE_TTL = float(os.getenv('RESUME_STORE_TTL', '3600'))
+    RESUME_STORE_MAX_ENTRIES = int(os.getenv('RESUME_STORE_MAX_ENTRIES', '10000')) or None
+
+    # ASGI server (serve.py): bind address, worker processes, keep-alive and
+    # graceful-shutdown seconds, maximum concurrent connections per worker
+    # (0 = no limit) and threads for the routes served by the Flask app
+    SERVER_HOST = os.getenv('SERVER_HOST', '0.0.0.0')
+    SERVER_PORT = int(os.getenv('SERVER_PORT', '5000'))
+    ASGI_WORKERS = int(os.getenv('ASGI_WORKERS', '2'))
+    ASGI_KEEP_ALIVE = int(os.getenv('ASGI_KEEP_ALIVE', '5'))
+    ASGI_GRACEFUL_TIMEOUT = int(os.getenv('ASGI_GRACEFUL_TIMEOUT', '30'))
+    ASGI_LIMIT_CONCURRENCY = int(os.getenv('ASGI_LIMIT_CONCURRENCY', '1000')) or None
+    ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', '32'))
+
+    # Background Gemini health probe behind /ai/status and /health/ready:
+    # seconds between one-token checks (0 disables the prober), request
+    # timeout, checks counted in the error rate, and whether readiness
+    # fails while the AI service is down
+    HEALTH_PROBE_INTERVAL = float(os.getenv('HEALTH_PROBE_INTERVAL', '60'))
+    HEALTH_PROBE_TIMEOUT = float(os.getenv('HEALTH_PROBE_TIMEOUT', '10'))
+    HEALTH_PROBE_WINDOW = int(os.getenv('HEALTH_PROBE_WINDOW', '10'))
+    HEALTH_REQUIRE_AI = os.getenv('HEALTH_REQUIRE_AI', 'false').lower() == 'true'
+
+    # Prometheus metrics at /metrics; when disabled, recording is a no-op
+    METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'true').lower() == 'true'
+
+    # Encode JSON responses with orjson when it is installed; compress
+    # buffered responses of at least COMPRESS_MIN_SIZE bytes (0 disables)
+    # with brotli or gzip, whichever the client accepts
+    FAST_JSON_ENABLED = os.getenv('FAST_JSON_ENABLED', 'true').lower() == 'true'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', '1024'))
+    COMPRESS_GZIP_LEVEL = int(os.getenv('COMPRESS_GZIP_LEVEL', '6'))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', '4'))
+
+    # Structured logging to stderr through a background writer: level,
+    # 'json' or 'text', keep 1 in LOG_SAMPLE_EVERY per-item debug lines,
+    # and records buffered before new ones are dropped
+    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO').upper()
+    LOG_FORMAT = os.getenv('LOG_FORMAT', 'json').lower()
+    LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', '10'))
+    LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
 
 def get_config():
     """
@@ -18,12 +145,6 @@ def check_config():
     """
     cfg = get_config()
     ok = True
-    if not os.path.exists(cfg.UPLOAD_FOLDER):
-        try:
-            os.makedirs(cfg.UPLOAD_FOLDER, exist_ok=True)
-        except Exception as e:
-            print(f"Error creating upload folder: {e}")
-            ok = False
     if not hasattr(cfg, "MAX_CONTENT_LENGTH"):
         print("MAX_CONTENT_LENGTH not found in config")
         ok = False
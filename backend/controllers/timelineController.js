@@ -2,6 +2,12 @@ const { spawn } = require('child_process');
 const path = require('path');
 const TimelinePlan = require('../models/TimelinePlan');
 
+// Python scripts log structured JSON lines ({"level": "ERROR", ...}); older
+// "ERROR: message" text lines are still recognised
+function isErrorLog(text) {
+  return /"level": "(ERROR|CRITICAL)"|error:|exception:/i.test(text);
+}
+
 // Helper: normalize list-like fields (arrays, newline-separated strings, comma lists, or bullet lists)
 function parseList(val) {
   if (!val && val !== 0) return [];
@@ -90,7 +96,7 @@ exports.generateCareerTimeline = async (req, res) => {
       console.log(`gemini_timeline.py log: ${chunk.toString().trim()}`);
       
       // Only add to error if it's an actual error, not just a gRPC warning
-      if (chunk.toString().toLowerCase().includes('error:') || chunk.toString().toLowerCase().includes('exception:')) {
+      if (isErrorLog(chunk.toString())) {
         error += chunk.toString();
       }
     });
@@ -194,7 +200,7 @@ exports.generateCareerPlan = async (req, res) => {
       console.log(`gemini_plan.py log: ${chunk.toString().trim()}`);
       
       // If it contains an actual error that would prevent execution, add it to error string
-      if (chunk.toString().toLowerCase().includes('error:') || chunk.toString().toLowerCase().includes('exception:')) {
+      if (isErrorLog(chunk.toString())) {
         error += chunk.toString();
       }
     });
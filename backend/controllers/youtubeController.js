@@ -2,6 +2,12 @@
 const { spawn } = require('child_process');
 const YouTubeRecommendation = require('../models/YouTubeRecommendation');
 
+// Python scripts log structured JSON lines ({"level": "ERROR", ...}); older
+// "ERROR: message" text lines are still recognised
+function isErrorLog(text) {
+  return /"level": "(ERROR|CRITICAL)"|error:|exception:/i.test(text);
+}
+
 exports.generateYouTubeRecommendations = async (req, res) => {
   try {
     const { current_skills, target_job, timeframe_months, language, additional_context } = req.body;
@@ -46,7 +52,7 @@ exports.generateYouTubeRecommendations = async (req, res) => {
       console.log(`gemini_timeline.py log: ${chunk.toString().trim()}`);
       
       // Only add to error if it's an actual error, not just a warning
-      if (chunk.toString().toLowerCase().includes('error:') || chunk.toString().toLowerCase().includes('exception:')) {
+      if (isErrorLog(chunk.toString())) {
         error += chunk.toString();
       }
     });
@@ -1,8 +1,6 @@
 from flask import request, jsonify
-import os
-import time
 from utils.resume_extractor import extract_resume_text, clean_extracted_text, extract_basic_info
-from app import app, UPLOAD_FOLDER
+from app import app
 
 @app.route('/extract-skills', methods=['POST'])
 def extract_skills():
@@ -14,18 +12,12 @@ def extract_skills():
     if not file:
         return jsonify({'error': 'No resume file provided'}), 400
 
-    # Create upload directory if it doesn't exist
-    if not os.path.exists(UPLOAD_FOLDER):
-        os.makedirs(UPLOAD_FOLDER)
-        
-    # Save the file temporarily
-    filename = f"resume-{int(time.time() * 1000)}.pdf"
-    file_path = os.path.join(UPLOAD_FOLDER, filename)
-    file.save(file_path)
+    # Parse the upload from its stream; nothing is written to disk
+    filename = file.filename or 'resume.pdf'
     
     try:
         # Extract text from the resume
-        extracted_text = extract_resume_text(file_path)
+        extracted_text = extract_resume_text(file.stream, filename=filename)
         clean_text = clean_extracted_text(extracted_text)
         
         # Extract basic information
@@ -48,10 +40,5 @@ def extract_skills():
     except Exception as e:
         print(f"Error extracting skills: {str(e)}")
         return jsonify({'error': f'Error extracting skills: {str(e)}'}), 500
-    
-    finally:
-        # DON'T delete the file - let the Node backend manage file lifecycle
-        # The file will be cleaned up when the resume is deleted or replaced
-        pass
 
     return jsonify(response)
\ No newline at end of file
@@ -0,0 +1,39 @@
+"""
+Production entry point: serves asgi.application with uvicorn.
+
+    cd backend
+    python serve.py
+
+Worker processes, keep-alive, graceful shutdown and connection limits come
+from the SERVER_* and ASGI_* settings in config.py (see .env.example). On
+SIGTERM each worker stops accepting connections, waits up to
+ASGI_GRACEFUL_TIMEOUT seconds for in-flight requests and then stops its job
+workers; queued jobs stay in the job database for the next start.
+"""
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+import uvicorn
+
+from config import get_config
+
+
+def main():
+    config = get_config()
+    uvicorn.run(
+        'asgi:application',
+        host=config.SERVER_HOST,
+        port=config.SERVER_PORT,
+        workers=config.ASGI_WORKERS,
+        timeout_keep_alive=config.ASGI_KEEP_ALIVE,
+        timeout_graceful_shutdown=config.ASGI_GRACEFUL_TIMEOUT,
+        limit_concurrency=config.ASGI_LIMIT_CONCURRENCY,
+        lifespan='on',
+        proxy_headers=True
+    )
+
+
+if __name__ == '__main__':
+    main()
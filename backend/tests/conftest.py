@@ -0,0 +1,21 @@
+"""
+Shared test setup. Run from the backend directory:
+    python -m pytest -q tests
+
+The backend directory is put on sys.path the same way the benchmarks do it,
+and the SQLite stores used by app.py are pointed at a temporary directory
+before anything imports config.
+"""
+
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+_data_dir = tempfile.mkdtemp(prefix='careernav-tests-')
+os.environ.setdefault('JOBS_DB_PATH', os.path.join(_data_dir, 'jobs.sqlite3'))
+os.environ.setdefault('RESUME_STORE_PATH', os.path.join(_data_dir, 'resumes.sqlite3'))
+os.environ.setdefault('HEALTH_PROBE_INTERVAL', '0')
+os.environ.setdefault('LOG_LEVEL', 'WARNING')
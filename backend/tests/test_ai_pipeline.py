@@ -0,0 +1,79 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.ai_pipeline import Stage, iter_stage_graph, run_stage_graph
+from utils.gemini_service import GeminiService
+
+
+@pytest.fixture
+def executor():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+def test_dependents_start_after_their_dependencies(executor):
+    stages = [
+        Stage('first', lambda inputs: 1),
+        Stage('second', lambda inputs: inputs['first'] + 1, depends=['first']),
+        Stage('third', lambda inputs: inputs['first'] + inputs['second'], depends=['first', 'second']),
+    ]
+    order = [result.name for result in iter_stage_graph(stages, executor)]
+    assert order == ['first', 'second', 'third']
+    assert run_stage_graph(stages, executor)['third'].result == 3
+
+
+def test_independent_stages_overlap(executor):
+    barrier = threading.Barrier(2, timeout=5)
+    stages = [Stage(name, lambda inputs: barrier.wait()) for name in ('left', 'right')]
+    assert all(result.status == 'ok' for result in iter_stage_graph(stages, executor))
+
+
+def test_failed_dependency_contributes_none(executor):
+    def fail(inputs):
+        raise RuntimeError('boom')
+
+    results = run_stage_graph([Stage('first', fail), Stage('second', lambda inputs: inputs, depends=['first'])],
+                              executor)
+    assert (results['first'].status, results['first'].error) == ('error', 'boom')
+    assert results['second'].result == {'first': None}
+
+
+def test_unfinished_stages_time_out(executor):
+    release = threading.Event()
+    stages = [
+        Stage('fast', lambda inputs: 'done'),
+        Stage('slow', lambda inputs: release.wait(5)),
+        Stage('after_slow', lambda inputs: 'never', depends=['slow']),
+    ]
+    started = time.perf_counter()
+    results = {result.name: result for result in iter_stage_graph(stages, executor, timeout=0.2)}
+    release.set()
+    assert time.perf_counter() - started < 2
+    assert results['fast'].status == 'ok'
+    assert results['slow'].status == 'timeout'
+    assert results['after_slow'].status == 'timeout'
+
+
+def test_circular_dependencies_are_rejected(executor):
+    stages = [Stage('a', lambda inputs: 1, depends=['b']), Stage('b', lambda inputs: 1, depends=['a'])]
+    with pytest.raises(ValueError):
+        list(iter_stage_graph(stages, executor))
+
+
+def test_gemini_calls_carry_a_bounded_timeout(monkeypatch):
+    monkeypatch.setenv('GEMINI_API_KEY', 'test-key')
+    service = GeminiService(coalesce=False, request_timeout=30)
+    calls = []
+
+    class Model:
+        def generate_content(self, prompt, request_options=None):
+            calls.append(request_options)
+            raise RuntimeError('offline')
+
+    service.model = Model()
+    service.analyze_resume_gaps(skills_by_category={}, preferences={}, extracted_text='')
+    assert calls[0]['timeout'] == 30
+    assert calls[0]['retry'].timeout == 30
@@ -0,0 +1,118 @@
+import io
+import json
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from docx import Document
+
+from utils.extraction_cache import ExtractionCache
+from utils.resume_extractor import analyze_resume
+
+
+def docx_bytes(text):
+    document = Document()
+    document.add_paragraph(text)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+def zip_bytes(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def app_module(monkeypatch):
+    import app
+
+    pool = ThreadPoolExecutor(max_workers=4)
+    monkeypatch.setattr(app, 'extraction_cache', ExtractionCache())
+    monkeypatch.setattr(app, 'submit_analysis', lambda data, filename: pool.submit(analyze_resume, data, filename))
+    yield app
+    pool.shutdown(wait=True)
+
+
+def post_batch(app_module, files):
+    data = {'resumes': [(io.BytesIO(content), name) for name, content in files]}
+    response = app_module.app.test_client().post('/extract-batch', data=data, content_type='multipart/form-data')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+
+def test_failed_items_do_not_stop_the_batch(app_module):
+    lines = post_batch(app_module, [
+        ('alice.docx', docx_bytes('Alice knows Python and Docker')),
+        ('notes.txt', b'plain text'),
+        ('broken.pdf', b'not a pdf'),
+        ('bob.docx', docx_bytes('Bob knows Java and Kubernetes')),
+    ])
+    by_index = {line['index']: line for line in lines}
+    assert sorted(by_index) == [0, 1, 2, 3]
+    assert [by_index[i]['filename'] for i in range(4)] == ['alice.docx', 'notes.txt', 'broken.pdf', 'bob.docx']
+    assert [by_index[i]['success'] for i in range(4)] == [True, False, False, True]
+    assert 'Unsupported file format' in by_index[1]['error']
+    assert by_index[0]['skills'] == ['Docker', 'Python']
+    assert by_index[3]['skills'] == ['Java', 'Kubernetes']
+
+
+def test_results_stream_in_completion_order(app_module, monkeypatch):
+    release = threading.Event()
+    pool = ThreadPoolExecutor(max_workers=2)
+
+    def analyze(data, filename):
+        if filename == 'slow.docx':
+            release.wait(5)
+        result = analyze_resume(data, filename)
+        # Let the fast result reach the stream before the slow one finishes
+        threading.Timer(0.2, release.set).start()
+        return result
+
+    monkeypatch.setattr(app_module, 'submit_analysis', lambda data, filename: pool.submit(analyze, data, filename))
+    try:
+        lines = post_batch(app_module, [('slow.docx', docx_bytes('Slow Python')),
+                                        ('fast.docx', docx_bytes('Fast Go'))])
+    finally:
+        release.set()
+        pool.shutdown(wait=True)
+    assert [(line['index'], line['filename']) for line in lines] == [(1, 'fast.docx'), (0, 'slow.docx')]
+
+
+def test_too_many_uploads_are_rejected_up_front(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.config, 'BATCH_MAX_FILES', 1)
+    data = {'resumes': [(io.BytesIO(docx_bytes(name)), f'{name}.docx') for name in ('a', 'b')]}
+    response = app_module.app.test_client().post('/extract-batch', data=data, content_type='multipart/form-data')
+    assert response.status_code == 413
+
+
+def test_file_limit_skips_the_rest_of_the_batch(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.config, 'BATCH_MAX_FILES', 2)
+    archive = zip_bytes({f'{name}.docx': docx_bytes(f'{name} knows Python') for name in ('a', 'b')})
+    lines = sorted(post_batch(app_module, [('batch.zip', archive), ('c.docx', docx_bytes('c knows Go'))]),
+                   key=lambda line: line['index'])
+    assert [(line['filename'], line['success']) for line in lines] == [
+        ('a.docx', True), ('b.docx', True), ('c.docx', False)]
+    assert 'rest were skipped' in lines[2]['error']
+
+
+def test_archive_over_the_file_limit_fails_on_its_own_line(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.config, 'BATCH_MAX_FILES', 2)
+    archive = zip_bytes({f'{name}.docx': docx_bytes(f'{name} knows Python') for name in ('a', 'b', 'c')})
+    lines = post_batch(app_module, [('batch.zip', archive), ('d.docx', docx_bytes('d knows Go'))])
+    assert sorted((line['filename'], line['success']) for line in lines) == [('batch.zip', False), ('d.docx', True)]
+
+
+def test_total_size_limit_skips_the_rest_of_the_batch(app_module, monkeypatch):
+    first = docx_bytes('First knows Python')
+    monkeypatch.setattr(app_module.config, 'BATCH_MAX_TOTAL_BYTES', len(first) + 10)
+    lines = sorted(post_batch(app_module, [('first.docx', first), ('second.docx', docx_bytes('Second knows Go')),
+                                           ('third.docx', docx_bytes('Third knows Rust'))]),
+                   key=lambda line: line['index'])
+    assert [(line['filename'], line['success']) for line in lines] == [('first.docx', True), ('second.docx', False)]
+    assert 'Batch expands beyond' in lines[1]['error']
@@ -0,0 +1,88 @@
+import asyncio
+import gzip
+
+import pytest
+from flask import Flask, Response, jsonify, request
+
+from utils import compression
+from utils.compression import ResponseCompressor
+
+needs_brotli = pytest.mark.skipif(compression.brotli is None, reason='brotli is not installed')
+
+BIG = {'roles': [f'Role {index}' for index in range(500)]}
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+    compressor = ResponseCompressor(min_size=1024)
+
+    @app.after_request
+    def compress(response):
+        return compressor.apply(response, request.accept_encodings)
+
+    app.add_url_rule('/big', 'big', lambda: jsonify(BIG))
+    app.add_url_rule('/small', 'small', lambda: jsonify({'ok': True}))
+    app.add_url_rule('/stream', 'stream', lambda: Response((f'{line}\n' * 200 for line in range(5)),
+                                                           mimetype='text/plain'))
+    app.add_url_rule('/encoded', 'encoded', lambda: Response('x' * 4096, mimetype='text/plain',
+                                                             headers={'Content-Encoding': 'identity'}))
+    return app.test_client()
+
+
+def test_gzip_when_only_gzip_is_accepted(client):
+    response = client.get('/big', headers={'Accept-Encoding': 'gzip'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert gzip.decompress(response.data) == client.get('/big').data
+
+
+@needs_brotli
+def test_brotli_is_preferred(client):
+    response = client.get('/big', headers={'Accept-Encoding': 'gzip, deflate, br'})
+    assert response.headers['Content-Encoding'] == 'br'
+    assert compression.brotli.decompress(response.data) == client.get('/big').data
+
+
+@needs_brotli
+def test_quality_values_are_respected(client):
+    response = client.get('/big', headers={'Accept-Encoding': 'br;q=0.1, gzip;q=0.9'})
+    assert response.headers['Content-Encoding'] == 'gzip'
+
+
+@pytest.mark.parametrize('accept', [None, 'identity', 'gzip;q=0, br;q=0', 'deflate'])
+def test_identity_without_an_accepted_encoding(client, accept):
+    headers = {'Accept-Encoding': accept} if accept else {}
+    response = client.get('/big', headers=headers)
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_json() == BIG
+    assert 'Accept-Encoding' in response.headers['Vary']
+
+
+@pytest.mark.parametrize('path', ['/small', '/stream', '/encoded'])
+def test_left_alone(client, path):
+    response = client.get(path, headers={'Accept-Encoding': 'gzip'})
+    assert response.headers.get('Content-Encoding') in (None, 'identity')
+
+
+def test_async_endpoints_are_compressed_too(monkeypatch):
+    import app
+    import asgi
+
+    class Service:
+        async def analyze_resume_gaps_async(self, skills_by_category, preferences, extracted_text):
+            return BIG
+
+    if app.response_compressor is None:
+        pytest.skip('compression is disabled by COMPRESS_MIN_SIZE')
+    monkeypatch.setattr(app, 'get_gemini_service', Service)
+
+    async def post():
+        client = asgi.quart_app.test_client()
+        response = await client.post('/ai/resume-analysis', json={'resume_text': 'text'},
+                                     headers={'Accept-Encoding': 'gzip'})
+        return response.headers.get('Content-Encoding'), await response.get_data()
+
+    encoding, body = asyncio.run(post())
+    assert encoding == 'gzip'
+    assert b'Role 499' in gzip.decompress(body)
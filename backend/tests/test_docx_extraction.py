@@ -0,0 +1,61 @@
+import io
+import random
+
+import pytest
+from docx import Document
+
+from benchmarks.bench_docx_extractor import legacy_extract_text_from_docx, merged_table_docx, table_docx
+from utils.resume_extractor import ExtractionLimits, extract_resume_document, extract_text_from_docx
+
+
+def docx_bytes(build):
+    document = Document()
+    build(document)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('make', [table_docx, lambda rng: merged_table_docx(12, rng)])
+def test_same_texts_as_python_docx(make):
+    data = make(random.Random(3))
+    assert set(extract_text_from_docx(data).splitlines()) == set(legacy_extract_text_from_docx(data).splitlines())
+
+
+def test_paragraphs_and_tables_keep_document_order():
+    def build(document):
+        document.add_paragraph('Experience')
+        document.add_table(rows=1, cols=2).rows[0].cells[1].text = 'Acme'
+        document.add_paragraph('Skills')
+    assert extract_text_from_docx(docx_bytes(build)).splitlines() == ['Experience', 'Acme', 'Skills']
+
+
+def test_merged_cells_are_read_once():
+    def build(document):
+        table = document.add_table(rows=2, cols=2)
+        table.cell(0, 0).merge(table.cell(1, 0)).text = 'Acme'
+        merged = table.cell(0, 1).merge(table.cell(1, 1))
+        merged.text = 'Led the API team'
+    lines = extract_text_from_docx(docx_bytes(build)).splitlines()
+    assert lines.count('Acme') == 1 and lines.count('Led the API team') == 1
+
+
+def test_tabs_and_breaks_render_like_python_docx():
+    def build(document):
+        run = document.add_paragraph().add_run('Python')
+        run.add_tab()
+        run.add_text('Docker')
+        run.add_break()
+        run.add_text('React')
+    assert extract_text_from_docx(docx_bytes(build)) == 'Python\tDocker\nReact'
+
+
+def test_character_limit_truncates():
+    data = docx_bytes(lambda document: [document.add_paragraph(f'Line {i} ' * 10) for i in range(50)])
+    document = extract_resume_document(data, filename='cv.docx', limits=ExtractionLimits(max_chars=100))
+    assert len(document['text']) == 100
+    assert (document['truncated'], document['truncated_reason']) == (True, 'max_chars')
+
+
+def test_broken_archive_yields_no_text():
+    assert extract_text_from_docx(b'PK not really a zip') is None
@@ -0,0 +1,49 @@
+from utils import resume_extractor
+from utils.extraction_cache import ExtractionCache
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ExtractionCache(max_entries=2)
+    cache.put('a', {'n': 1})
+    cache.put('b', {'n': 2})
+    assert cache.get('a') == {'n': 1}
+    cache.put('c', {'n': 3})
+    assert (cache.get('a'), cache.get('b'), cache.get('c')) == ({'n': 1}, None, {'n': 3})
+    assert cache.stats()['entries'] == 2
+
+
+def test_zero_entries_disables_the_cache():
+    cache = ExtractionCache(max_entries=0)
+    cache.put('a', {'n': 1})
+    assert cache.get('a') is None
+    assert cache.stats()['entries'] == 0
+
+
+def test_disk_hit_is_promoted_into_memory(tmp_path):
+    ExtractionCache(persist_dir=str(tmp_path)).put('a1', {'n': 1})
+    cache = ExtractionCache(persist_dir=str(tmp_path))
+    assert cache.get('a1') == {'n': 1}
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (1, 0, 1)
+
+    (tmp_path / 'a1' / 'a1.json').unlink()
+    assert cache.get('a1') == {'n': 1}
+    assert cache.stats()['hits'] == 2
+
+
+def test_corrupt_persisted_entry_is_a_miss(tmp_path):
+    cache = ExtractionCache(persist_dir=str(tmp_path))
+    cache.put('a1', {'n': 1})
+    cache.clear()
+    (tmp_path / 'a1' / 'a1.json').write_text('{"n": ')
+    assert cache.get('a1') is None
+    assert cache.stats()['misses'] == 1
+
+
+def test_key_changes_with_the_extractor_version(monkeypatch):
+    key = ExtractionCache.make_key(b'%PDF', '.PDF', resume_extractor.get_extractor_version())
+    assert key.endswith('-pdf-' + resume_extractor.get_extractor_version())
+    monkeypatch.setattr(resume_extractor, 'EXTRACTOR_VERSION', 'next')
+    assert ExtractionCache.make_key(b'%PDF', '.PDF', resume_extractor.get_extractor_version()) != key
+    assert ExtractionCache.make_key(b'%PDF', '.docx', resume_extractor.get_extractor_version()) != \
+        ExtractionCache.make_key(b'%PDF', '.PDF', resume_extractor.get_extractor_version())
@@ -0,0 +1,100 @@
+import os
+import time
+
+import pytest
+
+from utils import extraction_sandbox
+from utils.extraction_sandbox import ExtractionSandbox, ExtractionSandboxError
+
+needs_resource_limits = pytest.mark.skipif(extraction_sandbox.resource is None, reason='no resource module')
+
+
+# Tasks run in forkserver workers, so they must be importable module-level functions
+
+def worker_pid():
+    return os.getpid()
+
+
+def fail():
+    raise ValueError('unreadable document')
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+
+
+def allocate(megabytes):
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+def spin():
+    while True:
+        pass
+
+
+def crash():
+    os._exit(3)
+
+
+@pytest.fixture
+def make_sandbox():
+    sandboxes = []
+
+    def make(**kwargs):
+        sandbox = ExtractionSandbox(**dict({'workers': 1, 'timeout': 20}, **kwargs))
+        sandboxes.append(sandbox)
+        return sandbox
+
+    yield make
+    for sandbox in sandboxes:
+        sandbox.shutdown()
+
+
+def reason_of(sandbox, func, *args):
+    with pytest.raises(ExtractionSandboxError) as raised:
+        sandbox.run(func, *args)
+    return raised.value.reason
+
+
+def test_workers_are_reused_then_recycled(make_sandbox):
+    sandbox = make_sandbox(max_tasks_per_worker=2)
+    pids = [sandbox.run(worker_pid) for _ in range(3)]
+    assert pids[0] == pids[1] != pids[2]
+    assert os.getpid() not in pids
+    assert sandbox.stats()['workers_started'] == 2
+
+
+def test_task_errors_keep_the_worker(make_sandbox):
+    sandbox = make_sandbox()
+    pid = sandbox.run(worker_pid)
+    assert reason_of(sandbox, fail) == 'failed'
+    assert sandbox.run(worker_pid) == pid
+
+
+def test_wall_clock_timeout_kills_the_worker(make_sandbox):
+    sandbox = make_sandbox(timeout=0.5)
+    pid = sandbox.run(worker_pid)
+    assert reason_of(sandbox, sleep, 10) == 'timeout'
+    assert sandbox.run(worker_pid) != pid
+    assert sandbox.stats()['timeout'] == 1
+
+
+def test_crashed_worker_is_reported(make_sandbox):
+    sandbox = make_sandbox()
+    assert reason_of(sandbox, crash) == 'worker_crashed'
+    assert sandbox.run(worker_pid) > 0
+
+
+@needs_resource_limits
+def test_memory_limit(make_sandbox):
+    sandbox = make_sandbox(memory_limit_mb=512)
+    assert sandbox.run(allocate, 16) == 16 * 1024 * 1024
+    assert reason_of(sandbox, allocate, 1024) == 'memory_limit'
+    assert sandbox.stats()['memory_limit'] == 1
+
+
+@needs_resource_limits
+def test_cpu_limit(make_sandbox):
+    sandbox = make_sandbox(cpu_seconds=1)
+    assert reason_of(sandbox, spin) == 'cpu_limit'
+    assert sandbox.run(worker_pid) > 0
@@ -0,0 +1,42 @@
+import pytest
+
+from utils.resume_extractor import get_skill_matcher
+
+THRESHOLD = 0.88
+
+
+def fuzzy_only(text):
+    matcher = get_skill_matcher()
+    text_lower = text.lower()
+    return matcher.find_skill_names(text_lower, THRESHOLD) - matcher.find_skill_names(text_lower, None)
+
+
+@pytest.mark.parametrize('text, skill', [
+    ('Postgre SQL', 'PostgreSQL'),
+    ('Tensor Flow', 'TensorFlow'),
+    ('Javascrpt', 'JavaScript'),
+    ('Kubernets', 'Kubernetes'),
+    ('Tensorflw', 'TensorFlow'),
+])
+def test_spelling_variants_are_found(text, skill):
+    assert skill in fuzzy_only(f"Worked with {text} daily")
+
+
+@pytest.mark.parametrize('text', [
+    'We wrote unit tests for every release',
+    'An iconic product',
+    'A pearl of a design',
+    'The UI reacts to input',
+    'Scaled to 40 nodes',
+    'Served mochas to the team',
+    'A strong communicator in cross-functional teams',
+    'Communicated in weekly reviews',
+])
+def test_ordinary_words_are_not_skills(text):
+    assert fuzzy_only(text) == set()
+
+
+def test_exact_matches_are_unchanged_by_fuzzy_mode():
+    text = 'python, react, node.js and docker'
+    matcher = get_skill_matcher()
+    assert matcher.find_skill_names(text, None) <= matcher.find_skill_names(text, THRESHOLD)
@@ -0,0 +1,61 @@
+import threading
+import time
+
+from utils.health_probe import HealthProber
+
+
+def test_snapshot_reports_the_cached_outcome():
+    outcomes = iter([None, 'quota exceeded', 'quota exceeded', None])
+
+    def check():
+        error = next(outcomes)
+        if error:
+            raise RuntimeError(error)
+
+    prober = HealthProber(check, interval=60, window=3)
+    assert prober.snapshot()['ok'] is None and prober.snapshot()['stale'] is True
+
+    assert [prober.probe() for _ in range(3)] == [True, False, False]
+    state = prober.snapshot()
+    assert (state['ok'], state['consecutive_failures'], state['checks']) == (False, 2, 3)
+    assert (state['last_error'], state['error_rate'], state['stale']) == ('quota exceeded', 0.667, False)
+
+    assert prober.probe() is True
+    state = prober.snapshot()
+    assert (state['ok'], state['consecutive_failures'], state['last_error']) == (True, 0, 'quota exceeded')
+    assert state['error_rate'] == 0.667
+
+
+def test_snapshot_does_not_call_the_check():
+    calls = []
+    prober = HealthProber(lambda: calls.append(1), interval=60)
+    prober.probe()
+    for _ in range(5):
+        prober.snapshot()
+    assert calls == [1]
+
+
+def test_result_older_than_three_intervals_is_stale():
+    prober = HealthProber(lambda: None, interval=0.05)
+    prober.probe()
+    assert prober.snapshot()['stale'] is False
+    time.sleep(0.2)
+    assert prober.snapshot()['stale'] is True
+
+
+def test_background_thread_probes_until_stopped():
+    probed = threading.Event()
+    calls = []
+
+    def check():
+        calls.append(1)
+        probed.set()
+
+    prober = HealthProber(check, interval=0.02)
+    prober.start()
+    assert probed.wait(5)
+    prober.stop(timeout=5)
+    assert prober._thread is None
+    count = len(calls)
+    time.sleep(0.1)
+    assert len(calls) == count and prober.snapshot()['ok'] is True
@@ -0,0 +1,215 @@
+import hashlib
+import hmac
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from utils import job_queue
+from utils.job_queue import CallbackNotAllowed, JobQueue, JobQueueFull, check_callback_url
+
+
+def wait_for(queue, job_id, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job['status'] in job_queue.TERMINAL_STATUSES:
+            return job
+        time.sleep(0.02)
+    raise AssertionError(f'job {job_id} did not finish')
+
+
+@pytest.fixture
+def make_queue(tmp_path):
+    queues = []
+
+    def make(handlers=None, **kwargs):
+        queue = JobQueue(str(tmp_path / 'jobs.sqlite3'), handlers=handlers or {'echo': lambda payload, job: payload},
+                         **dict({'workers': 0, 'poll_interval': 0.02}, **kwargs))
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.stop(timeout=5)
+
+
+def test_jobs_run_and_report_results(make_queue):
+    def fail(payload, job):
+        raise RuntimeError('Gemini unavailable')
+
+    queue = make_queue({'echo': lambda payload, job: payload, 'fail': fail}, workers=2)
+    queue.start()
+    ok = wait_for(queue, queue.enqueue('echo', {'n': 1}))
+    failed = wait_for(queue, queue.enqueue('fail', {}))
+    assert (ok['status'], ok['result'], ok['attempts']) == ('succeeded', {'n': 1}, 1)
+    assert (failed['status'], failed['error']) == ('failed', 'Gemini unavailable')
+
+
+def test_queue_capacity(make_queue):
+    queue = make_queue(max_queued=1)
+    queue.enqueue('echo', {})
+    with pytest.raises(JobQueueFull):
+        queue.enqueue('echo', {})
+
+
+def test_cancelling_a_queued_job(make_queue):
+    queue = make_queue()
+    job_id = queue.enqueue('echo', {})
+    assert queue.cancel(job_id)['status'] == 'cancelled'
+    assert queue._claim() is None
+
+
+def test_expired_lease_is_retried_then_failed(make_queue):
+    queue = make_queue(lease_seconds=0.05, max_attempts=2)
+    job_id = queue.enqueue('echo', {'n': 1})
+
+    first, _ = queue._claim()
+    time.sleep(0.1)
+    second, payload = queue._claim()
+    assert (first.id, second.id, second.attempts) == (job_id, job_id, 2)
+
+    # The first worker finishing late must not overwrite the retry
+    queue._run(first, payload)
+    assert queue.get(job_id)['status'] == 'running'
+
+    time.sleep(0.1)
+    assert queue._claim() is None
+    job = queue.get(job_id)
+    assert (job['status'], job['error']) == ('failed', 'Job worker stopped before the job finished')
+
+
+def test_retry_finishes_the_job(make_queue):
+    queue = make_queue(lease_seconds=0.05)
+    job_id = queue.enqueue('echo', {'n': 2})
+    queue._claim()
+    time.sleep(0.1)
+    queue._run(*queue._claim())
+    job = queue.get(job_id)
+    assert (job['status'], job['result'], job['attempts']) == ('succeeded', {'n': 2}, 2)
+
+
+def test_lease_is_renewed_while_the_handler_runs(make_queue):
+    release = threading.Event()
+
+    def slow(payload, job):
+        release.wait(5)
+        return payload
+
+    queue = make_queue({'slow': slow}, lease_seconds=0.15)
+    job_id = queue.enqueue('slow', {'n': 3})
+    runner = threading.Thread(target=queue._run, args=queue._claim())
+    runner.start()
+    try:
+        time.sleep(0.5)
+        assert queue._claim() is None
+    finally:
+        release.set()
+        runner.join(5)
+    job = queue.get(job_id)
+    assert (job['status'], job['attempts']) == ('succeeded', 1)
+
+
+def test_purge_runs_without_workers(make_queue):
+    queue = make_queue(result_ttl=0.05, purge_interval=0.05)
+    job_id = queue.enqueue('echo', {})
+    queue._run(*queue._claim())
+    queue.start()
+    deadline = time.monotonic() + 5
+    while queue.stats()['jobs']['succeeded'] and time.monotonic() < deadline:
+        time.sleep(0.02)
+    assert queue.stats() == {'jobs': {'queued': 0, 'running': 0, 'succeeded': 0, 'failed': 0, 'cancelled': 0},
+                             'workers': 0, 'max_queued': 1000}
+    assert queue.get(job_id) is None
+
+
+@pytest.mark.parametrize('url, hosts', [
+    ('http://hooks.example.com/done', []),
+    ('http://evil.test/done', ['hooks.example.com']),
+    ('http://example.com.evil.test/done', ['.example.com']),
+    ('file:///etc/passwd', ['hooks.example.com']),
+])
+def test_callback_hosts_must_be_allowed(url, hosts):
+    with pytest.raises(CallbackNotAllowed):
+        check_callback_url(url, hosts)
+
+
+def test_allowed_callback_hosts():
+    check_callback_url('https://HOOKS.example.com:8443/done?x=1', ['hooks.example.com'])
+    check_callback_url('https://a.b.example.com/done', ['.example.com'])
+
+
+def test_enqueue_rejects_callbacks_outside_the_allowlist(make_queue):
+    queue = make_queue(callback_hosts=['hooks.example.com'])
+    with pytest.raises(CallbackNotAllowed):
+        queue.enqueue('echo', {}, callback_url='http://169.254.169.254/latest/meta-data')
+
+
+@pytest.mark.parametrize('address', ['127.0.0.1', '10.1.2.3', '192.168.0.10', '169.254.169.254', '::1',
+                                     '::ffff:127.0.0.1', 'fd00::1', '224.0.0.1', '0.0.0.0'])
+def test_callbacks_to_non_public_addresses_are_refused(monkeypatch, address):
+    family = socket.AF_INET6 if ':' in address else socket.AF_INET
+    monkeypatch.setattr(socket, 'getaddrinfo',
+                        lambda *args, **kwargs: [(family, socket.SOCK_STREAM, 6, '', (address, 80))])
+    with pytest.raises(CallbackNotAllowed):
+        job_queue._public_address('hooks.example.com', 80)
+
+
+def test_public_addresses_are_allowed(monkeypatch):
+    monkeypatch.setattr(socket, 'getaddrinfo',
+                        lambda *args, **kwargs: [(socket.AF_INET, socket.SOCK_STREAM, 6, '', ('93.184.216.34', 80))])
+    assert job_queue._public_address('hooks.example.com', 80) == '93.184.216.34'
+
+
+@pytest.fixture
+def callback_server():
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            received.append((self.path, dict(self.headers), self.rfile.read(int(self.headers['Content-Length']))))
+            self.send_response(self.server.status)
+            self.send_header('Location', '/elsewhere')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(('127.0.0.1', 0), Handler)
+    server.status = 204
+    server.received = received
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+
+
+def test_signed_callback_is_sent_on_completion(make_queue, callback_server, monkeypatch):
+    # The test server is on loopback, which real callbacks may not reach
+    monkeypatch.setattr(job_queue, '_public_address', lambda host, port: '127.0.0.1')
+    queue = make_queue(workers=1, callback_hosts=['hooks.test'], callback_secret='s3cret')
+    queue.start()
+    job_id = queue.enqueue('echo', {'n': 3}, callback_url=f'http://hooks.test:{callback_server.server_port}/done?k=1')
+    wait_for(queue, job_id)
+    deadline = time.monotonic() + 5
+    while not callback_server.received and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+    path, headers, body = callback_server.received[0]
+    assert path == '/done?k=1'
+    assert headers['Host'] == f'hooks.test:{callback_server.server_port}'
+    expected = hmac.new(b's3cret', headers['X-CareerNav-Timestamp'].encode() + b'.' + body, hashlib.sha256)
+    assert headers['X-CareerNav-Signature'] == f'sha256={expected.hexdigest()}'
+    assert json.loads(body)['id'] == job_id and json.loads(body)['result'] == {'n': 3}
+
+
+def test_callback_redirects_are_not_followed(make_queue, callback_server, monkeypatch):
+    monkeypatch.setattr(job_queue, '_public_address', lambda host, port: '127.0.0.1')
+    callback_server.status = 302
+    queue = make_queue(callback_hosts=['hooks.test'])
+    with pytest.raises(Exception, match='302'):
+        queue._post(f'http://hooks.test:{callback_server.server_port}/done', b'{}', {})
+    assert len(callback_server.received) == 1
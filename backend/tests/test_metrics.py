@@ -0,0 +1,77 @@
+import re
+
+import pytest
+
+from utils import metrics
+from utils.metrics import CallbackMetric, Counter, Gauge, Histogram, Registry
+
+
+@pytest.fixture
+def registry():
+    metrics.configure_metrics(True)
+    yield Registry()
+    metrics.configure_metrics(True)
+
+
+def test_histogram_buckets_are_cumulative(registry):
+    histogram = registry.register(Histogram('stage_seconds', 'Stage time', ['stage'], buckets=(0.1, 1)))
+    for value in (0.05, 0.1, 0.5, 3):
+        histogram.observe(value, stage='parse')
+    assert registry.render().splitlines() == [
+        '# HELP stage_seconds Stage time',
+        '# TYPE stage_seconds histogram',
+        'stage_seconds_bucket{stage="parse",le="0.1"} 2',
+        'stage_seconds_bucket{stage="parse",le="1"} 3',
+        'stage_seconds_bucket{stage="parse",le="+Inf"} 4',
+        'stage_seconds_sum{stage="parse"} 3.65',
+        'stage_seconds_count{stage="parse"} 4',
+    ]
+
+
+def test_counters_gauges_and_label_escaping(registry):
+    requests = registry.register(Counter('requests_total', 'Requests', ['endpoint']))
+    in_flight = registry.register(Gauge('in_flight', 'In flight'))
+    registry.register(CallbackMetric('cache_hits_total', 'Cache hits', 'counter', lambda: 7))
+    requests.inc(endpoint='/ai/"quoted"\n')
+    requests.inc(2, endpoint='/ai/"quoted"\n')
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+    lines = registry.render().splitlines()
+    assert 'requests_total{endpoint="/ai/\\"quoted\\"\\n"} 3' in lines
+    assert 'in_flight 1' in lines
+    assert lines[-3:] == ['# HELP cache_hits_total Cache hits', '# TYPE cache_hits_total counter',
+                          'cache_hits_total 7']
+    with pytest.raises(ValueError):
+        requests.inc()
+    with pytest.raises(ValueError):
+        registry.register(Gauge('in_flight', 'Again'))
+
+
+def test_disabled_metrics_record_nothing(registry):
+    histogram = registry.register(Histogram('stage_seconds', 'Stage time', ['stage']))
+    metrics.configure_metrics(False)
+    histogram.observe(1, stage='parse')
+    with histogram.time(stage='parse'):
+        pass
+    assert registry.render().splitlines() == ['# HELP stage_seconds Stage time', '# TYPE stage_seconds histogram']
+
+
+def test_metrics_endpoint_exposes_request_counts():
+    import app
+
+    client = app.app.test_client()
+    assert client.get('/cache/stats').status_code == 200
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/plain; version=0.0.4')
+
+    body = response.get_data(as_text=True)
+    sample = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{[^}]*\})? \S+$')
+    assert all(line.startswith('# ') or sample.match(line) for line in body.splitlines())
+    match = re.search(r'^careernav_http_requests_total\{endpoint="/cache/stats",method="GET",status="200"\} (\d+)$',
+                      body, re.M)
+    assert match and int(match.group(1)) >= 1
+    assert '# TYPE careernav_http_request_duration_seconds histogram' in body
+    assert re.search(r'^careernav_http_request_duration_seconds_bucket\{endpoint="/cache/stats",le="\+Inf"\} \d+$',
+                     body, re.M)
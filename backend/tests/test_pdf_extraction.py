@@ -0,0 +1,107 @@
+import io
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from benchmarks.corpus import write_pdf
+from utils import resume_extractor
+from utils.resume_extractor import ExtractionLimits, PdfPageStream, extract_resume_document
+
+PAGE_LINES = 6
+
+
+@pytest.fixture
+def pdf_bytes(tmp_path):
+    pages = [[(60, 700 - 20 * line, f"Page {page} line {line} Python and Docker experience")
+              for line in range(PAGE_LINES)] for page in range(1, 5)]
+    path = tmp_path / 'resume.pdf'
+    write_pdf(path, pages)
+    return path.read_bytes()
+
+
+def test_all_pages_are_read_without_limits(pdf_bytes):
+    stream = PdfPageStream(pdf_bytes, ExtractionLimits())
+    pages = list(stream)
+    assert [page['page'] for page in pages] == [1, 2, 3, 4]
+    assert 'Page 3 line 0' in pages[2]['text']
+    assert (stream.page_count, stream.truncated, stream.truncated_reason) == (4, False, None)
+
+
+def test_page_limit_stops_early(pdf_bytes):
+    stream = PdfPageStream(pdf_bytes, ExtractionLimits(max_pages=2))
+    assert len(list(stream)) == 2
+    assert (stream.truncated, stream.truncated_reason) == (True, 'max_pages')
+
+
+def test_char_limit_stops_after_the_page_that_reaches_it(pdf_bytes):
+    stream = PdfPageStream(pdf_bytes, ExtractionLimits(max_chars=10))
+    assert len(list(stream)) == 1
+    assert (stream.truncated, stream.truncated_reason) == (True, 'max_chars')
+
+
+def test_time_limit_is_checked_between_pages(pdf_bytes):
+    stream = PdfPageStream(pdf_bytes, ExtractionLimits(max_seconds=0))
+    assert len(list(stream)) == 1
+    assert stream.truncated_reason == 'max_seconds'
+
+
+def test_reaching_a_limit_on_the_last_page_is_not_truncation(pdf_bytes):
+    full = sum(len(page['text']) for page in PdfPageStream(pdf_bytes, ExtractionLimits()))
+    stream = PdfPageStream(pdf_bytes, ExtractionLimits(max_pages=4, max_chars=full))
+    assert len(list(stream)) == 4
+    assert stream.truncated is False
+
+
+def test_document_reports_truncation_and_pages(pdf_bytes):
+    document = extract_resume_document(io.BytesIO(pdf_bytes), filename='cv.pdf',
+                                       limits=ExtractionLimits(max_pages=3))
+    assert document['truncated'] and document['truncated_reason'] == 'max_pages'
+    assert [page['page'] for page in document['pages']] == [1, 2, 3]
+    assert 'Page 4' not in document['text']
+
+
+@pytest.fixture
+def parallel(monkeypatch):
+    monkeypatch.setitem(resume_extractor._parallel_settings, 'enabled', True)
+    monkeypatch.setitem(resume_extractor._parallel_settings, 'min_pages', 2)
+    monkeypatch.setitem(resume_extractor._parallel_settings, 'pages_per_task', 1)
+    monkeypatch.setitem(resume_extractor._parallel_settings, 'workers', 2)
+    yield
+    resume_extractor._reset_process_pool()
+
+
+def page_texts(pages):
+    return [(page['page'], page['text']) for page in pages]
+
+
+def test_parallel_extraction_matches_in_process(pdf_bytes, parallel):
+    in_process = page_texts(resume_extractor._iter_pdf_page_range(pdf_bytes))
+    stream = PdfPageStream(pdf_bytes, ExtractionLimits())
+    assert page_texts(stream) == in_process
+    assert (stream.page_count, stream.truncated) == (4, False)
+    assert resume_extractor._process_pool is not None
+
+
+def test_broken_pool_resumes_in_process_after_pages_read(pdf_bytes, parallel, monkeypatch):
+    def crash_after_first_page(source, page_count, deadline=None):
+        yield next(resume_extractor._iter_pdf_page_range(source, 0, 1))
+        raise BrokenProcessPool('worker died')
+
+    resets = []
+    monkeypatch.setattr(resume_extractor, '_iter_pdf_pages_parallel', crash_after_first_page)
+    monkeypatch.setattr(resume_extractor, '_reset_process_pool', lambda: resets.append(True))
+    stream = PdfPageStream(pdf_bytes, ExtractionLimits())
+    assert page_texts(stream) == page_texts(resume_extractor._iter_pdf_page_range(pdf_bytes))
+    assert resets == [True]
+
+
+def test_parallel_extraction_stops_waiting_at_the_time_limit(pdf_bytes, parallel, monkeypatch):
+    class StalledPool:
+        def submit(self, *args):
+            return Future()
+
+    monkeypatch.setattr(resume_extractor, '_get_process_pool', StalledPool)
+    stream = PdfPageStream(pdf_bytes, ExtractionLimits(max_pages=3, max_seconds=0.1))
+    assert list(stream) == []
+    assert (stream.truncated, stream.truncated_reason) == (True, 'max_seconds')
@@ -0,0 +1,120 @@
+import io
+import time
+from contextlib import closing
+
+import pytest
+from docx import Document
+
+from utils.resume_store import ResumeStore
+
+RESUME_TEXT = 'Jane Doe jane@example.com Senior engineer with Python, Docker and React experience. ' * 4
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ResumeStore(str(tmp_path / 'resumes.sqlite3'), ttl=60, max_entries=2)
+
+
+def content_rows(store):
+    with closing(store._connect()) as conn:
+        return conn.execute('SELECT COUNT(*) FROM resume_contents').fetchone()[0]
+
+
+def test_put_issues_random_ids(store):
+    first = store.put('sha-abc', 'text', {'skills': ['Python']})
+    second = store.put('sha-abc', 'text', {'skills': ['Python']})
+    assert first != second and 'sha-abc' not in first
+    assert len(first) >= 32
+    for resume_id in (first, second):
+        resume = store.get(resume_id)
+        assert (resume['clean_text'], resume['basic_info']) == ('text', {'skills': ['Python']})
+    assert store.get('sha-abc') is None
+    assert store.get('missing') is None
+
+
+def test_same_content_is_stored_once(store):
+    store.put('sha-abc', 'text', {})
+    store.put('sha-abc', 'text', {})
+    assert (store.count(), content_rows(store)) == (2, 1)
+
+
+def test_put_enforces_max_entries(store):
+    ids = []
+    for index in range(4):
+        ids.append(store.put(f'sha-{index}', f'text {index}', {}))
+        time.sleep(0.01)
+    assert [store.get(resume_id) is not None for resume_id in ids] == [False, False, True, True]
+    assert (store.count(), content_rows(store)) == (2, 2)
+
+
+def test_purge_drops_expired_entries(tmp_path):
+    store = ResumeStore(str(tmp_path / 'resumes.sqlite3'), ttl=0.05)
+    resume_id = store.put('sha-old', 'text', {})
+    time.sleep(0.1)
+    assert store.get(resume_id) is None
+    store.ttl = 60
+    kept = store.put('sha-new', 'text', {})
+    assert store.purge() == 1
+    assert store.get(kept) is not None
+    assert content_rows(store) == 1
+
+
+def test_background_purge(tmp_path):
+    store = ResumeStore(str(tmp_path / 'resumes.sqlite3'), ttl=0.01, purge_interval=0.05)
+    store.put('sha-abc', 'text', {})
+    store.start()
+    try:
+        time.sleep(0.3)
+        with closing(store._connect()) as conn:
+            assert conn.execute('SELECT COUNT(*) FROM resume_handles').fetchone()[0] == 0
+        assert content_rows(store) == 0
+    finally:
+        store.stop()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    import app
+
+    class Service:
+        def analyze_resume_gaps(self, skills_by_category, preferences, extracted_text):
+            return {'text': extracted_text, 'skills': skills_by_category}
+
+    monkeypatch.setattr(app, 'get_gemini_service', Service)
+    return app.app.test_client()
+
+
+def upload(client):
+    document = Document()
+    document.add_paragraph(RESUME_TEXT)
+    buffer = io.BytesIO()
+    document.save(buffer)
+    buffer.seek(0)
+    response = client.post('/extract-resume', data={'resume': (buffer, 'resume.docx')},
+                           content_type='multipart/form-data')
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def test_resume_id_round_trip(client):
+    extracted = upload(client)
+    again = upload(client)['resume_id']
+    assert again != extracted['resume_id']
+    assert '-docx-' not in again
+
+    response = client.post('/ai/resume-analysis', json={'resume_id': extracted['resume_id']})
+    assert response.status_code == 200
+    analysis = response.get_json()['analysis']
+    assert analysis['text'] == extracted['extracted_content']['full_text']
+    assert 'Python' in sum(analysis['skills'].values(), [])
+
+
+def test_inline_fields_take_precedence(client):
+    resume_id = upload(client)['resume_id']
+    response = client.post('/ai/resume-analysis', json={'resume_id': resume_id, 'resume_text': 'inline'})
+    assert response.get_json()['analysis']['text'] == 'inline'
+
+
+def test_unknown_resume_id(client):
+    response = client.post('/ai/resume-analysis', json={'resume_id': 'not-a-resume'})
+    assert response.status_code == 404
@@ -0,0 +1,65 @@
+from utils.resume_extractor import extract_basic_info, get_section_entries, segment_resume_sections
+
+RESUME = """Jane Doe
+jane@example.com
+
+EXPERIENCE
+Senior Engineer, Acme
+Built the billing platform
+
+- Engineer, Initech
+  Led the API team
+
+Projects: Resume parser
+Open-source CLI
+
+EDUCATION
+BSc Computer Science
+"""
+
+
+def test_sections_are_split_at_their_headers():
+    segments = segment_resume_sections(RESUME)
+    lines = segments['lines']
+    experience, = segments['sections']['experience']
+    assert experience['header'] == 'EXPERIENCE'
+    assert lines[experience['start']] == 'Senior Engineer, Acme'
+    assert lines[experience['end']] == 'Projects: Resume parser'
+    projects, = segments['sections']['projects']
+    assert projects['inline'] == 'Resume parser'
+    assert lines[projects['end']] == 'EDUCATION'
+    assert segments['sections']['education'][0]['end'] == len(lines)
+
+
+def test_entries_are_separated_by_blank_lines_without_bullets():
+    segments = segment_resume_sections(RESUME)
+    assert get_section_entries(segments, 'experience') == [
+        'Senior Engineer, Acme Built the billing platform',
+        'Engineer, Initech Led the API team',
+    ]
+    assert get_section_entries(segments, 'projects') == ['Resume parser Open-source CLI']
+
+
+def test_sentences_starting_with_a_header_word_are_not_headers():
+    segments = segment_resume_sections("Summary\nExperience with large systems\nProjects")
+    assert 'experience' not in segments['sections']
+    assert segments['sections']['summary'][0]['end'] == 2
+
+
+def test_multi_word_headers_and_repeated_sections():
+    segments = segment_resume_sections("Work  History\nAcme\n\nPROFESSIONAL EXPERIENCE\nInitech\nEmployment History: Globex")
+    assert [span['header'] for span in segments['sections']['experience']] == [
+        'Work  History', 'PROFESSIONAL EXPERIENCE', 'Employment History: Globex']
+    assert get_section_entries(segments, 'experience') == ['Acme', 'Initech', 'Globex']
+
+
+def test_entries_are_deduplicated_and_limited():
+    text = "Experience\n" + "\n\n".join(['Same role', 'same role'] + [f'Role {i}' for i in range(20)])
+    entries = get_section_entries(segment_resume_sections(text), 'experience', limit=5)
+    assert entries == ['Same role', 'Role 0', 'Role 1', 'Role 2', 'Role 3']
+
+
+def test_basic_info_uses_the_segments():
+    info = extract_basic_info(RESUME, RESUME)
+    assert info['experience_entries'][0] == 'Senior Engineer, Acme Built the billing platform'
+    assert info['project_entries'] == ['Resume parser Open-source CLI']
@@ -0,0 +1,128 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from utils.singleflight import SingleFlight, coalescing_key
+
+
+def test_equivalent_arguments_share_a_key():
+    assert coalescing_key('roles', {'skills': ['Python '], 'goal': 'Senior  Engineer'}) == \
+        coalescing_key('roles', {'goal': 'senior engineer', 'skills': ['python']})
+    assert coalescing_key('roles', ['a', 'b']) != coalescing_key('roles', ['b', 'a'])
+    assert coalescing_key('roles', {}) != coalescing_key('paths', {})
+
+
+def run_concurrently(flight, key, func, callers=5):
+    """Start callers on a shared key while func is held open; returns their outcomes"""
+    release = threading.Event()
+    started = threading.Event()
+
+    def held():
+        started.set()
+        release.wait(5)
+        return func()
+
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        leader = pool.submit(flight.do, key, held)
+        started.wait(5)
+        followers = [pool.submit(flight.do, key, held) for _ in range(callers - 1)]
+        # Followers block inside do() until the leader finishes; give them time to get there
+        time.sleep(0.2)
+        release.set()
+        return [leader] + followers
+
+
+def test_concurrent_calls_run_once_and_get_copies():
+    flight = SingleFlight()
+    runs = []
+
+    def call():
+        runs.append(1)
+        return {'roles': ['Engineer']}
+
+    futures = run_concurrently(flight, 'k', call)
+    outcomes = [future.result() for future in futures]
+    assert len(runs) == 1
+    assert [shared for _, shared in outcomes].count(False) == 1
+    results = [result for result, _ in outcomes]
+    assert all(result == {'roles': ['Engineer']} for result in results)
+    results[0]['roles'].append('mutated by the leader')
+    results[1]['roles'].append('mutated')
+    assert all(result == {'roles': ['Engineer']} for result in results[2:])
+
+
+def test_leader_does_not_get_the_live_result():
+    flight = SingleFlight()
+    live = {'roles': ['Engineer']}
+    result, shared = flight.do('k', lambda: live)
+    assert (result, shared) == (live, False)
+    assert result is not live
+
+    async def call():
+        return live
+
+    result, shared = asyncio.run(flight.do_async('k', call))
+    assert (result, shared) == (live, False)
+    assert result is not live
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    flight = SingleFlight()
+
+    def fail():
+        raise RuntimeError('quota exceeded')
+
+    for future in run_concurrently(flight, 'k', fail, callers=3):
+        with pytest.raises(RuntimeError, match='quota exceeded'):
+            future.result()
+    assert flight.do('k', lambda: 'fresh') == ('fresh', False)
+
+
+def test_async_calls_share_a_task_and_survive_a_cancelled_caller():
+    flight = SingleFlight()
+    runs = []
+
+    async def call():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return {'path': ['Learn Go']}
+
+    async def main():
+        first = asyncio.ensure_future(flight.do_async('k', call))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flight.do_async('k', call))
+        third = asyncio.ensure_future(flight.do_async('k', call))
+        await asyncio.sleep(0)
+        first.cancel()
+        return await asyncio.gather(second, third)
+
+    outcomes = asyncio.run(main())
+    assert len(runs) == 1
+    assert outcomes == [({'path': ['Learn Go']}, True), ({'path': ['Learn Go']}, True)]
+    assert outcomes[0][0] is not outcomes[1][0]
+    assert flight._tasks == {}
+
+
+def test_gemini_service_coalesces_identical_requests(monkeypatch):
+    from utils.gemini_service import GeminiService
+
+    monkeypatch.setenv('GEMINI_API_KEY', 'test-key')
+    service = GeminiService(coalesce=True)
+    prompts = []
+
+    class Model:
+        def generate_content(self, prompt, request_options=None):
+            prompts.append(prompt)
+            time.sleep(0.3)
+            raise RuntimeError('offline')
+
+    service.model = Model()
+    arguments = [{'skills_by_category': {'Languages': ['Python']}, 'preferences': {'goals': goal}}
+                 for goal in ('Senior engineer', 'senior  ENGINEER', 'Senior engineer')]
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        results = list(pool.map(lambda kwargs: service.generate_career_recommendations(**kwargs), arguments))
+    assert len(prompts) == 1
+    assert results[0] == results[1] == results[2]
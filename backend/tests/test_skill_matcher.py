@@ -0,0 +1,69 @@
+import json
+import time
+
+import pytest
+
+from benchmarks.bench_skill_matcher import generate_corpus, legacy_extract_skills_from_text, legacy_get_skills_summary
+from utils import resume_extractor
+from utils.resume_extractor import extract_skills_from_text, get_skills_summary, match_skills
+
+
+@pytest.mark.parametrize('seed', [1, 42])
+def test_single_pass_matcher_agrees_with_per_alias_regexes(seed):
+    for text in generate_corpus(40, seed=seed):
+        skills = extract_skills_from_text(text)
+        assert skills == legacy_extract_skills_from_text(text)
+        assert get_skills_summary(skills) == legacy_get_skills_summary(skills)
+
+
+@pytest.mark.parametrize('text', [
+    'Shipped C++ and C# services behind Node.js gateways',
+    'Knows .NET, ASP.NET and CI/CD (GitHub Actions)',
+    'PYTHON, Java; react-native? go',
+    'javascripting is not a skill, nor is pythonic',
+    '',
+])
+def test_word_boundaries_match_the_per_alias_regexes(text):
+    assert extract_skills_from_text(text) == legacy_extract_skills_from_text(text)
+
+
+@pytest.fixture
+def taxonomy(tmp_path):
+    path = tmp_path / 'skills.json'
+
+    def write(aliases):
+        path.write_text(json.dumps({'tools': [{'name': 'Widget', 'aliases': aliases}]}))
+        return path
+
+    write(['widget'])
+    resume_extractor.configure_skills_database(str(path), index_dir=str(tmp_path / 'index'), reload_interval=0.1)
+    yield write
+    resume_extractor.configure_skills_database()
+
+
+def test_changed_taxonomy_is_picked_up_after_the_reload_interval(taxonomy):
+    assert extract_skills_from_text('widget or gizmo') == ['Widget']
+    taxonomy(['widget', 'gizmo'])
+    assert match_skills('gizmo') == []
+    time.sleep(0.15)
+    assert [match['alias'] for match in match_skills('gizmo')] == ['gizmo']
+
+
+def test_unloadable_taxonomy_keeps_the_current_matcher(taxonomy):
+    version = resume_extractor.get_skill_matcher().version
+    taxonomy(['widget']).write_text('{"tools": [')
+    time.sleep(0.15)
+    assert resume_extractor.get_skill_matcher().version == version
+    assert extract_skills_from_text('widget') == ['Widget']
+
+
+def test_corrupt_index_falls_back_to_compiling_the_taxonomy(taxonomy, tmp_path):
+    path = taxonomy(['widget', 'gizmo'])
+    matcher = resume_extractor.load_skill_matcher(str(path))
+    [index_path] = (tmp_path / 'index').glob('*.index.json')
+    index_path.write_text('{"format": 1, "pattern": ')
+
+    rebuilt = resume_extractor.load_skill_matcher(str(path))
+    assert rebuilt.version == matcher.version
+    assert [match['alias'] for match in rebuilt.find_matches('gizmo widget')] == ['gizmo', 'widget']
+    assert json.loads(index_path.read_text())['version'] == matcher.version
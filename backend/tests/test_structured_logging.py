@@ -0,0 +1,82 @@
+import io
+import json
+import logging
+import queue
+
+import pytest
+
+from utils import structured_logging
+from utils.structured_logging import SamplingFilter, configure_logging, shutdown_logging
+
+
+@pytest.fixture
+def log_output():
+    stream = io.StringIO()
+    yield stream
+    shutdown_logging()
+    configure_logging(level='WARNING')
+
+
+def lines(stream):
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def test_shutdown_writes_out_queued_records_as_json(log_output):
+    configure_logging(level='INFO', fmt='json', stream=log_output)
+    logger = logging.getLogger('careernav.test')
+    logger.info("Parsed %d pages", 3, extra={'resume': 'cv.pdf'})
+    logger.debug("Below the level")
+    try:
+        raise ValueError('bad page')
+    except ValueError:
+        logger.exception("Extraction failed")
+    shutdown_logging()
+
+    records = lines(log_output)
+    assert [(r['level'], r['logger'], r['msg']) for r in records] == [
+        ('INFO', 'careernav.test', 'Parsed 3 pages'), ('ERROR', 'careernav.test', 'Extraction failed')]
+    assert records[0]['resume'] == 'cv.pdf'
+    assert 'ValueError: bad page' in records[1]['exc']
+    assert structured_logging._listener is None
+    assert structured_logging._handler not in logging.getLogger().handlers
+
+
+def test_reconfiguring_replaces_the_previous_handler(log_output):
+    first = io.StringIO()
+    configure_logging(level='INFO', stream=first)
+    configure_logging(level='INFO', fmt='text', stream=log_output)
+    logging.getLogger('careernav.test').info('hello')
+    shutdown_logging()
+    assert first.getvalue() == ''
+    assert log_output.getvalue().rstrip().endswith('INFO careernav.test: hello')
+    assert logging.getLogger().handlers == []
+
+
+def test_sampled_records_are_kept_one_in_every_n(log_output):
+    configure_logging(level='DEBUG', sample_every=3, stream=log_output)
+    logger = logging.getLogger('careernav.test')
+    for index in range(7):
+        logger.debug("Page %d", index, extra={'sample': True})
+    for index in range(2):
+        logger.debug("Other site %d", index, extra={'sample': True})
+    logger.info('Always kept')
+    shutdown_logging()
+
+    records = lines(log_output)
+    assert [r['msg'] for r in records] == ['Page 0', 'Page 3', 'Page 6', 'Other site 0', 'Always kept']
+    assert records[0]['sampled_every'] == 3 and 'sampled_every' not in records[-1]
+
+
+def test_sampling_every_record_keeps_them_all():
+    record = logging.LogRecord('careernav.test', logging.DEBUG, __file__, 1, 'x', (), None)
+    record.sample = True
+    sampler = SamplingFilter(every=1)
+    assert all(sampler.filter(record) for _ in range(5))
+
+
+def test_full_queue_drops_records_instead_of_blocking():
+    handler = structured_logging._DroppingQueueHandler(queue.Queue(1))
+    record = logging.LogRecord('careernav.test', logging.INFO, __file__, 1, 'x', (), None)
+    for _ in range(3):
+        handler.handle(record)
+    assert handler.dropped == 2
@@ -0,0 +1,329 @@
+"""
+AI insight pipeline
+Runs the Gemini calls behind /process as a small dependency graph, so
+independent calls overlap and dependent ones start as soon as their
+inputs are ready
+"""
+
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
+
+
+class Stage:
+    """
+    One call in the graph. func receives a dict with the results of the
+    stages named in depends; a dependency that failed contributes None.
+    Stages run by iter_stage_graph_async return an awaitable instead.
+    """
+
+    def __init__(self, name: str, func: Callable[[Dict[str, Any]], Any], depends: Iterable[str] = ()):
+        self.name = name
+        self.func = func
+        self.depends = tuple(depends)
+
+
+class StageResult:
+    """
+    Outcome of one stage. status is 'ok', 'error' or 'timeout'; start_ms is
+    measured from the start of the graph, so it includes time spent waiting
+    for dependencies and for a free executor thread.
+    """
+
+    def __init__(self, name: str, status: str, result: Any = None, error: Optional[str] = None,
+                 start_ms: Optional[float] = None, elapsed_ms: Optional[float] = None):
+        self.name = name
+        self.status = status
+        self.result = result
+        self.error = error
+        self.start_ms = start_ms
+        self.elapsed_ms = elapsed_ms
+
+    def timing(self) -> Dict[str, Any]:
+        return {'status': self.status, 'start_ms': self.start_ms, 'elapsed_ms': self.elapsed_ms}
+
+
+def _check_graph(stages):
+    names = [stage.name for stage in stages]
+    if len(set(names)) != len(names):
+        raise ValueError("Stage names must be unique")
+    resolved = set()
+    pending = list(stages)
+    while pending:
+        ready = [stage for stage in pending if all(name in resolved for name in stage.depends)]
+        if not ready:
+            raise ValueError(f"Unknown or circular dependencies: {', '.join(stage.name for stage in pending)}")
+        for stage in ready:
+            pending.remove(stage)
+            resolved.add(stage.name)
+
+
+def _run_stage(func, inputs, graph_started):
+    started = time.perf_counter()
+    try:
+        result, error = func(inputs), None
+    except Exception as e:
+        result, error = None, str(e)
+    finished = time.perf_counter()
+    return (round((started - graph_started) * 1000, 1), round((finished - started) * 1000, 1), result, error)
+
+
+def iter_stage_graph(stages: List[Stage], executor: Executor,
+                     timeout: Optional[float] = None) -> Iterator[StageResult]:
+    """
+    Run stages on executor and yield a StageResult for each as soon as it
+    finishes. A stage is submitted once all of its dependencies have
+    finished, so independent stages run concurrently. Stages still running
+    or waiting when timeout (seconds, for the whole graph) expires are
+    yielded with status 'timeout' and cancelled if they have not started.
+    A stage already running cannot be interrupted and holds its executor
+    thread until its function returns, so stage functions need their own
+    timeouts to keep a shared executor from filling up.
+    """
+    _check_graph(stages)
+    graph_started = time.perf_counter()
+    deadline = graph_started + timeout if timeout else None
+    finished = {}
+    waiting = list(stages)
+    running = {}
+
+    try:
+        while waiting or running:
+            for stage in [stage for stage in waiting if all(name in finished for name in stage.depends)]:
+                waiting.remove(stage)
+                inputs = {name: finished[name].result for name in stage.depends}
+                running[executor.submit(_run_stage, stage.func, inputs, graph_started)] = stage
+
+            remaining = max(0, deadline - time.perf_counter()) if deadline else None
+            done, _ = wait(running, timeout=remaining, return_when=FIRST_COMPLETED)
+            if not done:
+                elapsed_ms = round((time.perf_counter() - graph_started) * 1000, 1)
+                for stage in list(running.values()) + waiting:
+                    yield StageResult(stage.name, 'timeout', error=f"Did not finish within {timeout}s",
+                                      elapsed_ms=elapsed_ms)
+                return
+
+            for future in done:
+                stage = running.pop(future)
+                start_ms, elapsed_ms, result, error = future.result()
+                stage_result = StageResult(stage.name, 'error' if error else 'ok', result, error,
+                                           start_ms, elapsed_ms)
+                finished[stage.name] = stage_result
+                yield stage_result
+    finally:
+        for future in running:
+            future.cancel()
+
+
+def run_stage_graph(stages: List[Stage], executor: Executor,
+                    timeout: Optional[float] = None) -> Dict[str, StageResult]:
+    """Run stages to completion and return their results by name"""
+    return {stage_result.name: stage_result for stage_result in iter_stage_graph(stages, executor, timeout)}
+
+
+async def _run_stage_async(func, inputs, graph_started):
+    started = time.perf_counter()
+    try:
+        result, error = await func(inputs), None
+    except Exception as e:
+        result, error = None, str(e)
+    finished = time.perf_counter()
+    return (round((started - graph_started) * 1000, 1), round((finished - started) * 1000, 1), result, error)
+
+
+async def iter_stage_graph_async(stages: List[Stage], timeout: Optional[float] = None) -> AsyncIterator[StageResult]:
+    """
+    Event-loop counterpart of iter_stage_graph: each stage runs as a task
+    once its dependencies have finished. Stages still running when timeout
+    expires are cancelled and yielded with status 'timeout'.
+    """
+    _check_graph(stages)
+    graph_started = time.perf_counter()
+    deadline = graph_started + timeout if timeout else None
+    finished = {}
+    waiting = list(stages)
+    running = {}
+
+    try:
+        while waiting or running:
+            for stage in [stage for stage in waiting if all(name in finished for name in stage.depends)]:
+                waiting.remove(stage)
+                inputs = {name: finished[name].result for name in stage.depends}
+                running[asyncio.ensure_future(_run_stage_async(stage.func, inputs, graph_started))] = stage
+
+            remaining = max(0, deadline - time.perf_counter()) if deadline else None
+            done, _ = await asyncio.wait(running, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                elapsed_ms = round((time.perf_counter() - graph_started) * 1000, 1)
+                for stage in list(running.values()) + waiting:
+                    yield StageResult(stage.name, 'timeout', error=f"Did not finish within {timeout}s",
+                                      elapsed_ms=elapsed_ms)
+                return
+
+            for task in done:
+                stage = running.pop(task)
+                start_ms, elapsed_ms, result, error = task.result()
+                stage_result = StageResult(stage.name, 'error' if error else 'ok', result, error,
+                                           start_ms, elapsed_ms)
+                finished[stage.name] = stage_result
+                yield stage_result
+    finally:
+        for task in running:
+            task.cancel()
+
+
+def build_insight_stages(gemini_service, basic_info: Dict[str, Any], clean_text: str,
+                         preferences: Dict[str, str], asynchronous: bool = False) -> List[Stage]:
+    """
+    The /process graph: career recommendations first, then skill
+    improvements and a learning path for the top recommended roles;
+    the resume gap analysis needs nothing from the others. With
+    asynchronous=True the stages call the service's *_async methods,
+    for iter_stage_graph_async.
+    """
+    skills = basic_info.get('skills', [])
+    skills_by_category = basic_info.get('skills_summary', {})
+
+    def method(name):
+        return getattr(gemini_service, name + '_async' if asynchronous else name)
+
+    def career_recommendations(inputs):
+        return method('generate_career_recommendations')(
+            skills_by_category=skills_by_category,
+            preferences=preferences,
+            experience_level="intermediate"  # Could be determined from resume analysis
+        )
+
+    def skill_improvements(inputs):
+        career_recs = inputs['career_recommendations']
+        return method('suggest_skill_improvements')(
+            current_skills=skills,
+            target_roles=[role.get('title', '') for role in career_recs.get('recommended_roles', [])[:3]] if career_recs else ['Software Developer'],
+            preferences=preferences
+        )
+
+    def resume_analysis(inputs):
+        return method('analyze_resume_gaps')(
+            skills_by_category=skills_by_category,
+            preferences=preferences,
+            extracted_text=clean_text
+        )
+
+    def learning_path(inputs):
+        career_recs = inputs['career_recommendations']
+        top_role = career_recs.get('recommended_roles', [{}])[0].get('title', 'Software Developer') if career_recs else 'Software Developer'
+        return method('generate_learning_path')(
+            current_skills=skills,
+            target_role=top_role,
+            learning_preference="balanced"
+        )
+
+    return [
+        Stage('career_recommendations', career_recommendations),
+        Stage('resume_analysis', resume_analysis),
+        Stage('skill_improvements', skill_improvements, depends=['career_recommendations']),
+        Stage('learning_path', learning_path, depends=['career_recommendations'])
+    ]
+
+
+class AIOperation:
+    """
+    One /ai/<operation> endpoint: the GeminiService method it calls, how the
+    method's arguments are read from the JSON body, and the key the result
+    is returned under. resume_fields names the body fields that can be
+    filled in from a stored resume instead, and how.
+    """
+
+    def __init__(self, method: str, result_key: str, arguments: Callable[[Dict[str, Any]], Dict[str, Any]],
+                 error_message: str, required: Optional[str] = None, missing_error: Optional[str] = None,
+                 resume_fields: Optional[Dict[str, Callable[[Dict[str, Any]], Any]]] = None):
+        self.method = method
+        self.result_key = result_key
+        self.arguments = arguments
+        self.error_message = error_message
+        self.required = required
+        self.missing_error = missing_error
+        self.resume_fields = resume_fields or {}
+
+    def with_resume(self, data: Dict[str, Any], resume: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        The request body with the fields it leaves out taken from a stored
+        resume (see ResumeStore.get); fields sent inline take precedence
+        """
+        merged = dict(data)
+        for field, value in self.resume_fields.items():
+            if not merged.get(field):
+                merged[field] = value(resume)
+        return merged
+
+    def validate(self, data: Dict[str, Any]) -> Optional[str]:
+        """The error for a request body missing its required field, or None"""
+        if self.required and not data.get(self.required):
+            return self.missing_error
+        return None
+
+    def call(self, gemini_service, data: Dict[str, Any]) -> Dict[str, Any]:
+        result = getattr(gemini_service, self.method)(**self.arguments(data))
+        return {'success': True, self.result_key: result}
+
+    async def call_async(self, gemini_service, data: Dict[str, Any]) -> Dict[str, Any]:
+        result = await getattr(gemini_service, self.method + '_async')(**self.arguments(data))
+        return {'success': True, self.result_key: result}
+
+
+def _resume_skills(resume):
+    return resume['basic_info'].get('skills', [])
+
+
+def _resume_skills_by_category(resume):
+    return resume['basic_info'].get('skills_summary', {})
+
+
+AI_OPERATIONS = {
+    'career-recommendations': AIOperation(
+        'generate_career_recommendations', 'recommendations',
+        lambda data: {
+            'skills_by_category': data.get('skills_by_category', {}),
+            'preferences': data.get('preferences', {}),
+            'experience_level': data.get('experience_level', 'intermediate')
+        },
+        'Error generating recommendations',
+        resume_fields={'skills_by_category': _resume_skills_by_category}
+    ),
+    'skill-analysis': AIOperation(
+        'suggest_skill_improvements', 'analysis',
+        lambda data: {
+            'current_skills': data.get('current_skills', []),
+            'target_roles': data.get('target_roles', []),
+            'preferences': data.get('preferences', {})
+        },
+        'Error analyzing skills',
+        resume_fields={'current_skills': _resume_skills}
+    ),
+    'resume-analysis': AIOperation(
+        'analyze_resume_gaps', 'analysis',
+        lambda data: {
+            'skills_by_category': data.get('skills_by_category', {}),
+            'preferences': data.get('preferences', {}),
+            'extracted_text': data.get('resume_text', '')
+        },
+        'Error analyzing resume',
+        required='resume_text', missing_error='Resume text is required',
+        resume_fields={
+            'skills_by_category': _resume_skills_by_category,
+            'resume_text': lambda resume: resume['clean_text']
+        }
+    ),
+    'learning-path': AIOperation(
+        'generate_learning_path', 'learning_path',
+        lambda data: {
+            'current_skills': data.get('current_skills', []),
+            'target_role': data.get('target_role', ''),
+            'learning_preference': data.get('learning_preference', 'balanced')
+        },
+        'Error generating learning path',
+        required='target_role', missing_error='Target role is required',
+        resume_fields={'current_skills': _resume_skills}
+    )
+}
@@ -0,0 +1,211 @@
+"""
+Batch resume extraction
+Expands uploads (including zip archives) into individual resumes as they
+are needed and runs them through the extraction pipeline on the process pool
+"""
+
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from utils.extraction_cache import ExtractionCache
+from utils.resume_extractor import get_extractor_version, submit_resume_analysis
+
+RESUME_EXTENSIONS = ['.pdf', '.docx', '.doc']
+
+
+class BatchLimitError(ValueError):
+    """Raised when a batch or an archive in it exceeds the configured limits"""
+
+
+class BatchItem:
+    """
+    One resume in a batch. Items that could not be read carry an error
+    instead of data and are reported without being analyzed. data is
+    released once the item has been analyzed.
+    """
+
+    def __init__(self, index: int, filename: str, data: Optional[bytes] = None, error: Optional[str] = None):
+        self.index = index
+        self.filename = filename
+        self.data = data
+        self.error = error
+
+
+def iter_zip_archive(stream, max_files: int, max_file_bytes: int, max_total_bytes: int,
+                     max_ratio: float) -> Iterator[Tuple[str, Optional[bytes], Optional[str]]]:
+    """
+    Yield the resumes in a zip archive as (name, data, error) tuples,
+    decompressing one member at a time.
+
+    Raises BatchLimitError when the archive holds more than max_files
+    resumes, or when its declared uncompressed size or compression ratio
+    suggests a zip bomb. Sizes are enforced again while reading, since
+    the sizes in the archive's directory can be forged.
+    """
+    try:
+        archive = zipfile.ZipFile(stream)
+    except (zipfile.BadZipFile, OSError) as e:
+        raise BatchLimitError(f"Invalid zip archive: {str(e)}")
+
+    with archive:
+        members = [
+            info for info in archive.infolist()
+            if not info.is_dir()
+            and not info.filename.startswith('__MACOSX/')
+            and not os.path.basename(info.filename).startswith('.')
+        ]
+        if len(members) > max_files:
+            raise BatchLimitError(f"Archive contains {len(members)} files; the limit is {max_files}")
+
+        declared_total = sum(info.file_size for info in members)
+        if declared_total > max_total_bytes:
+            raise BatchLimitError(f"Archive expands to {declared_total} bytes; the limit is {max_total_bytes}")
+
+        total_read = 0
+        for info in members:
+            name = info.filename
+            if os.path.splitext(name)[1].lower() not in RESUME_EXTENSIONS:
+                yield name, None, f"Unsupported file format. Allowed: {', '.join(RESUME_EXTENSIONS)}"
+                continue
+            if info.file_size > max_file_bytes:
+                yield name, None, f"File is larger than {max_file_bytes} bytes"
+                continue
+            if info.compress_size and info.file_size / info.compress_size > max_ratio:
+                raise BatchLimitError(f"Compression ratio of {name} exceeds {max_ratio}")
+
+            try:
+                with archive.open(info) as member:
+                    data = member.read(max_file_bytes + 1)
+            except (zipfile.BadZipFile, OSError, RuntimeError, NotImplementedError) as e:
+                yield name, None, f"Could not read file from archive: {str(e)}"
+                continue
+
+            if len(data) > max_file_bytes:
+                raise BatchLimitError(f"{name} expands beyond its declared size")
+            total_read += len(data)
+            if total_read > max_total_bytes:
+                raise BatchLimitError(f"Archive expands beyond {max_total_bytes} bytes")
+            yield name, data, None
+
+
+def iter_batch_items(uploads: Iterable[Tuple[str, object]], max_files: int, max_file_bytes: int,
+                     max_archive_bytes: int, max_ratio: float,
+                     max_total_bytes: Optional[int] = None) -> Iterator[BatchItem]:
+    """
+    Turn (filename, stream) uploads into BatchItems lazily, expanding zip
+    archives member by member, so only the resumes being analyzed are held
+    in memory. An archive that breaks its limits ends with a failed item
+    for the archive. Once the batch holds max_files resumes, or a resume
+    would take the data read past max_total_bytes, a failed item reports
+    it and the rest of the batch is skipped.
+    """
+    index = 0
+    total_bytes = 0
+
+    def make_item(filename, data=None, error=None):
+        nonlocal index
+        index += 1
+        return BatchItem(index - 1, filename, data, error)
+
+    for filename, stream in uploads:
+        filename = filename or ''
+        extension = os.path.splitext(filename)[1].lower()
+
+        if extension == '.zip':
+            resumes = iter_zip_archive(stream, max_files, max_file_bytes, max_archive_bytes, max_ratio)
+        elif extension in RESUME_EXTENSIONS:
+            data = stream.read(max_file_bytes + 1)
+            if len(data) > max_file_bytes:
+                resumes = [(filename, None, f"File is larger than {max_file_bytes} bytes")]
+            else:
+                resumes = [(filename, data, None)]
+        else:
+            resumes = [(filename, None, f"Unsupported file format. Allowed: {', '.join(RESUME_EXTENSIONS + ['.zip'])}")]
+
+        try:
+            for name, data, error in resumes:
+                if index >= max_files:
+                    yield make_item(name, error=f"Batch contains more than {max_files} files; the rest were skipped")
+                    return
+                if data is not None and max_total_bytes is not None and total_bytes + len(data) > max_total_bytes:
+                    yield make_item(name, error=f"Batch expands beyond {max_total_bytes} bytes; the rest were skipped")
+                    return
+                total_bytes += len(data) if data is not None else 0
+                yield make_item(name, data, error)
+        except BatchLimitError as e:
+            yield make_item(filename, error=str(e))
+
+
+def iter_batch_analyses(items: Iterable[BatchItem], cache: Optional[ExtractionCache] = None, max_in_flight: int = 8,
+                        submit: Callable[[bytes, str], Future] = submit_resume_analysis
+                        ) -> Iterator[Tuple[BatchItem, Optional[dict], bool, Optional[str]]]:
+    """
+    Analyze a batch and yield (item, analysis, cached, error) for every
+    item as soon as it finishes, so results arrive in completion order.
+
+    Items are pulled from the iterable only while fewer than max_in_flight
+    resumes are queued, so a lazy iterable (see iter_batch_items) keeps at
+    most that many in memory. Cache hits and unreadable items are yielded
+    as they are pulled, without touching the pool. Queued work is
+    cancelled if the consumer stops early (e.g. the client went away). A
+    resume whose worker crashed is retried once on a fresh pool before it
+    is reported as failed. submit(data, filename) starts one analysis and
+    returns its Future; it defaults to the extraction process pool.
+    """
+    version = get_extractor_version()
+    items = iter(items)
+    exhausted = False
+    retries = []
+    in_flight = {}
+    try:
+        while True:
+            while len(in_flight) < max_in_flight and (retries or not exhausted):
+                if retries:
+                    item, key, attempt = retries.pop(0)
+                else:
+                    item = next(items, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    if item.error:
+                        yield item, None, False, item.error
+                        continue
+                    key = ExtractionCache.make_key(item.data, os.path.splitext(item.filename)[1], version)
+                    analysis = cache.get(key) if cache is not None else None
+                    if analysis is not None:
+                        item.data = None
+                        yield item, analysis, True, None
+                        continue
+                    attempt = 0
+                in_flight[submit(item.data, item.filename)] = (item, key, attempt)
+
+            if not in_flight:
+                return
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                item, key, attempt = in_flight.pop(future)
+                try:
+                    analysis = future.result()
+                except BrokenProcessPool as e:
+                    if attempt == 0:
+                        retries.append((item, key, attempt + 1))
+                        continue
+                    item.data = None
+                    yield item, None, False, f"Extraction worker crashed: {str(e)}"
+                    continue
+                except Exception as e:
+                    item.data = None
+                    yield item, None, False, str(e)
+                    continue
+
+                item.data = None
+                if cache is not None and analysis['raw_text']:
+                    cache.put(key, analysis)
+                yield item, analysis, False, None
+    finally:
+        for future in in_flight:
+            future.cancel()
@@ -0,0 +1,70 @@
+"""
+Response compression
+gzip or brotli encoding of buffered responses above a size threshold,
+negotiated from the request's Accept-Encoding header
+"""
+
+import gzip
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # optional dependency: only gzip is offered
+    brotli = None
+
+COMPRESSIBLE_MIMETYPES = {'application/json', 'text/plain', 'text/html'}
+
+# Status codes whose body must not be re-encoded
+_SKIP_STATUSES = {204, 206, 304}
+
+
+class ResponseCompressor:
+    """
+    Compresses response bodies of at least min_size bytes. Brotli is
+    preferred when the client accepts it and the brotli package is
+    installed, gzip otherwise. The defaults favour speed over ratio,
+    since bodies are compressed on every request.
+    """
+
+    def __init__(self, min_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.min_size = min_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.encodings = ['br', 'gzip'] if brotli is not None else ['gzip']
+
+    def choose_encoding(self, accept_encodings) -> Optional[str]:
+        """The encoding to use for a werkzeug Accept-Encoding value, or None"""
+        return accept_encodings.best_match(self.encodings)
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        if encoding == 'br':
+            return brotli.compress(data, quality=self.brotli_quality)
+        return gzip.compress(data, compresslevel=self.gzip_level, mtime=0)
+
+    def is_candidate(self, response) -> bool:
+        """Whether a response's status, type and headers allow re-encoding it"""
+        return (200 <= response.status_code and response.status_code not in _SKIP_STATUSES
+                and response.mimetype in COMPRESSIBLE_MIMETYPES
+                and 'Content-Encoding' not in response.headers)
+
+    def encode(self, response, data: bytes, accept_encodings) -> None:
+        """Replace the body of response (already read as data) with its compressed form if worthwhile"""
+        if len(data) < self.min_size:
+            return
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose_encoding(accept_encodings)
+        if encoding is None:
+            return
+        response.set_data(self.compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+
+    def apply(self, response, accept_encodings):
+        """
+        Compress a Flask response in place. Streamed responses (SSE,
+        NDJSON batches) are left alone so every chunk still reaches the
+        client as soon as it is produced.
+        """
+        if response.direct_passthrough or response.is_streamed or not self.is_candidate(response):
+            return response
+        self.encode(response, response.get_data(), accept_encodings)
+        return response
@@ -0,0 +1,116 @@
+"""
+Content-addressed cache for resume extraction results
+Keys are derived from the upload bytes, so repeat uploads skip parsing entirely
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class ExtractionCache:
+    """
+    Bounded in-memory LRU of extraction results with optional on-disk
+    persistence. Cached values are shared between requests and must be
+    treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 256, persist_dir: Optional[str] = None):
+        self.max_entries = max(0, max_entries)
+        self.persist_dir = persist_dir
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.persist_dir:
+            os.makedirs(self.persist_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(data: bytes, file_type: str, version: str) -> str:
+        """Build a cache key from the file bytes, its type and the extractor version"""
+        digest = hashlib.sha256(data).hexdigest()
+        return f"{digest}-{file_type.lstrip('.').lower() or 'bin'}-{version}"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        value = self._read_from_disk(key)
+
+        with self._lock:
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, value)
+        return value
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._store(key, value)
+        self._write_to_disk(key, value)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'persistent': bool(self.persist_dir)
+            }
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _store(self, key: str, value: Dict[str, Any]) -> None:
+        if not self.max_entries:
+            return
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.persist_dir, key[:2], f"{key}.json")
+
+    def _read_from_disk(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.persist_dir:
+            return None
+        try:
+            with open(self._disk_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning("Could not read cached extraction %s: %s", key, e)
+            return None
+
+    def _write_to_disk(self, key: str, value: Dict[str, Any]) -> None:
+        if not self.persist_dir:
+            return
+        path = self._disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write to a temp file and rename so readers never see partial JSON
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(value, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning("Could not persist cached extraction %s: %s", key, e)
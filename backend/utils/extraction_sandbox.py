@@ -0,0 +1,257 @@
+"""
+Sandboxed extraction workers
+Runs resume parsing in recycled subprocesses with memory, CPU-time and
+wall-clock limits, so a hostile document cannot take the web server down
+"""
+
+import multiprocessing
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from utils.resume_extractor import PDF_BACKEND_MODULES
+
+try:
+    import resource
+except ImportError:  # Windows: limits other than the wall-clock deadline are unavailable
+    resource = None
+
+
+class ExtractionSandboxError(Exception):
+    """
+    Raised when a sandboxed task does not produce a result. reason is one
+    of 'timeout', 'memory_limit', 'cpu_limit', 'worker_crashed', 'busy' or
+    'failed'.
+    """
+
+    def __init__(self, reason: str, message: str):
+        super().__init__(message)
+        self.reason = reason
+
+
+class _CpuLimitExceeded(BaseException):
+    # BaseException, so the extractors' broad "except Exception" handlers
+    # cannot swallow it
+    pass
+
+
+def _raise_cpu_limit(signum, frame):
+    raise _CpuLimitExceeded()
+
+
+def _set_cpu_budget(cpu_seconds):
+    soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if cpu_seconds:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        soft = int(usage.ru_utime + usage.ru_stime + cpu_seconds) + 1
+        if hard != resource.RLIM_INFINITY:
+            soft = min(soft, hard)
+    else:
+        soft = hard
+    # Only the soft limit moves: an unprivileged process cannot raise a
+    # hard limit again once lowered
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _worker_main(conn, memory_limit_bytes, cpu_seconds, max_tasks):
+    """
+    Worker loop: run up to max_tasks (func, args) tasks from conn and send
+    back ('ok', result) or ('error', reason, message). A worker that hit a
+    limit exits after reporting it, since its state can no longer be trusted.
+    """
+    if resource is not None:
+        if memory_limit_bytes:
+            _, hard = resource.getrlimit(resource.RLIMIT_AS)
+            resource.setrlimit(resource.RLIMIT_AS, (memory_limit_bytes, hard))
+        signal.signal(signal.SIGXCPU, _raise_cpu_limit)
+
+    for _ in range(max_tasks):
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            return
+        if task is None:
+            return
+
+        func, args = task
+        limit_hit = False
+        try:
+            if resource is not None:
+                _set_cpu_budget(cpu_seconds)
+            reply = ('ok', func(*args))
+        except MemoryError:
+            reply = ('error', 'memory_limit', 'Extraction exceeded its memory limit')
+            limit_hit = True
+        except _CpuLimitExceeded:
+            reply = ('error', 'cpu_limit', 'Extraction exceeded its CPU time limit')
+            limit_hit = True
+        except Exception as e:
+            reply = ('error', 'failed', f"Extraction failed: {str(e)}")
+        finally:
+            if resource is not None:
+                _set_cpu_budget(None)
+
+        try:
+            conn.send(reply)
+        except MemoryError:
+            conn.send(('error', 'memory_limit', 'Extraction result exceeded the memory limit'))
+            limit_hit = True
+        if limit_hit:
+            return
+
+
+class _Worker:
+    def __init__(self, context, memory_limit_bytes, cpu_seconds, max_tasks):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, memory_limit_bytes, cpu_seconds, max_tasks),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.tasks = 0
+        self.max_tasks = max_tasks
+
+    @property
+    def exhausted(self):
+        return self.tasks >= self.max_tasks or not self.process.is_alive()
+
+    def stop(self, kill=False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ExtractionSandbox:
+    """
+    A pool of subprocess workers that run one task at a time. Each worker
+    runs with an address-space limit (RLIMIT_AS) and a per-task CPU-time
+    budget (RLIMIT_CPU), and is killed if a task outlives the wall-clock
+    timeout. Workers are replaced after max_tasks_per_worker tasks, and
+    immediately after any limit is hit.
+    """
+
+    def __init__(self, workers: int = 2, max_tasks_per_worker: int = 50, memory_limit_mb: Optional[int] = 1024,
+                 cpu_seconds: Optional[float] = 30, timeout: Optional[float] = 60):
+        self.workers = max(1, workers)
+        self.max_tasks_per_worker = max(1, max_tasks_per_worker)
+        self.memory_limit_bytes = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self.cpu_seconds = cpu_seconds
+        self.timeout = timeout
+        self._context = multiprocessing.get_context('forkserver')
+        self._context.set_forkserver_preload(['utils.resume_extractor'] + PDF_BACKEND_MODULES)
+        self._idle = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.workers)
+        self._executor = None
+        self._counts = {
+            'tasks': 0, 'timeout': 0, 'memory_limit': 0, 'cpu_limit': 0,
+            'worker_crashed': 0, 'failed': 0, 'busy': 0, 'workers_started': 0
+        }
+
+    def run(self, func: Callable, *args) -> Any:
+        """
+        Run func(*args) in a sandboxed worker and return its result.
+        func and its arguments must be picklable. Raises
+        ExtractionSandboxError if the task fails or hits a limit.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            self._count('busy')
+            raise ExtractionSandboxError('busy', 'All extraction workers are busy')
+        try:
+            worker = self._checkout()
+            try:
+                reply = self._call(worker, func, args)
+            except ExtractionSandboxError:
+                worker.stop(kill=True)
+                raise
+            if reply[0] == 'error' and reply[1] in ('memory_limit', 'cpu_limit'):
+                # The worker exits after reporting a limit
+                worker.stop()
+            else:
+                self._checkin(worker)
+        finally:
+            self._slots.release()
+
+        self._count('tasks')
+        if reply[0] == 'ok':
+            return reply[1]
+        self._count(reply[1])
+        raise ExtractionSandboxError(reply[1], reply[2])
+
+    def submit(self, func: Callable, *args):
+        """Run func(*args) in the sandbox from a background thread; returns a Future"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='sandbox')
+        return self._executor.submit(self.run, func, *args)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counts, idle_workers=len(self._idle), workers=self.workers)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+        for worker in idle:
+            worker.stop()
+
+    def _count(self, key):
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def _checkout(self):
+        with self._lock:
+            while self._idle:
+                worker = self._idle.pop()
+                if not worker.exhausted:
+                    return worker
+                worker.stop()
+            self._counts['workers_started'] += 1
+        return _Worker(self._context, self.memory_limit_bytes, self.cpu_seconds, self.max_tasks_per_worker)
+
+    def _checkin(self, worker):
+        if worker.exhausted:
+            # Recycled: it has reached its task budget or exited after a limit
+            worker.stop()
+            return
+        with self._lock:
+            self._idle.append(worker)
+
+    def _call(self, worker, func, args):
+        try:
+            worker.conn.send((func, args))
+        except (OSError, ValueError) as e:
+            self._count('worker_crashed')
+            raise ExtractionSandboxError('worker_crashed', f"Could not reach extraction worker: {str(e)}")
+        worker.tasks += 1
+
+        # poll() also returns when the worker dies, since EOF is readable
+        if not worker.conn.poll(self.timeout):
+            self._count('timeout')
+            raise ExtractionSandboxError('timeout', f"Extraction did not finish within {self.timeout}s")
+
+        try:
+            return worker.conn.recv()
+        except (EOFError, OSError):
+            worker.process.join(timeout=1)
+            exit_code = worker.process.exitcode
+            reason = 'worker_crashed'
+            if exit_code is not None and exit_code < 0 and -exit_code == getattr(signal, 'SIGXCPU', None):
+                reason = 'cpu_limit'
+            self._count(reason)
+            raise ExtractionSandboxError(reason, f"Extraction worker exited with code {exit_code}")
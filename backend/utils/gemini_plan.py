@@ -12,9 +12,11 @@ import re
 
 from dotenv import load_dotenv
 
-# Configure logging to use stderr for logs
+# Logs go to stderr as structured lines; stdout carries only the JSON result
 import logging
-logging.basicConfig(stream=sys.stderr, level=logging.INFO)
+from structured_logging import configure_logging
+load_dotenv()
+configure_logging()
 logger = logging.getLogger(__name__)
 
 # LangChain + LangGraph imports
@@ -64,7 +66,7 @@ if GEMINI_API_KEY:
         )
         logger.info("Using Gemini 1.5 Flash model")
     except Exception as e:
-        logger.error(f"Failed to load gemini-1.5-flash: {e}")
+        logger.error("Failed to load gemini-1.5-flash: %s", e)
         try:
             gemini_model = ChatGoogleGenerativeAI(
                 model="gemini-1.5-pro",
@@ -73,7 +75,7 @@ if GEMINI_API_KEY:
             )
             logger.info("Using Gemini 1.5 Pro model")
         except Exception as e2:
-            logger.error(f"Failed to load gemini-1.5-pro: {e2}")
+            logger.error("Failed to load gemini-1.5-pro: %s", e2)
             # Final fallback
             try:
                 gemini_model = ChatGoogleGenerativeAI(
@@ -83,7 +85,7 @@ if GEMINI_API_KEY:
                 )
                 logger.info("Using Gemini Pro model")
             except Exception as e3:
-                logger.error(f"Failed to load any Gemini model: {e3}")
+                logger.error("Failed to load any Gemini model: %s", e3)
 else:
     logger.error("No Gemini API key found, model will not be available")
 
@@ -180,7 +182,7 @@ def generate_career_recommendations(state: CareerState) -> CareerState:
     
     try:
         # Log that we're invoking the model
-        logger.info(f"Invoking Gemini model for career recommendations")
+        logger.info("Invoking Gemini model for career recommendations")
         resp = gemini_model.invoke(prompt)
         
         if resp is None:
@@ -189,7 +191,7 @@ def generate_career_recommendations(state: CareerState) -> CareerState:
         content = resp.content
         
         # Log the response size for debugging
-        logger.info(f"Model response received, length: {len(content)}")
+        logger.info("Model response received, length: %s", len(content))
         
         # Try to extract JSON from the response
         json_match = re.search(r'\{[\s\S]*\}', content)
@@ -205,7 +207,7 @@ def generate_career_recommendations(state: CareerState) -> CareerState:
         
         state["career_plan"] = career_plan
     except Exception as e:
-        logger.error(f"Error parsing career recommendations: {str(e)}")
+        logger.error("Error parsing career recommendations: %s", e)
         state["career_plan"] = generate_fallback_plan(state)
     
     return state
@@ -224,7 +226,7 @@ def generate_learning_path(state: CareerState) -> CareerState:
     
     try:
         # Log that we're invoking the model
-        logger.info(f"Invoking Gemini model for learning path")
+        logger.info("Invoking Gemini model for learning path")
         resp = gemini_model.invoke(prompt)
         
         if resp is None:
@@ -233,7 +235,7 @@ def generate_learning_path(state: CareerState) -> CareerState:
         content = resp.content
         
         # Log the response size for debugging
-        logger.info(f"Learning path response received, length: {len(content)}")
+        logger.info("Learning path response received, length: %s", len(content))
         
         # Try to extract JSON from the response
         json_match = re.search(r'\{[\s\S]*\}', content)
@@ -247,7 +249,7 @@ def generate_learning_path(state: CareerState) -> CareerState:
         
         state["learning_path"] = learning_path
     except Exception as e:
-        logger.error(f"Error parsing learning path: {str(e)}")
+        logger.error("Error parsing learning path: %s", e)
         state["learning_path"] = {"error": "Failed to parse learning path"}
     
     return state
@@ -346,7 +348,7 @@ def build_career_graph():
         # Compile graph
         return graph_builder.compile()
     except Exception as e:
-        logger.error(f"Error building career graph: {str(e)}")
+        logger.error("Error building career graph: %s", e)
         # Return None so we can handle it gracefully
         return None
 
@@ -390,7 +392,7 @@ def generate_career_plan(current_skills, target_job, timeframe_months):
             final_state = career_graph.invoke(input_state)
             logger.info("LangGraph execution completed")
         except Exception as graph_error:
-            logger.error(f"Error executing LangGraph: {str(graph_error)}")
+            logger.error("Error executing LangGraph: %s", graph_error)
             # Use fallback plan on graph execution error
             fallback_state = CareerState(
                 current_skills=current_skills,
@@ -434,7 +436,7 @@ def generate_career_plan(current_skills, target_job, timeframe_months):
         
         return result
     except Exception as e:
-        logger.error(f"Error in generate_career_plan: {str(e)}")
+        logger.error("Error in generate_career_plan: %s", e)
         # Return fallback result
         skills_text = ", ".join(current_skills) if current_skills else "various skills"
         return {
@@ -454,7 +456,7 @@ if __name__ == "__main__":
         target_job = sys.argv[2]
         timeframe_months = int(sys.argv[3])
         
-        logger.info(f"Generating career plan for {target_job} with timeframe {timeframe_months} months")
+        logger.info("Generating career plan for %s with timeframe %s months", target_job, timeframe_months)
         
         # Generate plan
         result = generate_career_plan(current_skills, target_job, timeframe_months)
@@ -462,7 +464,7 @@ if __name__ == "__main__":
         # Output as JSON - this is the only output that should go to stdout
         print(json.dumps(result))
     except Exception as e:
-        logger.error(f"Error in main: {str(e)}")
+        logger.error("Error in main: %s", e)
         # Error response also goes to stdout but as properly formatted JSON
         print(json.dumps({"error": str(e)}))
         sys.exit(1)
@@ -3,16 +3,21 @@ Gemini AI Service for Career Navigation
 Handles AI-powered career recommendations and insights
 """
 
-import google.generativeai as genai
 import os
 import json
 import atexit
+import logging
 from typing import Dict, List, Any, Optional
 from dotenv import load_dotenv
 
+from utils.metrics import GEMINI_COALESCED, GEMINI_FALLBACKS, GEMINI_PARSE_FAILURES, timed
+from utils.singleflight import SingleFlight, coalescing_key
+
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Gracefully handle gRPC shutdown
 def _cleanup_grpc():
     """Cleanup function to properly shut down gRPC connections"""
@@ -26,22 +31,41 @@ def _cleanup_grpc():
 atexit.register(_cleanup_grpc)
 
 class GeminiService:
-    def __init__(self):
+    def __init__(self, coalesce: bool = True, request_timeout: Optional[float] = None):
+        # With coalesce, concurrent calls with the same normalized
+        # arguments share a single Gemini request
+        self.inflight = SingleFlight() if coalesce else None
         self.api_key = os.getenv('GEMINI_API_KEY')
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found in environment variables")
         
+        # Imported here: the SDK takes around a second to import and is only
+        # needed once the first AI request arrives
+        import google.generativeai as genai
+        from google.api_core import exceptions, retry, retry_async
         genai.configure(api_key=self.api_key)
+
+        # The client's defaults allow a call 600s plus retries for another
+        # 600s; request_timeout bounds each generation, retries included, so
+        # an abandoned call cannot hold its caller's thread for that long
+        self.request_options = self.async_request_options = {}
+        if request_timeout:
+            backoff = dict(predicate=retry.if_exception_type(exceptions.ServiceUnavailable),
+                           initial=1.0, maximum=10.0, multiplier=1.3, timeout=request_timeout)
+            self.request_options = {'timeout': request_timeout, 'retry': retry.Retry(**backoff)}
+            self.async_request_options = {'timeout': request_timeout, 'retry': retry_async.AsyncRetry(**backoff)}
+
         # Use gemini-2.0-flash model which is stable and widely available
         # Fallback to gemini-pro-latest if needed
         try:
             self.model = genai.GenerativeModel('gemini-2.0-flash')
-            print("Using Gemini 2.0 Flash model")
+            logger.info("Using Gemini 2.0 Flash model")
         except Exception as e:
-            print(f"Failed to load gemini-2.0-flash: {e}, falling back to gemini-pro-latest")
+            logger.warning("Failed to load gemini-2.0-flash: %s, falling back to gemini-pro-latest", e)
             self.model = genai.GenerativeModel('gemini-pro-latest')
-            print("Using Gemini Pro Latest model")
+            logger.info("Using Gemini Pro Latest model")
     
+    @timed('gemini_generate_career_recommendations')
     def generate_career_recommendations(self, 
                                       skills_by_category: Dict[str, List[str]], 
                                       preferences: Dict[str, str],
@@ -53,13 +77,11 @@ class GeminiService:
             skills_by_category, preferences, experience_level
         )
         
-        try:
-            response = self.model.generate_content(prompt)
-            return self._parse_career_response(response.text)
-        except Exception as e:
-            print(f"Error generating career recommendations: {str(e)}")
-            return self._get_fallback_recommendations()
+        return self._generate('career_recommendations', (skills_by_category, preferences, experience_level),
+                              prompt, self._parse_career_response, self._get_fallback_recommendations,
+                              "Error generating career recommendations")
     
+    @timed('gemini_suggest_skill_improvements')
     def suggest_skill_improvements(self, 
                                  current_skills: List[str],
                                  target_roles: List[str],
@@ -71,13 +93,11 @@ class GeminiService:
             current_skills, target_roles, preferences
         )
         
-        try:
-            response = self.model.generate_content(prompt)
-            return self._parse_skill_response(response.text)
-        except Exception as e:
-            print(f"Error generating skill suggestions: {str(e)}")
-            return self._get_fallback_skills()
+        return self._generate('skill_improvements', (current_skills, target_roles, preferences),
+                              prompt, self._parse_skill_response, self._get_fallback_skills,
+                              "Error generating skill suggestions")
     
+    @timed('gemini_analyze_resume_gaps')
     def analyze_resume_gaps(self,
                            skills_by_category: Dict[str, List[str]],
                            preferences: Dict[str, str],
@@ -89,13 +109,11 @@ class GeminiService:
             skills_by_category, preferences, extracted_text
         )
         
-        try:
-            response = self.model.generate_content(prompt)
-            return self._parse_analysis_response(response.text)
-        except Exception as e:
-            print(f"Error analyzing resume: {str(e)}")
-            return self._get_fallback_analysis()
+        return self._generate('resume_analysis', (skills_by_category, preferences, extracted_text),
+                              prompt, self._parse_analysis_response, self._get_fallback_analysis,
+                              "Error analyzing resume")
     
+    @timed('gemini_generate_learning_path')
     def generate_learning_path(self,
                              current_skills: List[str],
                              target_role: str,
@@ -107,13 +125,109 @@ class GeminiService:
             current_skills, target_role, learning_preference
         )
         
-        try:
-            response = self.model.generate_content(prompt)
-            return self._parse_learning_response(response.text)
-        except Exception as e:
-            print(f"Error generating learning path: {str(e)}")
-            return self._get_fallback_learning_path()
+        return self._generate('learning_path', (current_skills, target_role, learning_preference),
+                              prompt, self._parse_learning_response, self._get_fallback_learning_path,
+                              "Error generating learning path")
     
+    def ping(self, timeout: float = 10) -> None:
+        """
+        Cheap availability check for health probes: a one-token generation.
+        Unlike the generate methods it raises on failure instead of
+        returning fallback content.
+        """
+        self.model.generate_content(
+            "ping",
+            generation_config={'max_output_tokens': 1, 'temperature': 0},
+            # No client-side retries: a probe should report a failure, not
+            # keep retrying it for minutes
+            request_options={'timeout': timeout, 'retry': None}
+        )
+
+    # Async variants for the ASGI server: the same prompts and parsing, but
+    # the request is awaited on the event loop instead of blocking a thread
+
+    @timed('gemini_generate_career_recommendations')
+    async def generate_career_recommendations_async(self,
+                                                    skills_by_category: Dict[str, List[str]],
+                                                    preferences: Dict[str, str],
+                                                    experience_level: str = "intermediate") -> Dict[str, Any]:
+        prompt = self._build_career_recommendation_prompt(
+            skills_by_category, preferences, experience_level
+        )
+        return await self._generate_async('career_recommendations', (skills_by_category, preferences, experience_level),
+                                          prompt, self._parse_career_response, self._get_fallback_recommendations,
+                                          "Error generating career recommendations")
+
+    @timed('gemini_suggest_skill_improvements')
+    async def suggest_skill_improvements_async(self,
+                                               current_skills: List[str],
+                                               target_roles: List[str],
+                                               preferences: Dict[str, str]) -> Dict[str, Any]:
+        prompt = self._build_skill_improvement_prompt(
+            current_skills, target_roles, preferences
+        )
+        return await self._generate_async('skill_improvements', (current_skills, target_roles, preferences),
+                                          prompt, self._parse_skill_response, self._get_fallback_skills,
+                                          "Error generating skill suggestions")
+
+    @timed('gemini_analyze_resume_gaps')
+    async def analyze_resume_gaps_async(self,
+                                        skills_by_category: Dict[str, List[str]],
+                                        preferences: Dict[str, str],
+                                        extracted_text: str) -> Dict[str, Any]:
+        prompt = self._build_resume_analysis_prompt(
+            skills_by_category, preferences, extracted_text
+        )
+        return await self._generate_async('resume_analysis', (skills_by_category, preferences, extracted_text),
+                                          prompt, self._parse_analysis_response, self._get_fallback_analysis,
+                                          "Error analyzing resume")
+
+    @timed('gemini_generate_learning_path')
+    async def generate_learning_path_async(self,
+                                           current_skills: List[str],
+                                           target_role: str,
+                                           learning_preference: str = "balanced") -> Dict[str, Any]:
+        prompt = self._build_learning_path_prompt(
+            current_skills, target_role, learning_preference
+        )
+        return await self._generate_async('learning_path', (current_skills, target_role, learning_preference),
+                                          prompt, self._parse_learning_response, self._get_fallback_learning_path,
+                                          "Error generating learning path")
+
+    def _generate(self, name: str, arguments: tuple, prompt: str, parse, fallback,
+                  error_message: str) -> Dict[str, Any]:
+        def call():
+            try:
+                response = self.model.generate_content(prompt, request_options=self.request_options)
+                return parse(response.text)
+            except Exception as e:
+                logger.error("%s: %s", error_message, e)
+                return fallback()
+
+        if self.inflight is None:
+            return call()
+        result, shared = self.inflight.do(coalescing_key(name, arguments), call)
+        if shared:
+            GEMINI_COALESCED.inc(response=name)
+        return result
+
+    async def _generate_async(self, name: str, arguments: tuple, prompt: str, parse, fallback,
+                              error_message: str) -> Dict[str, Any]:
+        async def call():
+            try:
+                response = await self.model.generate_content_async(prompt, request_options=self.async_request_options)
+                return parse(response.text)
+            except Exception as e:
+                logger.error("%s: %s", error_message, e)
+                return fallback()
+
+        if self.inflight is None:
+            return await call()
+        result, shared = await self.inflight.do_async(coalescing_key(name, arguments), call)
+        if shared:
+            GEMINI_COALESCED.inc(response=name)
+        return result
+
     def _build_career_recommendation_prompt(self, 
                                           skills_by_category: Dict[str, List[str]], 
                                           preferences: Dict[str, str],
@@ -342,6 +456,7 @@ Generate a learning path in this JSON format
             cleaned_response = self._clean_json_response(response_text)
             return json.loads(cleaned_response)
         except:
+            GEMINI_PARSE_FAILURES.inc(response='career_recommendations')
             return self._get_fallback_recommendations()
     
     def _parse_skill_response(self, response_text: str) -> Dict[str, Any]:
@@ -350,6 +465,7 @@ Generate a learning path in this JSON format
             cleaned_response = self._clean_json_response(response_text)
             return json.loads(cleaned_response)
         except:
+            GEMINI_PARSE_FAILURES.inc(response='skill_improvements')
             return self._get_fallback_skills()
     
     def _parse_analysis_response(self, response_text: str) -> Dict[str, Any]:
@@ -358,6 +474,7 @@ Generate a learning path in this JSON format
             cleaned_response = self._clean_json_response(response_text)
             return json.loads(cleaned_response)
         except:
+            GEMINI_PARSE_FAILURES.inc(response='resume_analysis')
             return self._get_fallback_analysis()
     
     def _parse_learning_response(self, response_text: str) -> Dict[str, Any]:
@@ -366,6 +483,7 @@ Generate a learning path in this JSON format
             cleaned_response = self._clean_json_response(response_text)
             return json.loads(cleaned_response)
         except:
+            GEMINI_PARSE_FAILURES.inc(response='learning_path')
             return self._get_fallback_learning_path()
     
     def _clean_json_response(self, response_text: str) -> str:
@@ -384,6 +502,7 @@ Generate a learning path in this JSON format
     
     def _get_fallback_recommendations(self) -> Dict[str, Any]:
         """Fallback career recommendations when AI fails"""
+        GEMINI_FALLBACKS.inc(response='career_recommendations')
         return {
             "recommended_roles": [
                 {
@@ -412,6 +531,7 @@ Generate a learning path in this JSON format
     
     def _get_fallback_skills(self) -> Dict[str, Any]:
         """Fallback skill suggestions when AI fails"""
+        GEMINI_FALLBACKS.inc(response='skill_improvements')
         return {
             "skill_gaps": [
                 {
@@ -438,6 +558,7 @@ Generate a learning path in this JSON format
     
     def _get_fallback_analysis(self) -> Dict[str, Any]:
         """Fallback resume analysis when AI fails"""
+        GEMINI_FALLBACKS.inc(response='resume_analysis')
         return {
             "overall_score": 65,
             "strengths": ["Technical skills present", "Experience documented"],
@@ -464,6 +585,7 @@ Generate a learning path in this JSON format
     
     def _get_fallback_learning_path(self) -> Dict[str, Any]:
         """Fallback learning path when AI fails"""
+        GEMINI_FALLBACKS.inc(response='learning_path')
         return {
             "learning_path": {
                 "total_duration": "3-6 months",
@@ -1,15 +1,23 @@
 import os
 import json
+import logging
 import re
 import sys
 import requests
 from dotenv import load_dotenv
 import google.generativeai as genai
 
+from structured_logging import configure_logging
+
 # -----------------------------------
 # Load Environment Variables
 # -----------------------------------
 load_dotenv()
+
+# Logs go to stderr as structured lines; stdout carries only the JSON result
+configure_logging()
+logger = logging.getLogger(__name__)
+
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 
@@ -17,9 +25,9 @@ YOUTUBE_API_KEY = os.getenv("YOUTUBE_API_KEY")
 if GEMINI_API_KEY:
     genai.configure(api_key=GEMINI_API_KEY)
     model = genai.GenerativeModel("gemini-2.0-flash")
-    print(f"DEBUG: Gemini model configured successfully", file=sys.stderr)
+    logger.debug("Gemini model configured successfully")
 else:
-    print(f"DEBUG: GEMINI_API_KEY not found in environment", file=sys.stderr)
+    logger.warning("GEMINI_API_KEY not found in environment")
     model = None
 
 # ===================================================================
@@ -72,10 +80,10 @@ def create_ai_career_timeline(current_skills, target_job, timeframe_months, addi
     """
 
     try:
-        print(f"DEBUG: Calling Gemini API with model: {model}", file=sys.stderr)
+        logger.debug("Calling Gemini API with model: %s", model)
         response = model.generate_content(prompt)
         raw_text = response.text
-        print(f"DEBUG: Raw response from Gemini API: {raw_text[:500]}", file=sys.stderr)
+        logger.debug("Raw response from Gemini API: %s", raw_text[:500])
         
         # Try to extract JSON from the response
         json_match = re.search(r"\{.*\}", raw_text, re.DOTALL)
@@ -84,22 +92,20 @@ def create_ai_career_timeline(current_skills, target_job, timeframe_months, addi
         else:
             result = json.loads(raw_text)
         
-        print(f"DEBUG: Parsed AI timeline result keys: {list(result.keys())}", file=sys.stderr)
+        logger.debug("Parsed AI timeline result keys: %s", list(result.keys()))
         
         # Always generate our own Mermaid chart from the timeline data for consistency
         # Don't rely on Gemini's mermaid_chart which may have syntax errors
         if "timeline" in result and result["timeline"]:
-            print(f"DEBUG: Generating mermaid_chart from timeline...", file=sys.stderr)
+            logger.debug("Generating mermaid_chart from timeline...")
             mermaid_chart = generate_mermaid_chart(target_job, result["timeline"])
             result["mermaid_chart"] = mermaid_chart
         else:
-            print(f"DEBUG: No timeline data to generate chart", file=sys.stderr)
+            logger.debug("No timeline data to generate chart")
         
         return result
     except Exception as e:
-        print(f"ERROR: Gemini generation failed: {e}", file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        logger.exception("Gemini generation failed: %s", e)
         return {"error": f"Gemini generation failed: {e}"}
 
 
@@ -116,7 +122,7 @@ def create_youtube_career_timeline(current_skills, target_job, timeframe_months,
 
     # Validate and convert language code
     language = validate_language_code(language)
-    print(f"DEBUG: Using validated language code: {language}", file=sys.stderr)
+    logger.debug("Using validated language code: %s", language)
 
     skills_text = ", ".join(current_skills) if current_skills else "various technical skills"
     
@@ -228,7 +234,7 @@ def validate_language_code(language):
         return lang_input
     
     # If invalid, default to English
-    print(f"DEBUG: Invalid language '{language}', defaulting to English (en)", file=sys.stderr)
+    logger.debug("Invalid language '%s', defaulting to English (en)", language)
     return "en"
 
 
@@ -309,15 +315,15 @@ def search_youtube_videos(search_terms, max_results=6, min_views=0, min_duration
     Fetch top YouTube videos for given search terms with views and duration.
     """
     if not YOUTUBE_API_KEY:
-        print(f"ERROR: YOUTUBE_API_KEY not set", file=sys.stderr)
+        logger.error("YOUTUBE_API_KEY not set")
         return []
 
-    print(f"DEBUG: search_youtube_videos called with {len(search_terms)} terms", file=sys.stderr)
+    logger.debug("search_youtube_videos called with %s terms", len(search_terms))
     all_videos = []
     
     for term in search_terms:
         try:
-            print(f"DEBUG: Searching YouTube for: '{term}' in language: {language}", file=sys.stderr)
+            logger.debug("Searching YouTube for: '%s' in language: %s", term, language)
             # First API call to get video IDs
             search_url = "https://www.googleapis.com/youtube/v3/search"
             search_params = {
@@ -336,14 +342,14 @@ def search_youtube_videos(search_terms, max_results=6, min_views=0, min_duration
             search_params = {k: v for k, v in search_params.items() if v is not None}
             
             resp = requests.get(search_url, search_params, timeout=10)
-            print(f"DEBUG: Search API response status: {resp.status_code} for term '{term}' in {language}", file=sys.stderr)
+            logger.debug("Search API response status: %s for term '%s' in %s", resp.status_code, term, language)
             if resp.status_code != 200:
-                print(f"ERROR: Search failed with status {resp.status_code}: {resp.text[:200]}", file=sys.stderr)
+                logger.error("Search failed with status %s: %s", resp.status_code, resp.text[:200])
                 continue
 
             data = resp.json()
             video_ids = [item["id"]["videoId"] for item in data.get("items", [])]
-            print(f"DEBUG: Found {len(video_ids)} video IDs for '{term}'", file=sys.stderr)
+            logger.debug("Found %s video IDs for '%s'", len(video_ids), term)
             
             if not video_ids:
                 continue
@@ -358,13 +364,13 @@ def search_youtube_videos(search_terms, max_results=6, min_views=0, min_duration
             }
             
             stats_resp = requests.get(stats_url, stats_params, timeout=10)
-            print(f"DEBUG: Stats API response status: {stats_resp.status_code}", file=sys.stderr)
+            logger.debug("Stats API response status: %s", stats_resp.status_code)
             if stats_resp.status_code != 200:
-                print(f"ERROR: Stats fetch failed: {stats_resp.text[:200]}", file=sys.stderr)
+                logger.error("Stats fetch failed: %s", stats_resp.text[:200])
                 continue
             
             stats_data = stats_resp.json()
-            print(f"DEBUG: Got {len(stats_data.get('items', []))} items with stats", file=sys.stderr)
+            logger.debug("Got %s items with stats", len(stats_data.get('items', [])))
             
             # Process and filter videos - STRICT LANGUAGE FILTER
             for item in stats_data.get("items", []):
@@ -383,7 +389,7 @@ def search_youtube_videos(search_terms, max_results=6, min_views=0, min_duration
                     
                     # If language info is available, strictly filter
                     if video_language and video_language != language.lower() and caption_language and caption_language != language.lower():
-                        print(f"DEBUG: [SKIP] Skipping video '{title[:40]}' - Language mismatch. Video: {video_language}, Target: {language}", file=sys.stderr)
+                        logger.debug("[SKIP] Skipping video '%s' - Language mismatch. Video: %s, Target: %s", title[:40], video_language, language, extra={'sample': True})
                         continue
                     
                     # Additional check: look for language keywords in title
@@ -392,12 +398,12 @@ def search_youtube_videos(search_terms, max_results=6, min_views=0, min_duration
                     
                     # Strict: If we have language info and it doesn't match, skip
                     if video_language and video_language != language.lower():
-                        print(f"DEBUG: [SKIP] Strict language filter: Video language {video_language} != {language}", file=sys.stderr)
+                        logger.debug("[SKIP] Strict language filter: Video language %s != %s", video_language, language, extra={'sample': True})
                         continue
                     
                     # Parse duration and convert to minutes
                     duration_minutes = parse_iso_duration_to_minutes(duration)
-                    print(f"DEBUG: Video '{title[:40]}' - Duration: {duration_minutes}m, Views: {views}, Language: {video_language}", file=sys.stderr)
+                    logger.debug("Video '%s' - Duration: %sm, Views: %s, Language: %s", title[:40], duration_minutes, views, video_language, extra={'sample': True})
                     
                     # Apply filters
                     if views >= min_views and duration_minutes >= min_duration_minutes:
@@ -412,18 +418,18 @@ def search_youtube_videos(search_terms, max_results=6, min_views=0, min_duration
                             "duration": duration_readable,
                             "views_raw": views
                         })
-                        print(f"DEBUG: [ADDED] Video added (Language: {video_language})", file=sys.stderr)
+                        logger.debug("[ADDED] Video added (Language: %s)", video_language, extra={'sample': True})
                     else:
-                        print(f"DEBUG: [SKIP] Filtered out - Duration: {duration_minutes}m (min: {min_duration_minutes}m), Views: {views} (min: {min_views})", file=sys.stderr)
+                        logger.debug("[SKIP] Filtered out - Duration: %sm (min: %sm), Views: %s (min: %s)", duration_minutes, min_duration_minutes, views, min_views, extra={'sample': True})
                 except Exception as e:
-                    print(f"ERROR: Processing video failed: {e}", file=sys.stderr)
+                    logger.error("Processing video failed: %s", e)
                     pass
                     
         except Exception as e:
-            print(f"ERROR: Search for '{term}' failed: {e}", file=sys.stderr)
+            logger.error("Search for '%s' failed: %s", term, e)
             pass
 
-    print(f"DEBUG: Total videos collected: {len(all_videos)}", file=sys.stderr)
+    logger.debug("Total videos collected: %s", len(all_videos))
 
     # Sort by views (descending) and remove duplicates
     seen_urls = set()
@@ -436,7 +442,7 @@ def search_youtube_videos(search_terms, max_results=6, min_views=0, min_duration
             if len(unique_videos) >= 10:  # Fetch best 10 videos
                 break
     
-    print(f"DEBUG: Returning {len(unique_videos)} unique videos", file=sys.stderr)
+    logger.debug("Returning %s unique videos", len(unique_videos))
     
     # Remove the raw views field before returning
     for video in unique_videos:
@@ -788,19 +794,17 @@ if __name__ == "__main__":
         mode = sys.argv[5] if len(sys.argv) > 5 else "ai"  # choose "ai" or "youtube"
         language = sys.argv[6] if len(sys.argv) > 6 else "en"  # language code for YouTube
 
-        print(f"DEBUG: Script called with mode={mode}, language={language}, len(sys.argv)={len(sys.argv)}", file=sys.stderr)
-        print(f"DEBUG: sys.argv={sys.argv}", file=sys.stderr)
+        logger.debug("Script called with mode=%s, language=%s, len(sys.argv)=%s", mode, language, len(sys.argv))
+        logger.debug("sys.argv=%s", sys.argv)
         
         if mode == "ai":
-            print(f"DEBUG: Calling create_ai_career_timeline", file=sys.stderr)
+            logger.debug("Calling create_ai_career_timeline")
             result = create_ai_career_timeline(current_skills, target_job, timeframe_months, additional_context)
         else:
-            print(f"DEBUG: Calling create_youtube_career_timeline with language={language}", file=sys.stderr)
+            logger.debug("Calling create_youtube_career_timeline with language=%s", language)
             result = create_youtube_career_timeline(current_skills, target_job, timeframe_months, additional_context, language)
 
         print(json.dumps(result, indent=2))
     except Exception as e:
-        print(json.dumps({"error": str(e)}), file=sys.stderr)
-        import traceback
-        traceback.print_exc(file=sys.stderr)
+        logger.exception("Timeline generation failed: %s", e)
         sys.exit(1)
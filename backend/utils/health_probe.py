@@ -0,0 +1,89 @@
+"""
+Background health prober
+Runs a cheap dependency check on an interval and caches the outcome, so
+health endpoints answer from memory instead of calling the dependency
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+
+class HealthProber:
+    """
+    Calls check() every interval seconds on a daemon thread. check raises
+    on failure. snapshot() returns the cached state: whether the last check
+    passed, when it ran, how long it took, the last error and the error
+    rate over the last window checks. A result older than three intervals
+    is reported as stale, e.g. when a check hangs.
+    """
+
+    def __init__(self, check: Callable[[], Any], interval: float = 60, window: int = 10):
+        self.check = check
+        self.interval = interval
+        self._results = deque(maxlen=max(1, window))
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._state = {
+            'ok': None,
+            'checked_at': None,
+            'latency_ms': None,
+            'last_error': None,
+            'last_error_at': None,
+            'consecutive_failures': 0,
+            'checks': 0
+        }
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name='health-prober', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def probe(self) -> bool:
+        """Run the check once now and record its outcome"""
+        started = time.perf_counter()
+        try:
+            self.check()
+            error = None
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        latency_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        with self._lock:
+            self._results.append(error is None)
+            state = self._state
+            state['ok'] = error is None
+            state['checked_at'] = time.time()
+            state['latency_ms'] = latency_ms
+            state['checks'] += 1
+            if error is None:
+                state['consecutive_failures'] = 0
+            else:
+                state['consecutive_failures'] += 1
+                state['last_error'] = error
+                state['last_error_at'] = state['checked_at']
+        return error is None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            state = dict(self._state)
+            results = list(self._results)
+        state['error_rate'] = round(results.count(False) / len(results), 3) if results else None
+        state['stale'] = state['checked_at'] is None or time.time() - state['checked_at'] > 3 * self.interval
+        state['interval'] = self.interval
+        return state
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self.probe()
+            self._stopping.wait(self.interval)
@@ -0,0 +1,453 @@
+"""
+Durable job queue
+Stores long-running work (e.g. Gemini analyses) in SQLite and runs it on a
+pool of worker threads, so requests can return a job id straight away
+"""
+
+import hashlib
+import hmac
+import http.client
+import ipaddress
+import json
+import logging
+import os
+import socket
+import sqlite3
+import ssl
+import threading
+import time
+import uuid
+from contextlib import closing
+from typing import Any, Callable, Dict, Iterable, Optional
+from urllib.parse import urlsplit
+
+TERMINAL_STATUSES = ('succeeded', 'failed', 'cancelled')
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    status TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    callback_url TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    lease_expires_at REAL,
+    expires_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at);
+CREATE INDEX IF NOT EXISTS jobs_expires ON jobs (expires_at);
+"""
+
+
+class JobQueueFull(Exception):
+    """Raised by enqueue when max_queued jobs are already waiting"""
+
+
+class CallbackNotAllowed(ValueError):
+    """Raised for a callback URL outside the allowed hosts or resolving to a non-public address"""
+
+
+def check_callback_url(url: str, allowed_hosts: Iterable[str]) -> None:
+    """
+    Raise CallbackNotAllowed unless url is http(s) and its host is in
+    allowed_hosts: an exact host name, or a leading-dot entry such as
+    '.example.com' for any of its subdomains. No hosts allows no callbacks.
+    """
+    parts = urlsplit(url)
+    if parts.scheme not in ('http', 'https') or not parts.hostname:
+        raise CallbackNotAllowed('callback_url must be an http(s) URL')
+    host = parts.hostname.lower()
+    if not any(host == entry or (entry.startswith('.') and host.endswith(entry)) for entry in allowed_hosts):
+        raise CallbackNotAllowed(f'callback_url host {host} is not allowed')
+
+
+def _public_address(host, port):
+    """
+    Resolve host and return the address to connect to, refusing hosts with
+    any private, loopback, link-local, multicast or reserved address
+    """
+    addresses = [info[4][0] for info in socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)]
+    for address in addresses:
+        ip = ipaddress.ip_address(address.split('%')[0])
+        if ip.version == 6 and ip.ipv4_mapped is not None:
+            ip = ip.ipv4_mapped
+        if not ip.is_global or ip.is_multicast:
+            raise CallbackNotAllowed(f'{host} resolves to a non-public address ({address})')
+    return addresses[0]
+
+
+class _PinnedHTTPConnection(http.client.HTTPConnection):
+    """
+    Connects to an address already checked by _public_address instead of
+    resolving the host again, which DNS could answer differently
+    """
+
+    def __init__(self, host, port, address, timeout):
+        super().__init__(host, port, timeout=timeout)
+        self.address = address
+
+    def connect(self):
+        self.sock = socket.create_connection((self.address, self.port), self.timeout)
+
+
+class _PinnedHTTPSConnection(_PinnedHTTPConnection):
+    default_port = http.client.HTTPS_PORT
+
+    def __init__(self, host, port, address, timeout):
+        super().__init__(host, port, address, timeout)
+        self.ssl_context = ssl.create_default_context()
+
+    def connect(self):
+        super().connect()
+        self.sock = self.ssl_context.wrap_socket(self.sock, server_hostname=self.host)
+
+
+class Job:
+    """
+    A job being run by a worker. Handlers receive it along with the payload
+    and can poll cancel_requested() to stop early.
+    """
+
+    def __init__(self, queue: 'JobQueue', job_id: str, kind: str, attempts: int):
+        self.queue = queue
+        self.id = job_id
+        self.kind = kind
+        self.attempts = attempts
+
+    def cancel_requested(self) -> bool:
+        with closing(self.queue._connect()) as conn:
+            row = conn.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (self.id,)).fetchone()
+        return row is None or bool(row['cancel_requested'])
+
+
+class JobQueue:
+    """
+    SQLite-backed job queue with a worker thread pool.
+
+    Handlers are registered per job kind and called as handler(payload, job);
+    their return value must be JSON-serializable. A running job holds a lease
+    of lease_seconds, renewed every lease_seconds / 3 while its handler runs:
+    if its process dies, another worker (in this or any process sharing the
+    database) picks it up again once the lease expires, up to max_attempts
+    runs. With workers=0 the queue only accepts jobs, for another process to
+    run. Finished jobs and their results are deleted result_ttl seconds after
+    they finish, every purge_interval seconds once start() is called.
+    db_path must be on a local file system: WAL mode is unreliable on
+    NFS/SMB.
+
+    If a job has a callback_url, the job is POSTed there as JSON when it
+    reaches a final status. Callback hosts must match callback_hosts (see
+    check_callback_url) and resolve to public addresses only; redirects are
+    not followed. With a callback_secret, each callback carries
+    X-CareerNav-Timestamp and X-CareerNav-Signature: sha256=<hex
+    HMAC-SHA256 of "<timestamp>.<body>">.
+    """
+
+    def __init__(self, db_path: str, handlers: Optional[Dict[str, Callable[[Dict[str, Any], Job], Any]]] = None,
+                 workers: int = 4, result_ttl: float = 3600, max_queued: Optional[int] = 1000,
+                 lease_seconds: float = 600, max_attempts: int = 2, poll_interval: float = 1.0,
+                 callback_timeout: float = 10, callback_hosts: Iterable[str] = (),
+                 callback_secret: Optional[str] = None, purge_interval: float = 60):
+        self.db_path = db_path
+        self.handlers = dict(handlers or {})
+        self.workers = max(0, workers)
+        self.result_ttl = result_ttl
+        self.max_queued = max_queued
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.poll_interval = poll_interval
+        self.callback_timeout = callback_timeout
+        self.callback_hosts = tuple(host.strip().lower() for host in callback_hosts if host.strip())
+        self.callback_secret = callback_secret
+        self.purge_interval = purge_interval
+        self._wakeup = threading.Condition()
+        self._stopping = threading.Event()
+        self._threads = []
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    def register(self, kind: str, handler: Callable[[Dict[str, Any], Job], Any]) -> None:
+        self.handlers[kind] = handler
+
+    def start(self) -> None:
+        """Start the worker threads and the purge thread (idempotent)"""
+        if self._threads:
+            return
+        self._stopping.clear()
+        purger = threading.Thread(target=self._purge_loop, name="job-purge", daemon=True)
+        purger.start()
+        self._threads.append(purger)
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the workers after their current jobs; unfinished jobs stay queued"""
+        self._stopping.set()
+        with self._wakeup:
+            self._wakeup.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def enqueue(self, kind: str, payload: Dict[str, Any], callback_url: Optional[str] = None) -> str:
+        """
+        Queue a job and return its id. Raises JobQueueFull when the queue is
+        at capacity and CallbackNotAllowed for a callback_url outside
+        callback_hosts.
+        """
+        if kind not in self.handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if callback_url:
+            check_callback_url(callback_url, self.callback_hosts)
+        job_id = uuid.uuid4().hex
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            if self.max_queued:
+                queued = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+                if queued >= self.max_queued:
+                    conn.execute('ROLLBACK')
+                    raise JobQueueFull(f"{queued} jobs are already queued")
+            conn.execute(
+                "INSERT INTO jobs (id, kind, status, payload, callback_url, created_at) VALUES (?, ?, 'queued', ?, ?, ?)",
+                (job_id, kind, json.dumps(payload), callback_url, time.time())
+            )
+            conn.execute('COMMIT')
+        with self._wakeup:
+            self._wakeup.notify()
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The job as a dict, or None if it does not exist or has expired"""
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None or (row['expires_at'] is not None and row['expires_at'] <= time.time()):
+            return None
+        return self._to_dict(row)
+
+    def cancel(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Cancel a job. A queued job is cancelled at once; a running job is
+        flagged and marked cancelled, without its result, when its handler
+        returns. Returns the job, or None if it does not exist.
+        """
+        now = time.time()
+        cancelled_now = False
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT status FROM jobs WHERE id = ?', (job_id,)).fetchone()
+            if row is not None and row['status'] == 'queued':
+                conn.execute(
+                    "UPDATE jobs SET status = 'cancelled', cancel_requested = 1, finished_at = ?, expires_at = ? "
+                    "WHERE id = ?",
+                    (now, now + self.result_ttl, job_id)
+                )
+                cancelled_now = True
+            elif row is not None and row['status'] == 'running':
+                conn.execute('UPDATE jobs SET cancel_requested = 1 WHERE id = ?', (job_id,))
+            conn.execute('COMMIT')
+
+        job = self.get(job_id)
+        if cancelled_now and job is not None:
+            self._send_callback(job_id)
+        return job
+
+    def stats(self) -> Dict[str, Any]:
+        with closing(self._connect()) as conn:
+            rows = conn.execute('SELECT status, COUNT(*) AS count FROM jobs GROUP BY status').fetchall()
+        counts = {status: 0 for status in ('queued', 'running') + TERMINAL_STATUSES}
+        counts.update({row['status']: row['count'] for row in rows})
+        workers = sum(1 for thread in self._threads if thread.name.startswith('job-worker-'))
+        return {'jobs': counts, 'workers': workers, 'max_queued': self.max_queued}
+
+    def purge_expired(self) -> int:
+        """Delete finished jobs whose results have expired; returns how many"""
+        with closing(self._connect()) as conn:
+            with conn:
+                deleted = conn.execute('DELETE FROM jobs WHERE expires_at <= ?', (time.time(),)).rowcount
+        return deleted
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    @staticmethod
+    def _to_dict(row):
+        return {
+            'id': row['id'],
+            'kind': row['kind'],
+            'status': row['status'],
+            'result': json.loads(row['result']) if row['result'] is not None else None,
+            'error': row['error'],
+            'attempts': row['attempts'],
+            'cancel_requested': bool(row['cancel_requested']),
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at'],
+            'expires_at': row['expires_at']
+        }
+
+    def _worker_loop(self):
+        while not self._stopping.is_set():
+            try:
+                claimed = self._claim()
+            except sqlite3.Error as e:
+                logger.error("Job queue error: %s", e)
+                claimed = None
+
+            if claimed is None:
+                with self._wakeup:
+                    self._wakeup.wait(self.poll_interval)
+                continue
+            self._run(*claimed)
+
+    def _purge_loop(self):
+        while not self._stopping.wait(self.purge_interval):
+            try:
+                self.purge_expired()
+            except sqlite3.Error as e:
+                logger.error("Job queue purge failed: %s", e)
+
+    def _renew_lease(self, job, done):
+        """Extend job's lease until done is set, so a long handler is not run twice"""
+        while not done.wait(self.lease_seconds / 3):
+            try:
+                with closing(self._connect()) as conn:
+                    conn.execute(
+                        "UPDATE jobs SET lease_expires_at = ? WHERE id = ? AND status = 'running' AND attempts = ?",
+                        (time.time() + self.lease_seconds, job.id, job.attempts)
+                    )
+            except sqlite3.Error as e:
+                logger.error("Job queue error: %s", e)
+
+    def _claim(self):
+        """
+        Atomically take the oldest queued job, or a running one whose lease
+        expired. Returns (job, payload) or None when there is nothing to do.
+        """
+        now = time.time()
+        abandoned = None
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                "SELECT id, kind, status, payload, attempts FROM jobs "
+                "WHERE status = 'queued' OR (status = 'running' AND lease_expires_at < ?) "
+                "ORDER BY created_at LIMIT 1",
+                (now,)
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+
+            if row['status'] == 'running' and row['attempts'] >= self.max_attempts:
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished_at = ?, expires_at = ?, "
+                    "lease_expires_at = NULL WHERE id = ?",
+                    ('Job worker stopped before the job finished', now, now + self.result_ttl, row['id'])
+                )
+                conn.execute('COMMIT')
+                abandoned = row['id']
+            else:
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, lease_expires_at = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (now, now + self.lease_seconds, row['id'])
+                )
+                conn.execute('COMMIT')
+
+        if abandoned is not None:
+            self._send_callback(abandoned)
+            return self._claim()
+        job = Job(self, row['id'], row['kind'], row['attempts'] + 1)
+        return job, json.loads(row['payload'])
+
+    def _run(self, job, payload):
+        handler = self.handlers.get(job.kind)
+        result, error = None, None
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._renew_lease, args=(job, done), name=f"job-lease-{job.id}",
+                                     daemon=True)
+        heartbeat.start()
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for job kind: {job.kind}")
+            result = json.dumps(handler(payload, job))
+        except Exception as e:
+            logger.warning("Job %s (%s) failed: %s", job.id, job.kind, e)
+            error = str(e)
+        finally:
+            done.set()
+            heartbeat.join()
+
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT status, attempts, cancel_requested FROM jobs WHERE id = ?',
+                               (job.id,)).fetchone()
+            # Skip the update if the lease was taken over by another worker
+            owned = row is not None and row['status'] == 'running' and row['attempts'] == job.attempts
+            if owned:
+                if row['cancel_requested']:
+                    status, result, error = 'cancelled', None, None
+                else:
+                    status = 'failed' if error is not None else 'succeeded'
+                conn.execute(
+                    "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, expires_at = ?, "
+                    "lease_expires_at = NULL WHERE id = ?",
+                    (status, result, error, now, now + self.result_ttl, job.id)
+                )
+            conn.execute('COMMIT')
+
+        if owned:
+            self._send_callback(job.id)
+
+    def _send_callback(self, job_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        if row is None or not row['callback_url']:
+            return
+        body = json.dumps(self._to_dict(row)).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        if self.callback_secret:
+            timestamp = str(int(time.time()))
+            signature = hmac.new(self.callback_secret.encode('utf-8'), timestamp.encode('ascii') + b'.' + body,
+                                 hashlib.sha256).hexdigest()
+            headers['X-CareerNav-Timestamp'] = timestamp
+            headers['X-CareerNav-Signature'] = f'sha256={signature}'
+        try:
+            self._post(row['callback_url'], body, headers)
+        except Exception as e:
+            logger.warning("Callback for job %s to %s failed: %s", job_id, row['callback_url'], e)
+
+    def _post(self, url, body, headers):
+        # Checked again here: the allowed hosts may have changed since the
+        # job was queued, and the addresses a host resolves to can change
+        check_callback_url(url, self.callback_hosts)
+        parts = urlsplit(url)
+        connection_class = _PinnedHTTPSConnection if parts.scheme == 'https' else _PinnedHTTPConnection
+        port = parts.port or connection_class.default_port
+        connection = connection_class(parts.hostname, port, _public_address(parts.hostname, port),
+                                      self.callback_timeout)
+        try:
+            path = (parts.path or '/') + (f'?{parts.query}' if parts.query else '')
+            connection.request('POST', path, body=body, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            if response.status >= 300:
+                raise http.client.HTTPException(f'HTTP {response.status} {response.reason}')
+        finally:
+            connection.close()
@@ -1,142 +1,520 @@
-import PyPDF2
-import pdfplumber
-from docx import Document
+import io
 import os
 import re
+import json
+import hashlib
+import difflib
+import logging
+import time
+import tempfile
+import zipfile
+from xml.etree import ElementTree
+import atexit
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as PoolTimeoutError
+from concurrent.futures.process import BrokenProcessPool
 
+logger = logging.getLogger(__name__)
 
-def _extract_section_entries(raw_text, section_keywords, stop_keywords):
-    """Extract bullet-style entries for resume sections like experience or projects."""
-    if not raw_text:
-        return []
+# PyPDF2 is the fast first pass. pypdfium2 (installed with pdfplumber) reads
+# text only about 1.5x faster on our corpus, but pdfium is not thread-safe:
+# the threaded web server would have to serialize every fast pass behind one
+# process-wide lock, which costs more than it saves.
+#
+# A page read by the fast parser is re-read with pdfplumber's layout
+# analysis when it yields fewer characters than this, or when long text
+# has almost no spaces (words glued together by a poor text layer).
+PDF_MIN_PAGE_CHARS = 20
+PDF_MIN_SPACE_RATIO = 0.05
 
-    lines = raw_text.splitlines()
-    section_keywords_lower = [keyword.lower() for keyword in section_keywords]
-    stop_keywords_lower = [keyword.lower() for keyword in stop_keywords]
+# The PDF backends are imported on first use rather than with this module:
+# they dominate its import time and are not needed for DOCX or skill matching.
+# Worker processes preload them instead (see _get_process_pool).
+PDF_BACKEND_MODULES = ['PyPDF2', 'pdfplumber']
 
-    capturing = False
-    buffer = []
-    entries = []
+def _needs_layout_analysis(text):
+    stripped = text.strip()
+    if len(stripped) < PDF_MIN_PAGE_CHARS:
+        return True
+    if len(stripped) >= 200 and stripped.count(' ') / len(stripped) < PDF_MIN_SPACE_RATIO:
+        return True
+    return False
 
-    def flush_buffer():
-        if buffer:
-            combined = " ".join(buffer).strip()
-            if combined:
-                entries.append(combined)
-            buffer.clear()
-
-    for raw_line in lines:
-        line = raw_line.strip()
-        if not line:
-            if capturing:
-                flush_buffer()
-            continue
+def _fast_page_text(page):
+    try:
+        return page.extract_text() or ""
+    except Exception as e:
+        logger.debug("PyPDF2 failed on page, using layout analysis: %s", e)
+        return ""
 
-        lower_line = line.lower()
+def _is_in_memory(source):
+    return isinstance(source, (bytes, bytearray, memoryview))
 
-        # Detect start of section
-        if any(lower_line.startswith(keyword) for keyword in section_keywords_lower):
-            capturing = True
-            flush_buffer()
-            continue
+def _open_binary(source):
+    """Return a new binary file object over a path or in-memory bytes"""
+    if _is_in_memory(source):
+        return io.BytesIO(source)
+    return open(source, 'rb')
+
+def _read_source(source):
+    """
+    Normalize a resume source: paths are returned as-is, bytes unchanged,
+    and file-like objects (e.g. an upload stream) are read into memory.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        return os.fspath(source)
+    if _is_in_memory(source):
+        return source
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    return source.read()
+
+def _iter_pdf_page_range(source, start=0, stop=None, info=None):
+    """
+    Lazily extract pages [start, stop) of a PDF with the per-page backend
+    choice. If given, info['page_count'] is set once the document is open.
+    """
+    import PyPDF2
+
+    plumber_file = None
+    plumber_pdf = None
+
+    def open_plumber():
+        nonlocal plumber_file
+        import pdfplumber
+        # pdfminer keeps its own read position, so it gets a separate handle
+        plumber_file = _open_binary(source)
+        return pdfplumber.open(plumber_file)
 
-        if capturing and any(lower_line.startswith(keyword) for keyword in stop_keywords_lower):
-            flush_buffer()
-            break
+    try:
+        with _open_binary(source) as file:
+            try:
+                fast_pages = PyPDF2.PdfReader(file).pages
+            except Exception as e:
+                logger.warning("PyPDF2 could not open PDF, using layout analysis: %s", e)
+                fast_pages = None
 
-        if capturing:
-            # Normalize bullet points
-            if line[0] in {"-", "•", "*"}:
-                flush_buffer()
-                buffer.append(line.lstrip("-•* "))
+            if fast_pages is None:
+                plumber_pdf = open_plumber()
+                page_count = len(plumber_pdf.pages)
             else:
-                buffer.append(line)
+                page_count = len(fast_pages)
 
-    flush_buffer()
+            if info is not None:
+                info['page_count'] = page_count
 
-    # Remove duplicates while preserving order
-    seen = set()
-    deduped = []
-    for entry in entries:
-        if entry not in seen:
-            deduped.append(entry)
-            seen.add(entry)
+            for index in range(start, min(stop, page_count) if stop is not None else page_count):
+                started = time.perf_counter()
+                text, backend = "", None
+
+                if fast_pages is not None:
+                    text, backend = _fast_page_text(fast_pages[index]), 'pypdf2'
+
+                if _needs_layout_analysis(text):
+                    if plumber_pdf is None:
+                        plumber_pdf = open_plumber()
+                    layout_text = plumber_pdf.pages[index].extract_text() or ""
+                    if layout_text.strip() or not text.strip():
+                        text, backend = layout_text, 'pdfplumber'
 
-    return deduped
+                yield {
+                    'page': index + 1,
+                    'text': text,
+                    'backend': backend,
+                    'elapsed_ms': round((time.perf_counter() - started) * 1000, 2)
+                }
+    finally:
+        if plumber_pdf is not None:
+            plumber_pdf.close()
+        if plumber_file is not None:
+            plumber_file.close()
 
-def extract_text_from_pdf(file_path):
+def _extract_pdf_page_range(source, start=0, stop=None):
     """
-    Extract text from PDF file using both PyPDF2 and pdfplumber for better coverage
+    Extract pages [start, stop) of a PDF as a list.
+    This is the task run by the parallel extraction pool.
     """
-    text = ""
-    
+    return list(_iter_pdf_page_range(source, start, stop))
+
+# Opt-in fan-out of long PDFs to a persistent process pool. Documents with
+# fewer pages than min_pages are always extracted in-process.
+_parallel_settings = {
+    'enabled': False,
+    'min_pages': 8,
+    'pages_per_task': 4,
+    'workers': None
+}
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+def configure_parallel_extraction(enabled=True, min_pages=8, pages_per_task=4, workers=None):
+    """
+    Enable or disable parallel per-page PDF extraction
+    """
+    _parallel_settings.update(
+        enabled=enabled,
+        min_pages=max(1, min_pages),
+        pages_per_task=max(1, pages_per_task),
+        workers=workers
+    )
+
+def _get_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # Fork workers from a clean server process that only preloads
+            # this module, not from the (threaded) web server itself.
+            context = multiprocessing.get_context('forkserver')
+            context.set_forkserver_preload([__name__] + PDF_BACKEND_MODULES)
+            _process_pool = ProcessPoolExecutor(
+                max_workers=_parallel_settings['workers'],
+                mp_context=context
+            )
+            atexit.register(_process_pool.shutdown, wait=False, cancel_futures=True)
+        return _process_pool
+
+def _reset_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+def _count_pdf_pages(source):
+    import PyPDF2
+    with _open_binary(source) as file:
+        return len(PyPDF2.PdfReader(file).pages)
+
+def _iter_pdf_pages_parallel(source, page_count, deadline=None):
+    """
+    Yield the pages extracted by the pool in order. Raises PoolTimeoutError
+    if deadline (a time.monotonic() value) passes while waiting for a range.
+    """
+    chunk = _parallel_settings['pages_per_task']
+    pool = _get_process_pool()
+    futures = [
+        pool.submit(_extract_pdf_page_range, source, start, min(start + chunk, page_count))
+        for start in range(0, page_count, chunk)
+    ]
     try:
-        # First try with pdfplumber (better for complex layouts)
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        
-        # If pdfplumber didn't extract much text, try PyPDF2
-        if len(text.strip()) < 100:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text += page_text + "\n"
-    
+        for future in futures:
+            timeout = None if deadline is None else max(0, deadline - time.monotonic())
+            yield from future.result(timeout=timeout)
+    finally:
+        # Ranges not started yet are dropped when the caller stops early;
+        # one already running finishes in its worker and is discarded
+        for future in futures:
+            future.cancel()
+
+class ExtractionLimits:
+    """
+    Budgets for a single extraction; a limit left as None is unbounded.
+    The wall-clock budget is checked between pages, so in-process one slow
+    page can still overrun it; parallel extraction stops waiting for the
+    pool when the budget runs out.
+    """
+
+    def __init__(self, max_pages=None, max_chars=None, max_seconds=None):
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.max_seconds = max_seconds
+
+    def describe(self):
+        return f"p{self.max_pages}-c{self.max_chars}-s{self.max_seconds}"
+
+_default_limits = ExtractionLimits()
+
+def configure_extraction_limits(max_pages=None, max_chars=None, max_seconds=None):
+    """
+    Set the limits used when an extraction does not pass its own
+    """
+    global _default_limits
+    _default_limits = ExtractionLimits(max_pages, max_chars, max_seconds)
+
+class PdfPageStream:
+    """
+    Iterate over the pages of a PDF lazily, one page dict at a time (see
+    extract_pdf_pages), stopping as soon as a limit is reached. Once
+    iteration ends, truncated and truncated_reason tell whether pages were
+    left unread and which limit caused it.
+    """
+
+    def __init__(self, source, limits=None):
+        self.source = _read_source(source)
+        self.limits = limits or _default_limits
+        self.page_count = None
+        self.chars = 0
+        self.truncated = False
+        self.truncated_reason = None
+
+    def __iter__(self):
+        limits = self.limits
+        started = time.monotonic()
+        deadline = started + limits.max_seconds if limits.max_seconds is not None else None
+        pages_read = 0
+
+        for page in self._iter_pages(deadline):
+            yield page
+            pages_read += 1
+            self.chars += len(page['text'])
+
+            if limits.max_chars is not None and self.chars >= limits.max_chars:
+                reason = 'max_chars'
+            elif limits.max_seconds is not None and time.monotonic() - started >= limits.max_seconds:
+                reason = 'max_seconds'
+            else:
+                continue
+
+            if pages_read < self.page_count:
+                self.truncated = True
+                self.truncated_reason = reason
+            return
+
+        if not self.truncated and limits.max_pages is not None and self.page_count > limits.max_pages:
+            self.truncated = True
+            self.truncated_reason = 'max_pages'
+
+    def _iter_pages(self, deadline=None):
+        stop = self.limits.max_pages
+        pages_read = 0
+
+        if _parallel_settings['enabled']:
+            try:
+                page_count = _count_pdf_pages(self.source)
+            except Exception:
+                page_count = 0
+
+            if page_count >= _parallel_settings['min_pages']:
+                self.page_count = page_count
+                try:
+                    for page in _iter_pdf_pages_parallel(self.source, min(page_count, stop or page_count), deadline):
+                        yield page
+                        pages_read += 1
+                    return
+                except PoolTimeoutError:
+                    self.truncated = True
+                    self.truncated_reason = 'max_seconds'
+                    return
+                except BrokenProcessPool as e:
+                    logger.warning("PDF extraction pool failed, extracting in-process: %s", e)
+                    _reset_process_pool()
+
+        info = {}
+        for page in _iter_pdf_page_range(self.source, pages_read, stop, info):
+            self.page_count = info['page_count']
+            yield page
+        if self.page_count is None:
+            self.page_count = info.get('page_count', 0)
+
+def extract_pdf_pages(source, limits=None):
+    """
+    Extract text page by page, choosing a backend per page.
+    The source may be a file path, bytes, or a binary file-like object.
+
+    Every page is read with PyPDF2 first; only pages that come back sparse
+    or garbled are re-read with pdfplumber, which is opened lazily so
+    text-only documents are parsed once. Returns a list of dicts with the
+    page number, its text, the backend that produced it and elapsed ms.
+
+    When parallel extraction is enabled, documents of at least min_pages
+    pages are split into page ranges extracted on the process pool and
+    stitched back in page order.
+    """
+    return list(PdfPageStream(source, limits))
+
+def extract_text_from_pdf(source, limits=None):
+    """
+    Extract text from PDF file, falling back from PyPDF2 to pdfplumber per page
+    """
+    try:
+        pages = extract_pdf_pages(source, limits)
     except Exception as e:
-        print(f"Error extracting PDF text: {str(e)}")
+        logger.error("Error extracting PDF text: %s", e)
         return None
     
-    return text.strip()
+    return "\n".join(page['text'] for page in pages if page['text']).strip()
+
+_W_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_MC_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+_OFFICE_DOCUMENT_REL = 'http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument'
+
+# Run elements that stand for a character, as python-docx renders them
+_DOCX_RUN_CHARS = {
+    _W_NS + 'tab': '\t',
+    _W_NS + 'ptab': '\t',
+    _W_NS + 'cr': '\n',
+    _W_NS + 'noBreakHyphen': '-'
+}
+
+def _docx_main_part(archive):
+    """Name of the main document part, normally word/document.xml"""
+    try:
+        with archive.open('_rels/.rels') as f:
+            for relationship in ElementTree.parse(f).getroot():
+                if relationship.get('Type') == _OFFICE_DOCUMENT_REL:
+                    return relationship.get('Target').lstrip('/')
+    except KeyError:
+        pass
+    return 'word/document.xml'
+
+def _iter_docx_blocks(source):
+    """
+    Stream the text blocks of a DOCX in document order: every paragraph,
+    and every table cell as its paragraphs joined by newlines.
+
+    word/document.xml is parsed incrementally straight out of the zip and
+    finished elements are dropped, so memory does not grow with the
+    document. Merged cells are emitted once (vertical-merge continuation
+    cells are skipped) and the fallback copy of text boxes is ignored.
+    """
+    with _open_binary(source) as file, zipfile.ZipFile(file) as archive:
+        with archive.open(_docx_main_part(archive)) as part:
+            paragraphs = []  # text runs of the open paragraphs, innermost last
+            cells = []       # open table cells, innermost last
+            open_elements = []
+            skip_depth = 0
+
+            for event, element in ElementTree.iterparse(part, events=('start', 'end')):
+                tag = element.tag
+
+                if event == 'start':
+                    open_elements.append(element)
+                    if skip_depth or tag == _MC_FALLBACK:
+                        skip_depth += 1
+                    elif tag == _W_NS + 'p':
+                        paragraphs.append([])
+                    elif tag == _W_NS + 'tc':
+                        cells.append({'paragraphs': [], 'continued': False})
+                    continue
+
+                # Detach every finished element so the tree never holds more
+                # than the currently open path
+                open_elements.pop()
+                if open_elements:
+                    open_elements[-1].remove(element)
+
+                if skip_depth:
+                    skip_depth -= 1
+                    continue
+
+                if tag == _W_NS + 't':
+                    if paragraphs and element.text:
+                        paragraphs[-1].append(element.text)
+                elif tag in _DOCX_RUN_CHARS:
+                    if paragraphs:
+                        paragraphs[-1].append(_DOCX_RUN_CHARS[tag])
+                elif tag == _W_NS + 'br':
+                    # Page and column breaks carry no text
+                    if paragraphs and element.get(_W_NS + 'type', 'textWrapping') == 'textWrapping':
+                        paragraphs[-1].append('\n')
+                elif tag == _W_NS + 'vMerge':
+                    if cells and element.get(_W_NS + 'val', 'continue') == 'continue':
+                        cells[-1]['continued'] = True
+                elif tag == _W_NS + 'p':
+                    text = ''.join(paragraphs.pop())
+                    if cells:
+                        cells[-1]['paragraphs'].append(text)
+                    elif text.strip():
+                        yield text
+                elif tag == _W_NS + 'tc':
+                    cell = cells.pop()
+                    if not cell['continued']:
+                        text = '\n'.join(cell['paragraphs'])
+                        if cells:
+                            cells[-1]['paragraphs'].append(text)
+                        elif text.strip():
+                            yield text
 
-def extract_text_from_docx(file_path):
+def _read_docx_text(source, max_chars=None):
     """
-    Extract text from DOCX file
+    Join the DOCX text blocks, stopping once more than max_chars characters
+    have been read. Returns (text, truncated); text is None on failure.
     """
+    blocks = []
+    length = 0
     try:
-        doc = Document(file_path)
-        text = []
-        
-        # Extract text from paragraphs
-        for paragraph in doc.paragraphs:
-            if paragraph.text.strip():
-                text.append(paragraph.text)
-        
-        # Extract text from tables
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text.strip():
-                        text.append(cell.text)
-        
-        return "\n".join(text)
-    
+        for block in _iter_docx_blocks(_read_source(source)):
+            length += len(block) + (1 if blocks else 0)
+            blocks.append(block)
+            if max_chars is not None and length > max_chars:
+                return "\n".join(blocks)[:max_chars], True
+    except MemoryError:
+        raise
     except Exception as e:
-        print(f"Error extracting DOCX text: {str(e)}")
-        return None
+        logger.error("Error extracting DOCX text: %s", e)
+        return None, False
+    return "\n".join(blocks), False
 
-def extract_resume_text(file_path):
+def extract_text_from_docx(source):
     """
-    Main function to extract text from resume file
-    Supports PDF and DOCX formats
+    Extract text from DOCX file, paragraphs and table cells in document order
     """
-    if not os.path.exists(file_path):
-        return None
+    return _read_docx_text(source)[0]
+
+def extract_resume_document(source, filename=None, limits=None):
+    """
+    Extract text from a resume within the given limits (the configured
+    defaults if None). Returns a dict with the text (None on failure),
+    truncated, truncated_reason and, for PDFs, a per-page report of the
+    backend used, characters extracted and elapsed ms.
+
+    The source may be a file path, bytes, or a binary file-like object such
+    as an upload stream, so uploads can be parsed without a temp file. For
+    in-memory sources, filename supplies the extension.
+    """
+    document = {'text': None, 'truncated': False, 'truncated_reason': None, 'pages': None}
+    limits = limits or _default_limits
+
+    if isinstance(source, (str, os.PathLike)):
+        if not os.path.exists(source):
+            return document
+        filename = filename or os.fspath(source)
+    else:
+        source = _read_source(source)
     
-    file_extension = os.path.splitext(file_path)[1].lower()
+    file_extension = os.path.splitext(filename or '')[1].lower()
     
     if file_extension == '.pdf':
-        return extract_text_from_pdf(file_path)
+        stream = PdfPageStream(source, limits)
+        try:
+            pages = list(stream)
+        except MemoryError:
+            # Out of memory is not a broken file; let sandboxed callers see it
+            raise
+        except Exception as e:
+            logger.error("Error extracting PDF text: %s", e)
+            return document
+        document.update(
+            text="\n".join(page['text'] for page in pages if page['text']).strip(),
+            truncated=stream.truncated,
+            truncated_reason=stream.truncated_reason,
+            pages=[
+                {'page': page['page'], 'backend': page['backend'], 'chars': len(page['text']), 'elapsed_ms': page['elapsed_ms']}
+                for page in pages
+            ]
+        )
     elif file_extension in ['.docx', '.doc']:
-        return extract_text_from_docx(file_path)
+        text, truncated = _read_docx_text(source, limits.max_chars)
+        document['text'] = text
+        if truncated:
+            document.update(truncated=True, truncated_reason='max_chars')
     else:
-        print(f"Unsupported file format: {file_extension}")
-        return None
+        logger.warning("Unsupported file format: %s", file_extension)
+
+    return document
+
+def extract_resume_text(source, filename=None):
+    """
+    Main function to extract text from resume file
+    Supports PDF and DOCX formats
+
+    Accepts the same sources as extract_resume_document and applies the
+    configured extraction limits.
+    """
+    return extract_resume_document(source, filename=filename)['text']
+
+_SPECIAL_CHARS_RE = re.compile(r'[^\w\s@.,()-]+')
 
 def clean_extracted_text(text):
     """
@@ -145,166 +523,487 @@ def clean_extracted_text(text):
     if not text:
         return ""
     
-    # Remove excessive whitespace
-    text = re.sub(r'\s+', ' ', text)
+    # Collapse whitespace, including line breaks, into single spaces
+    text = ' '.join(text.split())
     
     # Remove special characters that might cause issues
-    text = re.sub(r'[^\w\s@.,()-]', '', text)
-    
-    # Normalize line breaks
-    text = text.replace('\n', ' ').replace('\r', ' ')
+    text = _SPECIAL_CHARS_RE.sub('', text)
     
     return text.strip()
 
+# The skills taxonomy lives in a data file so it can be extended without a
+# code change. Its compiled matcher index is cached on disk, keyed by a hash
+# of the file, and the file is watched for changes (see get_skill_matcher).
+SKILLS_DATABASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'skills_database.json')
+
+# Bump when the layout of the on-disk index changes
+SKILLS_INDEX_FORMAT = 1
+
+_skills_settings = {
+    'path': SKILLS_DATABASE_PATH,
+    'index_dir': None,
+    'reload_interval': 2.0
+}
+
+def configure_skills_database(path=None, index_dir=None, reload_interval=2.0):
+    """
+    Choose the skills database file, where its compiled index is cached
+    (None = next to the file) and how often, in seconds, the file is checked
+    for changes (None disables hot reload). Takes effect on the next lookup.
+    """
+    global _skills_checked_at
+    _skills_settings.update(
+        path=path or SKILLS_DATABASE_PATH,
+        index_dir=index_dir,
+        reload_interval=reload_interval
+    )
+    _skills_checked_at = None
+
 def get_comprehensive_skills_database():
     """
-    Comprehensive database of technical skills and technologies with aliases
+    Comprehensive database of technical skills and technologies with aliases,
+    as loaded from the skills database file. The returned dict is shared
+    and must be treated as read-only.
     """
-    return {
-        'programming_languages': [
-            {'name': 'Python', 'aliases': ['python', 'py']},
-            {'name': 'JavaScript', 'aliases': ['javascript', 'js', 'ecmascript', 'es6', 'es2015', 'es2020']},
-            {'name': 'TypeScript', 'aliases': ['typescript', 'ts']},
-            {'name': 'Java', 'aliases': ['java']},
-            {'name': 'C++', 'aliases': ['c++', 'cpp', 'cplusplus']},
-            {'name': 'C#', 'aliases': ['c#', 'csharp', 'c sharp']},
-            {'name': 'C', 'aliases': ['c programming', ' c ']},
-            {'name': 'Go', 'aliases': ['go', 'golang']},
-            {'name': 'Rust', 'aliases': ['rust']},
-            {'name': 'PHP', 'aliases': ['php']},
-            {'name': 'Ruby', 'aliases': ['ruby']},
-            {'name': 'Swift', 'aliases': ['swift']},
-            {'name': 'Kotlin', 'aliases': ['kotlin']},
-            {'name': 'Scala', 'aliases': ['scala']},
-            {'name': 'R', 'aliases': ['r programming', ' r ']},
-            {'name': 'MATLAB', 'aliases': ['matlab']},
-            {'name': 'Dart', 'aliases': ['dart']},
-            {'name': 'Perl', 'aliases': ['perl']},
-            {'name': 'Lua', 'aliases': ['lua']},
-            {'name': 'Haskell', 'aliases': ['haskell']},
-            {'name': 'Shell/Bash', 'aliases': ['bash', 'shell', 'zsh', 'powershell']},
-            {'name': 'SQL', 'aliases': ['sql']},
-        ],
-        
-        'web_frameworks': [
-            {'name': 'React', 'aliases': ['react', 'reactjs', 'react.js']},
-            {'name': 'Angular', 'aliases': ['angular', 'angularjs', 'angular.js']},
-            {'name': 'Vue.js', 'aliases': ['vue', 'vue.js', 'vuejs']},
-            {'name': 'Express.js', 'aliases': ['express', 'express.js', 'expressjs']},
-            {'name': 'Django', 'aliases': ['django']},
-            {'name': 'Flask', 'aliases': ['flask']},
-            {'name': 'FastAPI', 'aliases': ['fastapi', 'fast api']},
-            {'name': 'Spring Boot', 'aliases': ['spring boot', 'spring', 'springframework']},
-            {'name': 'Laravel', 'aliases': ['laravel']},
-            {'name': 'Ruby on Rails', 'aliases': ['rails', 'ruby on rails', 'ror']},
-            {'name': 'ASP.NET', 'aliases': ['asp.net', 'aspnet', 'asp net']},
-            {'name': 'Next.js', 'aliases': ['next', 'next.js', 'nextjs']},
-            {'name': 'Nuxt.js', 'aliases': ['nuxt', 'nuxt.js', 'nuxtjs']},
-            {'name': 'Svelte', 'aliases': ['svelte', 'sveltekit']},
-            {'name': 'Node.js', 'aliases': ['node.js', 'nodejs', 'node']},
-        ],
-        
-        'web_technologies': [
-            {'name': 'HTML', 'aliases': ['html', 'html5']},
-            {'name': 'CSS', 'aliases': ['css', 'css3']},
-            {'name': 'Sass', 'aliases': ['sass', 'scss']},
-            {'name': 'Bootstrap', 'aliases': ['bootstrap']},
-            {'name': 'Tailwind CSS', 'aliases': ['tailwind', 'tailwindcss', 'tailwind css']},
-            {'name': 'jQuery', 'aliases': ['jquery']},
-            {'name': 'Webpack', 'aliases': ['webpack']},
-            {'name': 'Vite', 'aliases': ['vite']},
-            {'name': 'GraphQL', 'aliases': ['graphql']},
-            {'name': 'REST API', 'aliases': ['rest', 'rest api', 'restful']},
-        ],
-        
-        'databases': [
-            {'name': 'MongoDB', 'aliases': ['mongodb', 'mongo']},
-            {'name': 'PostgreSQL', 'aliases': ['postgresql', 'postgres', 'psql']},
-            {'name': 'MySQL', 'aliases': ['mysql']},
-            {'name': 'SQLite', 'aliases': ['sqlite']},
-            {'name': 'Redis', 'aliases': ['redis']},
-            {'name': 'Cassandra', 'aliases': ['cassandra']},
-            {'name': 'DynamoDB', 'aliases': ['dynamodb']},
-            {'name': 'Oracle', 'aliases': ['oracle', 'oracle db']},
-            {'name': 'Microsoft SQL Server', 'aliases': ['sql server', 'mssql', 'microsoft sql']},
-            {'name': 'Elasticsearch', 'aliases': ['elasticsearch', 'elastic search']},
-            {'name': 'Firebase', 'aliases': ['firebase', 'firestore']},
-        ],
-        
-        'cloud_platforms': [
-            {'name': 'AWS', 'aliases': ['aws', 'amazon web services', 'ec2', 's3', 'lambda']},
-            {'name': 'Google Cloud', 'aliases': ['gcp', 'google cloud', 'google cloud platform']},
-            {'name': 'Microsoft Azure', 'aliases': ['azure', 'microsoft azure']},
-            {'name': 'Digital Ocean', 'aliases': ['digitalocean', 'digital ocean']},
-            {'name': 'Heroku', 'aliases': ['heroku']},
-            {'name': 'Vercel', 'aliases': ['vercel']},
-            {'name': 'Netlify', 'aliases': ['netlify']},
-        ],
-        
-        'devops_tools': [
-            {'name': 'Docker', 'aliases': ['docker', 'containerization']},
-            {'name': 'Kubernetes', 'aliases': ['kubernetes', 'k8s']},
-            {'name': 'Jenkins', 'aliases': ['jenkins']},
-            {'name': 'Git', 'aliases': ['git', 'github', 'gitlab', 'bitbucket']},
-            {'name': 'Terraform', 'aliases': ['terraform']},
-            {'name': 'Ansible', 'aliases': ['ansible']},
-            {'name': 'CI/CD', 'aliases': ['ci/cd', 'continuous integration', 'continuous deployment']},
-            {'name': 'Nginx', 'aliases': ['nginx']},
-            {'name': 'Apache', 'aliases': ['apache', 'apache http']},
-        ],
-        
-        'mobile_development': [
-            {'name': 'React Native', 'aliases': ['react native', 'react-native']},
-            {'name': 'Flutter', 'aliases': ['flutter']},
-            {'name': 'Xamarin', 'aliases': ['xamarin']},
-            {'name': 'Ionic', 'aliases': ['ionic']},
-            {'name': 'Android Development', 'aliases': ['android', 'android studio']},
-            {'name': 'iOS Development', 'aliases': ['ios', 'xcode']},
-        ],
-        
-        'data_science_ml': [
-            {'name': 'TensorFlow', 'aliases': ['tensorflow', 'tf']},
-            {'name': 'PyTorch', 'aliases': ['pytorch', 'torch']},
-            {'name': 'Scikit-learn', 'aliases': ['scikit-learn', 'sklearn', 'scikit learn']},
-            {'name': 'Pandas', 'aliases': ['pandas']},
-            {'name': 'NumPy', 'aliases': ['numpy']},
-            {'name': 'Matplotlib', 'aliases': ['matplotlib']},
-            {'name': 'Seaborn', 'aliases': ['seaborn']},
-            {'name': 'Keras', 'aliases': ['keras']},
-            {'name': 'OpenCV', 'aliases': ['opencv', 'cv2']},
-            {'name': 'Jupyter', 'aliases': ['jupyter', 'jupyter notebook']},
-        ],
-        
-        'design_3d_tools': [
-            {'name': 'Blender', 'aliases': ['blender']},
-            {'name': 'Photoshop', 'aliases': ['photoshop', 'adobe photoshop']},
-            {'name': 'Illustrator', 'aliases': ['illustrator', 'adobe illustrator']},
-            {'name': 'Figma', 'aliases': ['figma']},
-            {'name': 'Sketch', 'aliases': ['sketch']},
-            {'name': 'Maya', 'aliases': ['maya', 'autodesk maya']},
-            {'name': '3ds Max', 'aliases': ['3ds max', '3dsmax']},
-            {'name': 'Unity', 'aliases': ['unity', 'unity3d']},
-            {'name': 'Unreal Engine', 'aliases': ['unreal', 'unreal engine', 'ue4', 'ue5']},
-        ],
-        
-        'testing_frameworks': [
-            {'name': 'Jest', 'aliases': ['jest']},
-            {'name': 'Mocha', 'aliases': ['mocha']},
-            {'name': 'Cypress', 'aliases': ['cypress']},
-            {'name': 'Selenium', 'aliases': ['selenium']},
-            {'name': 'Pytest', 'aliases': ['pytest']},
-            {'name': 'JUnit', 'aliases': ['junit']},
-            {'name': 'Postman', 'aliases': ['postman']},
-        ],
-        
-        'soft_skills': [
-            {'name': 'Project Management', 'aliases': ['project management', 'pm']},
-            {'name': 'Agile', 'aliases': ['agile', 'scrum', 'kanban']},
-            {'name': 'Leadership', 'aliases': ['leadership', 'team lead', 'management']},
-            {'name': 'Communication', 'aliases': ['communication', 'presentation']},
-            {'name': 'Problem Solving', 'aliases': ['problem solving', 'analytical']},
-        ]
-    }
+    return get_skill_matcher().skills_db
+
+def _build_alias_trie_pattern(aliases):
+    """
+    Render aliases as a prefix-trie regex so each text position is tested
+    against one branch per leading character instead of every alias.
+    Longer continuations are tried before an alias ends, so the first
+    successful branch is always the longest alias at that position.
+    """
+    trie = {}
+    for alias in aliases:
+        node = trie
+        for char in alias:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def render(node):
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if '' in node:
+            branches.append('')
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return render(trie)
+
+def _is_word_char(char):
+    return bool(re.match(r'\w', char))
+
+
+# Fuzzy alias matching (opt-in). Aliases and text windows of up to
+# FUZZY_MAX_WINDOW_TOKENS tokens are compared with spaces and punctuation
+# removed, so "Postgre SQL", "Node JS" and "Tensor Flow" line up with their
+# aliases; remaining differences (typos) are scored with difflib, but only
+# against aliases of at least FUZZY_MIN_EDIT_LENGTH characters: one edit
+# away from a short alias is usually an ordinary word ("pearl", "iconic").
+FUZZY_MIN_ALIAS_LENGTH = 4
+FUZZY_MIN_EDIT_LENGTH = 7
+FUZZY_MAX_WINDOW_TOKENS = 3
+FUZZY_SCORE_CACHE_SIZE = 100000
+
+# Word endings that make another form of the same word. A window that is
+# an alias plus one of these ("reacts", "nodes") is that word, not a typo of
+# a longer alias, and two words differing only in them ("communicator",
+# "communication") are different words.
+_INFLECTION_SUFFIXES = ('s', 'es', 'ed', 'd', 'ing', 'er', 'ers', 'or', 'ors', 'ion', 'ions')
+
+_FUZZY_TOKEN_RE = re.compile(r'[a-z0-9+#]+')
+_FUZZY_STRIP_RE = re.compile(r'[^a-z0-9+#]+')
+
+_fuzzy_settings = {
+    'enabled': False,
+    'threshold': 0.88
+}
+
+def configure_fuzzy_matching(enabled=True, threshold=0.88):
+    """
+    Enable or disable the fuzzy alias stage used by skill extraction.
+    threshold is the minimum similarity (0-1) for a fuzzy match.
+    """
+    _fuzzy_settings.update(enabled=enabled, threshold=threshold)
+
+def _trigrams(text):
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def _differ_by_inflection(first, second):
+    """
+    Whether two normalized words are different endings on one stem. A
+    dropped or extra letter inside an ending ("kubernets") is a typo.
+    """
+    stem = len(os.path.commonprefix([first, second]))
+    first_rest, second_rest = first[stem:], second[stem:]
+    return (first_rest in _INFLECTION_SUFFIXES and second_rest in _INFLECTION_SUFFIXES
+            and not first_rest.endswith(second_rest) and not second_rest.endswith(first_rest))
+
+
+class FuzzyAliasIndex:
+    """
+    Trigram index over normalized aliases. Only text windows sharing at
+    least half of an alias's trigrams are scored against it, so the cost
+    per window stays bounded however many aliases there are. Short aliases
+    match only when a window equals them once normalized; they are not in
+    the trigram postings.
+    """
+
+    def __init__(self, alias_skills):
+        self._aliases = {}
+        self._postings = {}
+        # Every normalized alias, however short, for the inflection check
+        self._words = set()
+        for alias, entries in alias_skills.items():
+            normalized = _FUZZY_STRIP_RE.sub('', alias)
+            self._words.add(normalized)
+            if len(normalized) < FUZZY_MIN_ALIAS_LENGTH:
+                continue
+            targets = self._aliases.setdefault(normalized, [])
+            for skill_name, category in entries:
+                # Aliases such as "node.js" and "nodejs" normalize alike; keep one per skill
+                if not any(target[:2] == (skill_name, category) for target in targets):
+                    targets.append((skill_name, category, alias))
+        # Postings are split by first letter: misspellings rarely change it,
+        # and requiring it keeps "programming" from matching "c programming"
+        self._trigram_counts = {}
+        for normalized in self._aliases:
+            if len(normalized) < FUZZY_MIN_EDIT_LENGTH:
+                continue
+            grams = _trigrams(normalized)
+            self._trigram_counts[normalized] = len(grams)
+            postings = self._postings.setdefault(normalized[0], {})
+            for gram in grams:
+                postings.setdefault(gram, []).append(normalized)
+        lengths = [len(normalized) for normalized in self._aliases] or [0]
+        self._min_length = int(min(lengths) * 0.8)
+        self._max_length = int(max(lengths) * 1.25) + 1
+        # Window scores are reused across documents; cleared when full
+        self._scored = {}
+
+    def best_alias(self, window, threshold):
+        """Return (normalized alias, score) for the closest alias to a normalized window, or None"""
+        if window in self._aliases:
+            return window, 1.0
+
+        postings = self._postings.get(window[0])
+        if postings is None:
+            return None
+
+        shared = {}
+        for gram in _trigrams(window):
+            for normalized in postings.get(gram, ()):
+                shared[normalized] = shared.get(normalized, 0) + 1
+
+        best = None
+        for normalized, count in shared.items():
+            if count * 2 < self._trigram_counts[normalized]:
+                continue
+            if abs(len(normalized) - len(window)) > max(1, len(normalized) // 5):
+                continue
+            if _differ_by_inflection(window, normalized):
+                continue
+            score = difflib.SequenceMatcher(None, window, normalized).ratio()
+            if score >= threshold and (best is None or score > best[1]):
+                best = (normalized, score)
+        if best is not None and any(window.endswith(suffix) and window[:-len(suffix)] in self._words
+                                    for suffix in _INFLECTION_SUFFIXES):
+            return None
+        return best
+
+    def find_matches(self, text_lower, threshold):
+        """
+        Return fuzzy alias occurrences in lowercased text as dicts with the
+        skill, category, alias, start/end offsets, the matched text and its
+        similarity score.
+        """
+        tokens = [(match.start(), match.end(), match.group()) for match in _FUZZY_TOKEN_RE.finditer(text_lower)]
+        scored = self._scored.setdefault(threshold, {})
+        if len(scored) > FUZZY_SCORE_CACHE_SIZE:
+            scored.clear()
+        matches = []
+
+        for first in range(len(tokens)):
+            window = ''
+            # Longer windows from the same start only count when they match
+            # another alias or match better, not by absorbing trailing words
+            best_scores = {}
+            for last in range(first, min(first + FUZZY_MAX_WINDOW_TOKENS, len(tokens))):
+                window += tokens[last][2]
+                if len(window) > self._max_length:
+                    break
+                if len(window) < self._min_length:
+                    continue
+                if window not in scored:
+                    scored[window] = self.best_alias(window, threshold)
+                best = scored[window]
+                if best is None or best_scores.get(best[0], -1.0) >= best[1]:
+                    continue
+                # Nor does another form of the alias become a typo of it by
+                # absorbing the next word ("communicator in")
+                if last > first and any(
+                        _differ_by_inflection(''.join(token[2] for token in tokens[first:stop]), best[0])
+                        for stop in range(first + 1, last + 1)):
+                    continue
+                best_scores[best[0]] = best[1]
+
+                start, end = tokens[first][0], tokens[last][1]
+                for skill_name, category, alias in self._aliases[best[0]]:
+                    matches.append({
+                        'skill': skill_name,
+                        'category': category,
+                        'alias': alias,
+                        'start': start,
+                        'end': end,
+                        'text': text_lower[start:end],
+                        'score': round(best[1], 3)
+                    })
+        return matches
+
+
+class SkillMatcher:
+    """
+    Precompiled matcher for every alias in the skills database.
+
+    Matching keeps the semantics of searching each alias separately with
+    ``\\b`` boundaries, but does it in one scan: a lookahead finds the longest
+    alias at every position, and shorter aliases that are prefixes of it (and
+    would also satisfy their end boundary) are resolved from a table built
+    once here.
+    """
+
+    def __init__(self, skills_db, version=None):
+        self.skills_db = skills_db
+        self.version = version or hashlib.sha256(json.dumps(skills_db, sort_keys=True).encode('utf-8')).hexdigest()[:12]
+        self.skill_categories = {}
+        alias_skills = {}
+
+        for category, skills in skills_db.items():
+            for skill_info in skills:
+                skill_name = skill_info['name']
+                self.skill_categories.setdefault(skill_name, []).append(category)
+                for alias in skill_info['aliases']:
+                    alias_skills.setdefault(alias.lower(), []).append((skill_name, category))
+
+        # For each alias, every alias matched whenever it matches:
+        # itself plus any prefix that ends on a word boundary inside it.
+        self._hits = {}
+        for alias in alias_skills:
+            hits = []
+            for other, entries in alias_skills.items():
+                if other == alias:
+                    matched = True
+                elif len(other) < len(alias) and alias.startswith(other):
+                    matched = _is_word_char(alias[len(other) - 1]) != _is_word_char(alias[len(other)])
+                else:
+                    matched = False
+                if matched:
+                    hits.extend((skill_name, category, other) for skill_name, category in entries)
+            self._hits[alias] = tuple(hits)
+
+        self._pattern = re.compile(
+            r'(?=\b(' + _build_alias_trie_pattern(alias_skills) + r')\b)'
+        )
+        self._index_names()
+
+    def _index_names(self):
+        self._fuzzy_index = None
+        self._names = {
+            alias: frozenset(skill_name for skill_name, _, _ in hits)
+            for alias, hits in self._hits.items()
+        }
+
+    def to_index(self):
+        """Serialize the compiled matcher to a JSON-compatible dict"""
+        return {
+            'format': SKILLS_INDEX_FORMAT,
+            'version': self.version,
+            'skill_categories': self.skill_categories,
+            'hits': {alias: [list(hit) for hit in hits] for alias, hits in self._hits.items()},
+            'pattern': self._pattern.pattern
+        }
+
+    @classmethod
+    def from_index(cls, index, skills_db):
+        """Rebuild a matcher from to_index() output without recompiling the alias table"""
+        matcher = cls.__new__(cls)
+        matcher.skills_db = skills_db
+        matcher.version = index['version']
+        matcher.skill_categories = index['skill_categories']
+        matcher._hits = {alias: tuple(tuple(hit) for hit in hits) for alias, hits in index['hits'].items()}
+        matcher._pattern = re.compile(index['pattern'])
+        matcher._index_names()
+        return matcher
+
+    def find_skill_names(self, text_lower, fuzzy_threshold=None):
+        """
+        Return the set of skill names whose aliases occur in lowercased text.
+        With a fuzzy_threshold, skills found by fuzzy matching are added.
+        """
+        found = set()
+        for alias in set(self._pattern.findall(text_lower)):
+            found |= self._names[alias]
+        if fuzzy_threshold is not None:
+            found.update(match['skill'] for match in self.find_fuzzy_matches(text_lower, fuzzy_threshold))
+        return found
+
+    def find_fuzzy_matches(self, text_lower, threshold):
+        """Fuzzy alias occurrences in lowercased text (see FuzzyAliasIndex.find_matches)"""
+        if self._fuzzy_index is None:
+            # Built on first use; only each alias's own entries are indexed
+            self._fuzzy_index = FuzzyAliasIndex({
+                alias: [(skill_name, category) for skill_name, category, hit_alias in hits if hit_alias == alias]
+                for alias, hits in self._hits.items()
+            })
+        return self._fuzzy_index.find_matches(text_lower, threshold)
+
+    def find_matches(self, text_lower):
+        """
+        Return every alias occurrence as a dict with the skill name, its
+        category, the alias and start/end offsets into the lowercased text.
+        """
+        matches = []
+        for match in self._pattern.finditer(text_lower):
+            start = match.start()
+            for skill_name, category, alias in self._hits[match.group(1)]:
+                matches.append({
+                    'skill': skill_name,
+                    'category': category,
+                    'alias': alias,
+                    'start': start,
+                    'end': start + len(alias)
+                })
+        return matches
+
+
+def _skills_index_path(path, version):
+    directory = _skills_settings['index_dir'] or os.path.dirname(os.path.abspath(path))
+    name = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(directory, f"{name}.{version}.index.json")
+
+def _write_skills_index(index_path, index):
+    directory = os.path.dirname(index_path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        # Write to a temp file and rename so other workers never read a partial index
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(index, f)
+        os.replace(tmp_path, index_path)
+    except OSError as e:
+        logger.warning("Could not write skills index %s: %s", index_path, e)
+        return
+
+    # Indexes of earlier versions of the same database are no longer needed
+    prefix = os.path.basename(index_path).split('.', 1)[0] + '.'
+    for entry in os.listdir(directory):
+        if entry.startswith(prefix) and entry.endswith('.index.json') and entry != os.path.basename(index_path):
+            try:
+                os.remove(os.path.join(directory, entry))
+            except OSError:
+                pass
+
+def load_skill_matcher(path):
+    """
+    Build a SkillMatcher for the skills database file at path. The matcher
+    version is a hash of the file contents; a compiled index cached on disk
+    for that version is loaded instead of rebuilding, and written if missing.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    skills_db = json.loads(data)
+    version = hashlib.sha256(data).hexdigest()[:12]
+    index_path = _skills_index_path(path, version)
+
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get('format') == SKILLS_INDEX_FORMAT and index.get('version') == version:
+            return SkillMatcher.from_index(index, skills_db)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError, TypeError, re.error) as e:
+        logger.warning("Ignoring unreadable skills index %s: %s", index_path, e)
+
+    matcher = SkillMatcher(skills_db, version=version)
+    _write_skills_index(index_path, matcher.to_index())
+    return matcher
+
+_skill_matcher = None
+_skill_matcher_stat = None
+_skills_checked_at = None
+_skills_lock = threading.Lock()
+
+def get_skill_matcher():
+    """
+    Return the process-wide SkillMatcher, loading it on first use.
+
+    The database file is checked for changes at most every reload_interval
+    seconds. A changed file is loaded into a new matcher while lookups keep
+    using the current one, then swapped in with a single assignment, so no
+    caller ever sees a partially built index. If the new file cannot be
+    loaded the current matcher stays in place.
+    """
+    global _skill_matcher, _skill_matcher_stat, _skills_checked_at
+
+    matcher = _skill_matcher
+    interval = _skills_settings['reload_interval']
+    checked_at = _skills_checked_at
+    if matcher is not None and checked_at is not None and (
+            interval is None or time.monotonic() - checked_at < interval):
+        return matcher
+
+    # Only the first load waits; during a reload other callers keep the current matcher
+    if not _skills_lock.acquire(blocking=matcher is None):
+        return matcher
+    try:
+        if _skill_matcher is not None and _skills_checked_at is not None and _skills_checked_at != checked_at:
+            return _skill_matcher
+        _skills_checked_at = time.monotonic()
+
+        path = _skills_settings['path']
+        try:
+            stat = os.stat(path)
+            stat = (path, stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            if _skill_matcher is None:
+                raise
+            logger.warning("Could not check skills database %s: %s", path, e)
+            return _skill_matcher
+
+        if _skill_matcher is not None and stat == _skill_matcher_stat:
+            return _skill_matcher
+
+        try:
+            new_matcher = load_skill_matcher(path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            if _skill_matcher is None:
+                raise
+            logger.warning("Could not reload skills database, keeping version %s: %s", _skill_matcher.version, e)
+            _skill_matcher_stat = stat
+            return _skill_matcher
+
+        if _skill_matcher is not None and new_matcher.version != _skill_matcher.version:
+            logger.info("Skills database reloaded: version %s -> %s", _skill_matcher.version, new_matcher.version)
+        _skill_matcher_stat = stat
+        _skill_matcher = new_matcher
+        return new_matcher
+    finally:
+        _skills_lock.release()
+
+def match_skills(text):
+    """
+    Find all skill mentions in text in a single pass.
+    Offsets index into ``text.lower()``.
+    """
+    if not text:
+        return []
+    return get_skill_matcher().find_matches(text.lower())
+
+def _fuzzy_threshold():
+    return _fuzzy_settings['threshold'] if _fuzzy_settings['enabled'] else None
 
 def extract_skills_from_text(text):
     """
@@ -313,107 +1012,146 @@ def extract_skills_from_text(text):
     if not text:
         return []
     
-    skills_db = get_comprehensive_skills_database()
-    found_skills = set()  # Use set to avoid duplicates
-    text_lower = text.lower()
+    found_skills = get_skill_matcher().find_skill_names(text.lower(), _fuzzy_threshold())
     
-    # Search through all categories
-    for category, skills in skills_db.items():
-        for skill_info in skills:
-            skill_name = skill_info['name']
-            
-            # Check if any alias matches
-            for alias in skill_info['aliases']:
-                # Use word boundaries for better matching
-                pattern = r'\b' + re.escape(alias.lower()) + r'\b'
-                if re.search(pattern, text_lower):
-                    found_skills.add(skill_name)
-                    break  # Found this skill, no need to check other aliases
-    
-    return sorted(list(found_skills))
+    return sorted(found_skills)
 
-def get_skills_summary(skills_list):
+def get_skills_summary(skills_list, matcher=None):
     """
     Categorize skills by type for better presentation
     """
     if not skills_list:
         return {}
     
-    skills_db = get_comprehensive_skills_database()
+    skill_categories = (matcher or get_skill_matcher()).skill_categories
     categorized = {}
     
     for skill in skills_list:
-        # Find which category this skill belongs to
-        for category, skills in skills_db.items():
-            for skill_info in skills:
-                if skill_info['name'] == skill:
-                    if category not in categorized:
-                        categorized[category] = []
-                    categorized[category].append(skill)
-                    break
+        for category in skill_categories.get(skill, []):
+            categorized.setdefault(category, []).append(skill)
     
     return categorized
 
+# Header phrases for each section type. A line is a section header when it
+# starts with one of these and is followed by nothing, a separator (inline
+# content after it belongs to the section), or is written in capitals.
+SECTION_HEADERS = {
+    'experience': [
+        'experience', 'work experience', 'professional experience', 'employment history',
+        'work history', 'relevant experience', 'internships', 'internship experience'
+    ],
+    'projects': [
+        'projects', 'project experience', 'personal projects', 'notable projects',
+        'selected projects', 'academic projects', 'key projects'
+    ],
+    'education': ['education', 'academic background', 'educational background', 'academics'],
+    'skills': ['skills', 'technical skills', 'key skills', 'core skills', 'core competencies'],
+    'certifications': [
+        'certifications', 'certificates', 'licenses and certifications', 'licenses & certifications'
+    ],
+    'summary': ['summary', 'professional summary', 'profile', 'objective', 'career objective', 'about', 'about me'],
+    'achievements': ['achievements', 'awards', 'honors', 'honours'],
+    'publications': ['publications'],
+}
+
+_SECTION_TYPES_BY_HEADER = {
+    header: section
+    for section, headers in SECTION_HEADERS.items()
+    for header in headers
+}
+
+_SECTION_HEADER_RE = re.compile(
+    r'^[^\w]*(?P<header>'
+    + '|'.join(
+        re.escape(header).replace(r'\ ', r'\s+')
+        for header in sorted(_SECTION_TYPES_BY_HEADER, key=len, reverse=True)
+    )
+    + r')\b[ \t]*(?P<sep>[:|\-–—])?[ \t]*(?P<rest>.*)$',
+    re.IGNORECASE
+)
+
+def segment_resume_sections(raw_text):
+    """
+    Split resume text into sections in one pass over its lines.
+
+    Returns a dict with the text's lines and, under 'sections', a mapping
+    of section type to the spans found for it. Each span has the header
+    line as written, any inline content after the header, and start/end
+    line indices of the body (end exclusive).
+    """
+    lines = raw_text.splitlines() if raw_text else []
+    sections = {}
+    current = None
+
+    for index, line in enumerate(lines):
+        match = _SECTION_HEADER_RE.match(line)
+        if not match:
+            continue
+        stripped = line.strip()
+        rest = match.group('rest').strip()
+        if rest and not match.group('sep') and not stripped.isupper():
+            continue
+
+        if current is not None:
+            current['end'] = index
+        current = {'header': stripped, 'inline': rest, 'start': index + 1, 'end': len(lines)}
+        header = ' '.join(match.group('header').lower().split())
+        sections.setdefault(_SECTION_TYPES_BY_HEADER[header], []).append(current)
+
+    return {'lines': lines, 'sections': sections}
+
 def _normalize_section_line(line):
     # Remove bullet characters and extra symbols
     cleaned = re.sub(r'^[\s•\-*–—\u2022\u2023\u25AA\u25CF\u25E6]+', '', line).strip()
     return cleaned
 
-def _extract_section_entries(raw_text, section_headers, stop_headers):
-    if not raw_text:
-        return []
-
-    lines = raw_text.splitlines()
-    capture = False
+def get_section_entries(segments, section, limit=12):
+    """
+    Collect the entries of one section type from segment_resume_sections()
+    output. Entries are separated by blank lines, stripped of bullets and
+    deduplicated case-insensitively.
+    """
+    lines = segments['lines']
     entries = []
-    buffer = []
+    seen = set()
 
-    def flush_buffer():
-        merged = ' '.join(buffer).strip()
-        normalized = _normalize_section_line(merged)
-        if normalized:
+    def flush_buffer(buffer):
+        normalized = _normalize_section_line(' '.join(buffer).strip())
+        if normalized and normalized.lower() not in seen:
+            seen.add(normalized.lower())
             entries.append(normalized)
 
-    lower_stop_headers = [header.lower() for header in stop_headers]
-    lower_section_headers = [header.lower() for header in section_headers]
-
-    for line in lines:
-        stripped = line.strip()
-        lower_line = stripped.lower()
-
-        if any(header in lower_line for header in lower_section_headers):
-            if capture and buffer:
-                flush_buffer()
+    for span in segments['sections'].get(section, []):
+        buffer = [span['inline']] if span['inline'] else []
+        for line in lines[span['start']:span['end']]:
+            stripped = line.strip()
+            if stripped:
+                buffer.append(stripped)
+            elif buffer:
+                flush_buffer(buffer)
                 buffer = []
-            capture = True
-            continue
+        if buffer:
+            flush_buffer(buffer)
 
-        if capture:
-            if any(lower_line.startswith(stop) for stop in lower_stop_headers):
-                break
-            if not stripped:
-                if buffer:
-                    flush_buffer()
-                    buffer = []
-            else:
-                buffer.append(stripped)
+    # Limit to avoid excessively long arrays
+    return entries[:limit]
 
-    if capture and buffer:
-        flush_buffer()
+EXPERIENCE_KEYWORDS = ['experience', 'worked', 'developed', 'managed', 'led', 'created', 'built']
+EDUCATION_KEYWORDS = ['bachelor', 'master', 'phd', 'degree', 'university', 'college', 'education']
 
-    # Deduplicate while preserving order and limit to avoid excessively long arrays
-    seen = set()
-    unique_entries = []
-    for entry in entries:
-        lowered = entry.lower()
-        if lowered in seen:
-            continue
-        seen.add(lowered)
-        unique_entries.append(entry)
-        if len(unique_entries) >= 12:
-            break
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
 
-    return unique_entries
+def find_first_email(text):
+    """
+    Return the first email address in text, or None
+    """
+    at = text.find('@')
+    if at == -1:
+        return None
+    # An address cannot contain whitespace, so the first one starts no
+    # earlier than the whitespace-delimited token holding the first '@'
+    match = _EMAIL_RE.search(text, text.rfind(' ', 0, at) + 1)
+    return match.group(0) if match else None
 
 def extract_basic_info(text, raw_text=None):
     """
@@ -432,46 +1170,106 @@ def extract_basic_info(text, raw_text=None):
     if not text:
         return info
     
-    # Extract email
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    emails = re.findall(email_pattern, text)
-    if emails:
-        info['email'] = emails[0]
+    # Lowercase once; the skill and keyword detectors share this buffer
+    text_lower = text.lower()
     
-
+    # Extract email
+    info['email'] = find_first_email(text)
 
     # Extract skills using comprehensive database
-    skills = extract_skills_from_text(text)
+    # One matcher for both steps, so a concurrent reload cannot split them
+    matcher = get_skill_matcher()
+    skills = sorted(matcher.find_skill_names(text_lower, _fuzzy_threshold()))
     info['skills'] = skills
-    info['skills_summary'] = get_skills_summary(skills)
-    
-    # Experience keywords
-    exp_keywords = ['experience', 'worked', 'developed', 'managed', 'led', 'created', 'built']
-    text_lower = text.lower()
-    for keyword in exp_keywords:
-        if keyword in text_lower:
-            info['experience_keywords'].append(keyword)
+    info['skills_summary'] = get_skills_summary(skills, matcher)
     
-    # Education keywords
-    edu_keywords = ['bachelor', 'master', 'phd', 'degree', 'university', 'college', 'education']
-    for keyword in edu_keywords:
-        if keyword in text_lower:
-            info['education_keywords'].append(keyword)
+    # Experience and education keywords
+    info['experience_keywords'] = [keyword for keyword in EXPERIENCE_KEYWORDS if keyword in text_lower]
+    info['education_keywords'] = [keyword for keyword in EDUCATION_KEYWORDS if keyword in text_lower]
     
-    raw_source = raw_text or text
-    stop_headers = [
-        'education', 'certifications', 'skills', 'projects', 'project experience',
-        'about', 'summary', 'objective', 'achievements', 'publications'
-    ]
+    # Sections are found in a single pass over the raw text's lines
+    segments = segment_resume_sections(raw_text or text)
+    info['experience_entries'] = get_section_entries(segments, 'experience')
+    info['project_entries'] = get_section_entries(segments, 'projects')
 
-    experience_headers = [
-        'experience', 'work experience', 'professional experience', 'employment history'
-    ]
-    info['experience_entries'] = _extract_section_entries(raw_source, experience_headers, stop_headers)
+    return info
 
-    project_headers = [
-        'projects', 'project experience', 'personal projects', 'notable projects', 'selected projects'
-    ]
-    info['project_entries'] = _extract_section_entries(raw_source, project_headers, stop_headers)
+# Bump whenever extraction or detection output changes so that cached
+# results from older code are not served.
+EXTRACTOR_VERSION = '5'
 
-    return info
+def get_extractor_version():
+    """
+    Version tag covering the extraction code, the skills database contents
+    and the settings that change extraction output
+    """
+    version = f"{EXTRACTOR_VERSION}-{get_skill_matcher().version}-{_default_limits.describe()}"
+    if _fuzzy_settings['enabled']:
+        version += f"-f{_fuzzy_settings['threshold']}"
+    return version
+
+def analyze_resume(source, filename=None, limits=None):
+    """
+    Run the full extraction pipeline on a resume: text extraction, cleaning
+    and basic information detection. Returns a dict with raw_text,
+    clean_text, basic_info and the truncation flags from extraction;
+    raw_text is None when no text was found. timings holds the ms spent
+    in each stage, so callers can record them even when the analysis ran
+    in a worker process.
+    """
+    started = time.perf_counter()
+    document = extract_resume_document(source, filename=filename, limits=limits)
+    extracted = time.perf_counter()
+    raw_text = document['text']
+    clean_text = clean_extracted_text(raw_text)
+    cleaned = time.perf_counter()
+    basic_info = extract_basic_info(clean_text, raw_text)
+    finished = time.perf_counter()
+    return {
+        'raw_text': raw_text,
+        'clean_text': clean_text,
+        'basic_info': basic_info,
+        'truncated': document['truncated'],
+        'truncated_reason': document['truncated_reason'],
+        'timings': {
+            'extract_resume_text': round((extracted - started) * 1000, 3),
+            'clean_extracted_text': round((cleaned - extracted) * 1000, 3),
+            'extract_basic_info': round((finished - cleaned) * 1000, 3)
+        }
+    }
+
+def get_analysis_settings():
+    """
+    Settings that shape analyze_resume output, for replaying in another
+    process with analyze_resume_with_settings
+    """
+    return {
+        'limits': _default_limits,
+        'fuzzy': dict(_fuzzy_settings),
+        'skills': dict(_skills_settings)
+    }
+
+def analyze_resume_with_settings(source, filename, settings):
+    """
+    analyze_resume under settings from get_analysis_settings(). Worker
+    processes start from module defaults, so the submitting process's
+    configuration is applied first.
+    """
+    _fuzzy_settings.update(settings['fuzzy'])
+    if settings['skills'] != _skills_settings:
+        configure_skills_database(**settings['skills'])
+    return analyze_resume(source, filename, settings['limits'])
+
+def submit_resume_analysis(source, filename=None):
+    """
+    Run analyze_resume on the extraction process pool with the configured
+    limits, skills database and fuzzy matching settings and return its
+    Future. A pool broken by a crashed worker is replaced before submitting.
+    """
+    data = _read_source(source)
+    settings = get_analysis_settings()
+    try:
+        return _get_process_pool().submit(analyze_resume_with_settings, data, filename, settings)
+    except BrokenProcessPool:
+        _reset_process_pool()
+        return _get_process_pool().submit(analyze_resume_with_settings, data, filename, settings)
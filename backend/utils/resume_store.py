@@ -0,0 +1,164 @@
+"""
+Server-side resume store
+Keeps the cleaned text and basic info of extracted resumes for a limited
+time under an opaque resume_id, so AI requests can refer to a resume
+instead of sending its contents again
+"""
+
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from typing import Any, Dict, Optional
+
+# Each put issues a random resume_id (a handle); handles to the same
+# content share one row of text, keyed by the caller's content hash, which
+# never leaves the server
+_SCHEMA = """
+DROP TABLE IF EXISTS resumes;
+CREATE TABLE IF NOT EXISTS resume_contents (
+    content_hash TEXT PRIMARY KEY,
+    clean_text TEXT NOT NULL,
+    basic_info TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resume_handles (
+    id TEXT PRIMARY KEY,
+    content_hash TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resume_contents_expires ON resume_contents (expires_at);
+CREATE INDEX IF NOT EXISTS resume_handles_expires ON resume_handles (expires_at);
+CREATE INDEX IF NOT EXISTS resume_handles_content ON resume_handles (content_hash);
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class ResumeStore:
+    """
+    SQLite-backed store of extracted resumes, shared by every worker
+    process using the same database. put() returns a new random resume_id
+    each time; storing the same content again (same content_hash) adds a
+    handle to the existing text instead of another copy. Handles expire
+    ttl seconds after they are issued and at most max_entries are kept,
+    the oldest being evicted by put(). purge() deletes expired entries,
+    every purge_interval seconds on a background thread once start() is
+    called. db_path must be on a local file system: WAL mode is unreliable
+    on NFS/SMB.
+    """
+
+    def __init__(self, db_path: str, ttl: float = 3600, max_entries: Optional[int] = 10000,
+                 purge_interval: float = 60):
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.purge_interval = purge_interval
+        self._stopping = threading.Event()
+        self._thread = None
+
+        directory = os.path.dirname(os.path.abspath(db_path))
+        os.makedirs(directory, exist_ok=True)
+        with closing(self._connect()) as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.executescript(_SCHEMA)
+
+    def start(self) -> None:
+        """Start purging on a background thread (idempotent)"""
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._purge_loop, name='resume-store-purge', daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def put(self, content_hash: str, clean_text: str, basic_info: Dict[str, Any]) -> str:
+        """Store a resume and return a new resume_id for it"""
+        resume_id = secrets.token_urlsafe(24)
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute(
+                'INSERT INTO resume_contents (content_hash, clean_text, basic_info, expires_at) VALUES (?, ?, ?, ?) '
+                'ON CONFLICT (content_hash) DO UPDATE SET expires_at = excluded.expires_at',
+                (content_hash, clean_text, json.dumps(basic_info), now + self.ttl)
+            )
+            conn.execute('INSERT INTO resume_handles (id, content_hash, created_at, expires_at) VALUES (?, ?, ?, ?)',
+                         (resume_id, content_hash, now, now + self.ttl))
+            if self.max_entries:
+                count = conn.execute('SELECT COUNT(*) FROM resume_handles').fetchone()[0]
+                if count > self.max_entries:
+                    self._evict_oldest(conn)
+            conn.execute('COMMIT')
+        return resume_id
+
+    def get(self, resume_id: str) -> Optional[Dict[str, Any]]:
+        """The stored resume, or None if it does not exist or has expired"""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                'SELECT h.id, h.created_at, h.expires_at, c.clean_text, c.basic_info '
+                'FROM resume_handles h JOIN resume_contents c ON c.content_hash = h.content_hash '
+                'WHERE h.id = ? AND h.expires_at > ?',
+                (resume_id, time.time())
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            'resume_id': row['id'],
+            'clean_text': row['clean_text'],
+            'basic_info': json.loads(row['basic_info']),
+            'created_at': row['created_at'],
+            'expires_at': row['expires_at']
+        }
+
+    def count(self) -> int:
+        with closing(self._connect()) as conn:
+            return conn.execute('SELECT COUNT(*) FROM resume_handles WHERE expires_at > ?',
+                                (time.time(),)).fetchone()[0]
+
+    def purge(self) -> int:
+        """Delete expired entries and the oldest beyond max_entries; returns how many handles were deleted"""
+        now = time.time()
+        with closing(self._connect()) as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            deleted = conn.execute('DELETE FROM resume_handles WHERE expires_at <= ?', (now,)).rowcount
+            conn.execute('DELETE FROM resume_contents WHERE expires_at <= ?', (now,))
+            if self.max_entries:
+                deleted += self._evict_oldest(conn)
+            conn.execute('COMMIT')
+        return deleted
+
+    def _evict_oldest(self, conn):
+        deleted = conn.execute(
+            'DELETE FROM resume_handles WHERE id IN '
+            '(SELECT id FROM resume_handles ORDER BY expires_at DESC LIMIT -1 OFFSET ?)',
+            (self.max_entries,)
+        ).rowcount
+        if deleted:
+            conn.execute('DELETE FROM resume_contents WHERE content_hash NOT IN '
+                         '(SELECT content_hash FROM resume_handles)')
+        return deleted
+
+    def _purge_loop(self):
+        while not self._stopping.wait(self.purge_interval):
+            try:
+                self.purge()
+            except sqlite3.Error as e:
+                logger.error("Resume store purge failed: %s", e)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        # Entries are short-lived; losing the last ones on power failure is fine
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
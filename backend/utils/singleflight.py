@@ -0,0 +1,105 @@
+"""
+Request coalescing
+Concurrent calls with the same key share one execution: the first caller
+runs the function and everyone who arrives while it is in flight gets its
+result (or its exception) instead of starting another one. The result is
+snapshotted as soon as it is ready and every caller, the first included,
+gets its own copy, so no caller can change what the others see
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import threading
+from typing import Any, Awaitable, Callable, Tuple
+
+
+def normalize_arguments(value: Any) -> Any:
+    """
+    Canonical form of call arguments for coalescing: strings are
+    case-folded with whitespace collapsed, dict keys are sorted; list
+    order is kept since it can matter (e.g. target roles by priority)
+    """
+    if isinstance(value, str):
+        return ' '.join(value.split()).casefold()
+    if isinstance(value, dict):
+        return {str(key): normalize_arguments(item) for key, item in sorted(value.items(), key=lambda kv: str(kv[0]))}
+    if isinstance(value, (list, tuple)):
+        return [normalize_arguments(item) for item in value]
+    return value
+
+
+def coalescing_key(name: str, arguments: Any) -> str:
+    """Digest of the call name and its normalized arguments"""
+    canonical = json.dumps([name, normalize_arguments(arguments)], sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces calls by key. do() is for threads; do_async() for coroutines
+    on an event loop. The two do not share in-flight calls with each other.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._tasks = {}
+
+    def do(self, key: str, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Run func() unless a call with this key is already running, in which
+        case wait for that one. Returns (result, shared), shared being True
+        when the result came from another caller's execution.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result), True
+
+        try:
+            call.result = copy.deepcopy(func())
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return copy.deepcopy(call.result), False
+
+    async def do_async(self, key: str, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Coroutine counterpart of do(). The shared call runs as its own task,
+        so one caller being cancelled (e.g. a client disconnecting) does not
+        cancel it for the others.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (id(loop), key)
+        task = self._tasks.get(task_key)
+        shared = task is not None
+        if not shared:
+            task = self._tasks[task_key] = loop.create_task(self._snapshot(func))
+            task.add_done_callback(lambda _: self._tasks.pop(task_key, None))
+
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result), shared
+
+    @staticmethod
+    async def _snapshot(func):
+        return copy.deepcopy(await func())
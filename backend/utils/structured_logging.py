@@ -0,0 +1,141 @@
+"""
+Structured logging
+Leveled JSON log lines on stderr. Records are formatted on the calling
+thread and written by a background listener thread, so a slow terminal or
+pipe never blocks a request; per-item debug lines can be sampled.
+"""
+
+import atexit
+import itertools
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+# Attributes every LogRecord has; anything else came in through extra=
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'sample'}
+
+TEXT_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+_listener = None
+_handler = None
+_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: time, level, logger, message, extra fields and traceback"""
+
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps one in every `every` records logged with extra={'sample': True},
+    counted per call site, so a debug line inside a loop shows up without
+    being written for every item. Other records always pass.
+    """
+
+    def __init__(self, every: int = 10):
+        super().__init__()
+        self.every = max(1, every)
+        self._counters = {}
+
+    def filter(self, record):
+        if not getattr(record, 'sample', False) or self.every == 1:
+            return True
+        site = (record.pathname, record.lineno)
+        counter = self._counters.get(site)
+        if counter is None:
+            counter = self._counters.setdefault(site, itertools.count())
+        if next(counter) % self.every:
+            return False
+        record.sampled_every = self.every
+        return True
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """Drops records instead of blocking or raising when the queue is full"""
+
+    def __init__(self, log_queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging(level: Optional[str] = None, fmt: Optional[str] = None, sample_every: Optional[int] = None,
+                      queue_size: Optional[int] = None, stream=None) -> None:
+    """
+    Route the root logger through a bounded queue to a listener thread
+    writing to stream (stderr by default, keeping stdout free for CLI
+    output). Arguments left as None are read from LOG_LEVEL, LOG_FORMAT
+    ('json' or 'text'), LOG_SAMPLE_EVERY and LOG_QUEUE_SIZE. Calling it
+    again replaces the previous setup.
+    """
+    global _listener, _handler
+    level = (level or os.getenv('LOG_LEVEL', 'INFO')).upper()
+    fmt = (fmt or os.getenv('LOG_FORMAT', 'json')).lower()
+    if sample_every is None:
+        sample_every = int(os.getenv('LOG_SAMPLE_EVERY', 10))
+    if queue_size is None:
+        queue_size = int(os.getenv('LOG_QUEUE_SIZE', 10000))
+
+    with _lock:
+        root = logging.getLogger()
+        if _listener is not None:
+            _listener.stop()
+            root.removeHandler(_handler)
+
+        output = logging.StreamHandler(stream or sys.stderr)
+        output.setFormatter(logging.Formatter('%(message)s'))
+        _listener = QueueListener(queue.Queue(max(0, queue_size)), output)
+
+        # Formatting happens in the caller so the record's arguments are
+        # rendered before they can change; only the write is deferred
+        _handler = _DroppingQueueHandler(_listener.queue)
+        _handler.setFormatter(JsonFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT))
+        _handler.addFilter(SamplingFilter(sample_every))
+
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+        root.addHandler(_handler)
+        root.setLevel(level)
+        _listener.start()
+
+
+def dropped_records() -> int:
+    """Records discarded because the log queue was full"""
+    return _handler.dropped if _handler is not None else 0
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the listener thread"""
+    global _listener, _handler
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            logging.getLogger().removeHandler(_handler)
+            _listener = _handler = None
+
+
+atexit.register(shutdown_logging)